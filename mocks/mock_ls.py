@@ -1,106 +1,200 @@
+"""Mock launch station that load tests one or more links to ground stations
+
+Drives ``--links`` launch stations at ``--rate`` messages per second each
+with synthetic telemetry, then prints the achieved send rate, round trip
+latency and dropped messages. Latency and drops are only measured when the
+other end echoes messages back; run this script a second time with
+``--echo`` to act as that other end, or use the ``bus`` connection to run
+both ends in this process, or the ``serialsim`` connection to run both ends
+over a simulated serial line.
+
+Link ``i`` of a socket or udp connection uses ``--port + i``, of a unix
+connection ``--path.i``, and of a serial connection the ``i``-th of the comma
+separated ``--port``s.
+"""
+
 import argparse
 import random
 import sys
 import threading as th
-import time
 from typing import List
 
 from orbitalcoms import (
-    ComsMessage,
+    ComsDriver,
+    InProcessBus,
     LaunchStation,
+    SerialComsStrategy,
+    SocketComsStrategy,
+    UdpComsStrategy,
     create_serial_launch_station,
     create_socket_launch_station,
+    create_udp_launch_station,
+    create_unix_launch_station,
+)
+from orbitalcoms._app.loadgen import (
+    PATTERNS,
+    EchoPeer,
+    LoadConfig,
+    LoadGenerator,
+    SizeDistribution,
 )
+from orbitalcoms.coms.strategies.serialsim import LineImpairment, SimulatedSerialLink
 
 
 def main() -> int:
     args = get_args()
+    config = LoadConfig(
+        rate=args.rate,
+        duration=args.duration,
+        pattern=args.pattern,
+        burst=args.burst,
+        payload=SizeDistribution.parse(args.payload),
+        drain=args.drain,
+        seed=args.seed,
+    )
 
-    if args.connection == "socket":
-        print(f"HOST: {args.host} | PORT: {args.port}")
-        ls = create_socket_launch_station(args.host, args.port)
-        print("Connect to Ground Station")
-    elif args.connection == "serial":
-        print(f"PORT: {args.port} | BAUDRATE: {args.baudrate}")
-        ls = create_serial_launch_station(args.port, args.baudrate)
+    links: List[SimulatedSerialLink] = []
+    if args.connection == "bus":
+        buses = [InProcessBus() for _ in range(args.links)]
+        peers = [EchoPeer(ComsDriver(bus.connect())) for bus in buses]
+        for peer in peers:
+            peer.start()
+        stations = [LaunchStation(ComsDriver(bus.connect())) for bus in buses]
+    elif args.connection == "serialsim":
+        impairment = LineImpairment(
+            bit_error_rate=args.bit_error_rate,
+            drop_rate=args.drop_rate,
+            burst_rate=args.burst_rate,
+            burst_length=args.burst_length,
+        )
+        # Each link gets its own errors, still reproducible from one seed
+        seeds = random.Random(args.seed)
+        links = [
+            SimulatedSerialLink(args.baudrate, impairment, seed=seeds.getrandbits(64))
+            for _ in range(args.links)
+        ]
+        for link in links:
+            link.start()
+        peers = [
+            EchoPeer(ComsDriver(SerialComsStrategy.from_args(link.port_b, args.baudrate)))
+            for link in links
+        ]
+        for peer in peers:
+            peer.start()
+        stations = [
+            create_serial_launch_station(link.port_a, args.baudrate) for link in links
+        ]
+    elif args.echo:
+        peers = [EchoPeer(echo_driver(args, i)) for i in range(args.links)]
+        for peer in peers:
+            peer.start()
+        print(f"Echoing {args.links} link(s). Press Ctrl+C to stop")
+        try:
+            th.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        print(f"Echoed {sum(p.echoed for p in peers)} message(s)")
+        return 0
     else:
-        print("Connection type not implimented")
-        return 123
-
-    q: List[ComsMessage] = []
-    ls.bind_queue(q)
-    time.sleep(1)
-
-    sending_thread = th.Thread(target=send_radio_state, args=(ls,), daemon=True)
-    sending_thread.start()
-
-    no_errs = True
-    while no_errs:
-        while len(q):
-            msg = q.pop(0)
-            print(
-                (
-                    "===============================\n"
-                    "Received New Message:\n"
-                    "===============================\n"
-                    f"ARMED:  {msg.ARMED}\n"
-                    f"ABORT:  {msg.ABORT}\n"
-                    f"QDM:    {msg.QDM}\n"
-                    f"STAB:   {msg.STAB}\n"
-                    f"LAUNCH: {msg.LAUNCH}\n"
-                    "===============================\n"
-                )
-            )
-        if not sending_thread.is_alive():
-            no_errs = False
-        time.sleep(args.delay if args.delay > 0 else 1)
+        stations = []
+        for i in range(args.links):
+            print(f"Waiting for link {i}")
+            stations.append(launch_station(args, i))
 
+    print(
+        f"Sending {args.rate} msg/s ({args.pattern}) on {args.links} link(s)"
+        f" for {args.duration} s"
+    )
+    report = LoadGenerator(stations, config).run()
+    for station in stations:
+        station.close()
+    for link in links:
+        link.close()
+    print(report.summary())
     return 0
 
 
-def send_radio_state(ls: LaunchStation) -> None:
-    while True:
-        if not ls.send(
-            {
-                "LAUNCH": ls.getLaunchFlag(),
-                "QDM": ls.getQDMFlag(),
-                "ABORT": ls.getAbortFlag(),
-                "STAB": ls.getStabFlag(),
-                "ARMED": ls.getArmedFlag(),
-                "DATA": {
-                    "origin": "balloon",
-                    "GPS": {
-                        "long": random.uniform(0, 1),
-                        "lat": random.uniform(0, 1),
-                        "alt": random.uniform(0, 1),
-                    },
-                    "gyro": {
-                        "x": random.uniform(0, 1),
-                        "y": random.uniform(0, 1),
-                        "z": random.uniform(0, 1),
-                    },
-                    "temp": random.uniform(0, 1),
-                    "acc": {
-                        "x": random.uniform(0, 1),
-                        "y": random.uniform(0, 1),
-                        "z": random.uniform(0, 1),
-                    },
-                },
-            }
-        ):
-            raise Exception("Sending thread failed to send radio state")
-        time.sleep(2)
+def launch_station(args: argparse.Namespace, i: int) -> LaunchStation:
+    if args.connection == "socket":
+        return create_socket_launch_station(args.host, args.port + i)
+    if args.connection == "udp":
+        return create_udp_launch_station(args.host, args.port + i)
+    if args.connection == "unix":
+        return create_unix_launch_station(unix_path(args, i))
+    if args.connection == "serial":
+        return create_serial_launch_station(serial_ports(args)[i], args.baudrate)
+    raise ValueError(f"Connection type '{args.connection}' not implimented")
+
+
+def echo_driver(args: argparse.Namespace, i: int) -> ComsDriver:
+    if args.connection == "socket":
+        return ComsDriver(SocketComsStrategy.connect_to(args.host, args.port + i))
+    if args.connection == "udp":
+        return ComsDriver(UdpComsStrategy.connect_to(args.host, args.port + i))
+    if args.connection == "unix":
+        return ComsDriver(SocketComsStrategy.connect_to_unix(unix_path(args, i)))
+    if args.connection == "serial":
+        return ComsDriver(
+            SerialComsStrategy.from_args(serial_ports(args)[i], args.baudrate)
+        )
+    raise ValueError(f"Connection type '{args.connection}' not implimented")
+
+
+def unix_path(args: argparse.Namespace, i: int) -> str:
+    return args.path if args.links == 1 else f"{args.path}.{i}"
+
+
+def serial_ports(args: argparse.Namespace) -> List[str]:
+    ports = args.port.split(",")
+    if len(ports) < args.links:
+        raise ValueError(f"{args.links} links need {args.links} serial ports")
+    return ports
 
 
 def get_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
-        "--delay",
-        "-d",
-        help="Time delay between checking queue for state change",
-        default=1,
+        "--links", "-n", help="Number of links to drive", default=1, type=int
+    )
+    parser.add_argument(
+        "--rate", "-r", help="Messages per second on each link", default=10.0, type=float
+    )
+    parser.add_argument(
+        "--duration", "-d", help="Seconds to send for", default=10.0, type=float
+    )
+    parser.add_argument(
+        "--pattern",
+        help="How sends are spaced in time",
+        choices=PATTERNS,
+        default="constant",
+    )
+    parser.add_argument(
+        "--burst",
+        help="Messages per burst of the burst pattern",
+        default=10,
         type=int,
     )
+    parser.add_argument(
+        "--payload",
+        help="Padding bytes per message: fixed:N, uniform:LOW:HIGH or normal:MEAN:STDDEV",
+        default="fixed:0",
+        type=str,
+    )
+    parser.add_argument(
+        "--drain",
+        help="Seconds to wait for echoes once sending stops",
+        default=1.0,
+        type=float,
+    )
+    parser.add_argument(
+        "--seed", help="Seed for reproducible load", default=None, type=int
+    )
+    parser.add_argument(
+        "--echo",
+        "-e",
+        help="Echo messages back to a load generator instead of generating load",
+        action="store_true",
+    )
     subparsers = parser.add_subparsers(
         title="Connection",
         dest="connection",
@@ -122,12 +216,35 @@ def get_args() -> argparse.Namespace:
         "--port", "-p", help="Port to allow connections", default=5000, type=int
     )
 
+    # UDP ARGS
+    udp = subparsers.add_parser("udp")
+    udp.add_argument(
+        "--host",
+        "-o",
+        help="IP address to receive datagrams at",
+        default="127.0.1.1",
+        type=str,
+    )
+    udp.add_argument(
+        "--port", "-p", help="Port to receive datagrams at", default=5000, type=int
+    )
+
+    # UNIX SOCKET ARGS
+    unix = subparsers.add_parser("unix")
+    unix.add_argument(
+        "--path",
+        "-p",
+        help="Path of the unix domain socket to accept connections at",
+        default="/tmp/orbitalcoms.sock",
+        type=str,
+    )
+
     # SERIAL ARGS
     serial = subparsers.add_parser("serial")
     serial.add_argument(
         "--port",
         "-p",
-        help="Serial port to send data to",
+        help="Comma separated serial ports to send data to, one per link",
         default="/dev/ttyUSB0",
         type=str,
     )
@@ -139,6 +256,48 @@ def get_args() -> argparse.Namespace:
         type=int,
     )
 
+    # IN-PROCESS BUS ARGS
+    subparsers.add_parser(
+        "bus", help="Run both ends of every link in this process, echoing messages"
+    )
+
+    # SIMULATED SERIAL ARGS
+    serialsim = subparsers.add_parser(
+        "serialsim",
+        help="Run both ends of every link in this process over a simulated serial line",
+    )
+    serialsim.add_argument(
+        "--baudrate",
+        "-b",
+        help="Baudrate of the simulated line",
+        default=9600,
+        type=int,
+    )
+    serialsim.add_argument(
+        "--bit-error-rate",
+        help="Probability that any bit is flipped",
+        default=0.0,
+        type=float,
+    )
+    serialsim.add_argument(
+        "--drop-rate",
+        help="Probability that any byte is lost",
+        default=0.0,
+        type=float,
+    )
+    serialsim.add_argument(
+        "--burst-rate",
+        help="Probability that a burst of corrupted bytes starts at any byte",
+        default=0.0,
+        type=float,
+    )
+    serialsim.add_argument(
+        "--burst-length",
+        help="Bytes corrupted by each burst",
+        default=8,
+        type=int,
+    )
+
     return parser.parse_args()
 
 
@@ -8,20 +8,43 @@ from .coms import (
     ComsMessageParseError,
     ComsStrategy,
     ComsSubscription,
+    ImpairedComsStrategy,
+    Impairment,
+    InProcessBus,
+    InProcessBusStrategy,
     LocalComsStrategy,
+    MulticastPublishStrategy,
+    MulticastSubscribeStrategy,
     OneTimeComsSubscription,
+    ReliableComsStrategy,
+    SeqPacketComsStrategy,
     SerialComsStrategy,
+    SharedMemoryComsStrategy,
     SocketComsStrategy,
+    TeeComsStrategy,
+    UdpComsStrategy,
+    WritePriority,
     construct_message,
 )
 from .stations import (
+    AdaptiveResend,
     GroundStation,
     LaunchStation,
+    LinkQuality,
+    LinkState,
+    ObserverStation,
     Station,
+    StationManager,
+    create_multicast_ground_station,
+    create_multicast_launch_station,
     create_serial_ground_station,
     create_serial_launch_station,
     create_socket_ground_station,
     create_socket_launch_station,
+    create_udp_ground_station,
+    create_udp_launch_station,
+    create_unix_ground_station,
+    create_unix_launch_station,
 )
 
 if sys.version_info < (3, 7):
@@ -35,16 +58,39 @@ __all__ = [
     "ComsMessageParseError",
     "ComsStrategy",
     "ComsSubscription",
+    "InProcessBus",
+    "InProcessBusStrategy",
     "LocalComsStrategy",
     "OneTimeComsSubscription",
     "SerialComsStrategy",
+    "SharedMemoryComsStrategy",
     "SocketComsStrategy",
+    "SeqPacketComsStrategy",
+    "UdpComsStrategy",
+    "MulticastPublishStrategy",
+    "MulticastSubscribeStrategy",
+    "TeeComsStrategy",
+    "ReliableComsStrategy",
+    "ImpairedComsStrategy",
+    "Impairment",
+    "WritePriority",
     "construct_message",
     "GroundStation",
     "LaunchStation",
+    "ObserverStation",
+    "LinkQuality",
+    "LinkState",
+    "AdaptiveResend",
     "Station",
+    "StationManager",
     "create_socket_launch_station",
     "create_socket_ground_station",
     "create_serial_ground_station",
     "create_serial_launch_station",
+    "create_udp_ground_station",
+    "create_udp_launch_station",
+    "create_unix_ground_station",
+    "create_unix_launch_station",
+    "create_multicast_ground_station",
+    "create_multicast_launch_station",
 ]
@@ -1,13 +1,29 @@
+from __future__ import annotations
+
 import argparse
-from typing import cast
+from typing import List, cast
 
 from typing_extensions import Protocol
 
+import orbitalcoms._app.dashboard as dashboard
 import orbitalcoms._app.headless as headless
+import orbitalcoms._app.plot as plot
+import orbitalcoms._app.relay as relay
 import orbitalcoms._app.tkgui as tkgui
 from orbitalcoms.coms.drivers import ComsDriver
-from orbitalcoms.coms.strategies import SerialComsStrategy, SocketComsStrategy
+from orbitalcoms.coms.strategies import (
+    ComsStrategy,
+    MulticastSubscribeStrategy,
+    ReliableComsStrategy,
+    SeqPacketComsStrategy,
+    SerialComsStrategy,
+    SocketComsStrategy,
+    UdpComsStrategy,
+)
+from orbitalcoms.coms.strategies.multicaststrat import DEFAULT_GROUP, DEFAULT_PORT
 from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.observerstation import ObserverStation
+from orbitalcoms.stations.resend import AdaptiveResend
 
 
 class BaseArgs(Protocol):
@@ -15,7 +31,17 @@ class BaseArgs(Protocol):
 
     frontend: str
     interval_send: int
+    adaptive_send: bool
+    reliable: bool
     connection: str
+    relay_host: str
+    relay_port: int
+    relay_control_port: int
+    relay_unix: str | None
+    plot: List[str] | None
+    plot_history: int
+    show: List[str] | None
+    refresh_rate: float
 
 
 class SocketArgs(BaseArgs, Protocol):
@@ -36,27 +62,84 @@ class SerialArgs(BaseArgs, Protocol):
     baudrate: int
 
 
+class UnixArgs(BaseArgs, Protocol):
+    """Arguments needed for launching orbitalcoms
+    with the unix domain socket strategy
+    """
+
+    path: str
+    seqpacket: bool
+
+
+class MulticastArgs(BaseArgs, Protocol):
+    """Arguments needed for launching orbitalcoms
+    with the multicast subscribe strategy
+    """
+
+    group: str
+    port: int
+
+
 def main() -> None:
     """Main funcion for launcheing the application"""
 
     args = get_args()
     if args.connection == "socket":
         args = cast(SocketArgs, args)
-        coms = ComsDriver(SocketComsStrategy.connect_to(host=args.host, port=args.port))
+        strat: ComsStrategy = SocketComsStrategy.connect_to(
+            host=args.host, port=args.port
+        )
     elif args.connection == "serial":
         args = cast(SerialArgs, args)
-        coms = ComsDriver(
-            SerialComsStrategy.from_args(port=args.port, baudrate=args.baudrate)
-        )
+        strat = SerialComsStrategy.from_args(port=args.port, baudrate=args.baudrate)
+    elif args.connection == "udp":
+        args = cast(SocketArgs, args)
+        strat = UdpComsStrategy.connect_to(host=args.host, port=args.port)
+    elif args.connection == "unix":
+        args = cast(UnixArgs, args)
+        strat_type = SeqPacketComsStrategy if args.seqpacket else SocketComsStrategy
+        strat = strat_type.connect_to_unix(args.path)
+    elif args.connection == "multicast":
+        args = cast(MulticastArgs, args)
+        strat = MulticastSubscribeStrategy.join(args.group, args.port)
     else:
         raise ValueError("Could not determine how to manage communication")
 
-    with GroundStation(coms) as gs:
-        gs.set_send_interval(args.interval_send)
+    if args.reliable:
+        strat = ReliableComsStrategy(strat)
+
+    # A multicast subscription only listens, so its flags follow what the
+    # launch station publishes rather than what this station sends
+    station_type = ObserverStation if args.connection == "multicast" else GroundStation
+    with station_type(ComsDriver(strat)) as gs:
+        if args.adaptive_send:
+            gs.set_adaptive_resend(
+                AdaptiveResend(max_interval=args.interval_send)
+                if args.interval_send > 0
+                else AdaptiveResend()
+            )
+        else:
+            gs.set_send_interval(args.interval_send)
         if args.frontend == "dev":
-            tkgui.run_app(gs)
+            tkgui.run_app(
+                gs,
+                plot_fields=plot.DEFAULT_FIELDS if args.plot is None else args.plot,
+                plot_history=args.plot_history,
+            )
         elif args.frontend == "headless":
-            headless.run_app(gs)
+            headless.run_app(
+                gs,
+                fields=dashboard.DEFAULT_FIELDS if args.show is None else args.show,
+                refresh_hz=args.refresh_rate,
+            )
+        elif args.frontend == "relay":
+            relay.run_app(
+                gs,
+                host=args.relay_host,
+                port=args.relay_port,
+                control_port=args.relay_control_port,
+                unix_path=args.relay_unix,
+            )
         else:
             raise ValueError("Failed to find selected frontend")
 
@@ -82,6 +165,78 @@ def get_args() -> BaseArgs:
         default=0,
         type=int,
     )
+    parser.add_argument(
+        "--adaptive-send",
+        "-a",
+        help=(
+            "resend quickly after a state change, backing off to --interval-send"
+            " once the launch station echoes the state, or to"
+            f" {AdaptiveResend().max_interval:g} seconds if no interval is given"
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--reliable",
+        "-r",
+        help="Acknowledge and retransmit messages. The launch station must do the same",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--relay-host",
+        help="IP address the relay frontend accepts observers at",
+        default="127.0.1.1",
+        type=str,
+    )
+    parser.add_argument(
+        "--relay-port",
+        help="Port the relay frontend accepts observers at",
+        default=5100,
+        type=int,
+    )
+    parser.add_argument(
+        "--relay-control-port",
+        help="Port the relay frontend accepts its single controller at",
+        default=5101,
+        type=int,
+    )
+    parser.add_argument(
+        "--relay-unix",
+        help="Path of a unix domain socket the relay frontend also accepts observers at",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--plot",
+        help=(
+            "Dot separated path of a numeric DATA field to plot in the dev frontend,"
+            f" e.g. GPS.alt. May be repeated. Defaults to {', '.join(plot.DEFAULT_FIELDS)}"
+        ),
+        action="append",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--plot-history",
+        help="Number of samples of each field kept by the dev frontend's plots",
+        default=plot.DEFAULT_HISTORY,
+        type=int,
+    )
+    parser.add_argument(
+        "--show",
+        help=(
+            "Dot separated path of a DATA field shown by the headless dashboard."
+            f" May be repeated. Defaults to {', '.join(dashboard.DEFAULT_FIELDS)}"
+        ),
+        action="append",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "--refresh-rate",
+        help="Most times per second the headless dashboard is redrawn",
+        default=dashboard.DEFAULT_REFRESH_HZ,
+        type=float,
+    )
     subparsers = parser.add_subparsers(
         title="Connection",
         dest="connection",
@@ -103,6 +258,23 @@ def get_args() -> BaseArgs:
         "--port", "-p", help="Port to allow connections", default=5000, type=int
     )
 
+    # UDP ARGS
+    udp = subparsers.add_parser("udp")
+    udp.add_argument(
+        "--host",
+        "-o",
+        help="IP address of the launch station",
+        default="127.0.1.1",
+        type=str,
+    )
+    udp.add_argument(
+        "--port",
+        "-p",
+        help="Port the launch station listens on",
+        default=5000,
+        type=int,
+    )
+
     # SERIAL ARGS
     serial = subparsers.add_parser("serial")
     serial.add_argument(
@@ -120,6 +292,39 @@ def get_args() -> BaseArgs:
         type=int,
     )
 
+    # UNIX SOCKET ARGS
+    unix = subparsers.add_parser("unix")
+    unix.add_argument(
+        "--path",
+        "-p",
+        help="Path of the unix domain socket to connect to",
+        default="/tmp/orbitalcoms.sock",
+        type=str,
+    )
+    unix.add_argument(
+        "--seqpacket",
+        "-s",
+        help="Use a sequenced packet socket rather than a stream socket",
+        action="store_true",
+    )
+
+    # MULTICAST ARGS
+    multicast = subparsers.add_parser("multicast")
+    multicast.add_argument(
+        "--group",
+        "-g",
+        help="Multicast group the launch station publishes to",
+        default=DEFAULT_GROUP,
+        type=str,
+    )
+    multicast.add_argument(
+        "--port",
+        "-p",
+        help="Port the launch station publishes to",
+        default=DEFAULT_PORT,
+        type=int,
+    )
+
     return cast(BaseArgs, parser.parse_args())
 
 
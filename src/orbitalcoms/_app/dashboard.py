@@ -0,0 +1,198 @@
+"""Curses dashboard for the headless frontend
+
+Received messages only update a small in-memory model. The screen is drawn
+from that model, the station's snapshot and its link quality by the thread
+running the dashboard, at most ``refresh_hz`` times a second, so a high
+message rate never turns into terminal output on the read loop thread.
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+from collections import deque
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Deque, List, Sequence
+
+try:
+    import curses
+except ImportError:  # pragma: no cover - curses is not available on Windows
+    curses = None  # type: ignore
+
+from .._utils.datapath import lookup
+from ..coms.messages.message import ComsMessage
+from ..stations.linkmonitor import LinkQuality
+from ..stations.snapshot import StationSnapshot
+
+if TYPE_CHECKING:
+    from orbitalcoms.stations.groundstation import GroundStation
+
+#: Most times per second the dashboard is redrawn
+DEFAULT_REFRESH_HZ = 10
+
+#: Fields shown when none are chosen on the command line
+DEFAULT_FIELDS = ("GPS.lat", "GPS.long", "GPS.alt", "temp")
+
+#: Keys that toggle mission flags, shown in the dashboard's help line
+KEY_HELP = "[r] ARMED  [a] ABORT  [q] QDM  [s] STAB  [l] LAUNCH  [esc] quit"
+
+_ESC = 27
+
+
+class DashboardModel:
+    """Counts messages received by the station. Can be bound as a station's
+    queue and does no I/O when a message is appended
+    """
+
+    def __init__(self, window: float = 5.0) -> None:
+        """
+        :param window: Seconds of history the message rate is averaged over
+        :type window: float
+        """
+        self._window = window
+        self._times: Deque[float] = deque()
+        self._lock = Lock()
+        self.received = 0
+
+    def append(self, _: ComsMessage) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.received += 1
+            self._times.append(now)
+            self._trim(now)
+
+    def rate(self) -> float:
+        """Messages received per second over the last ``window`` seconds"""
+        with self._lock:
+            self._trim(time.monotonic())
+            return len(self._times) / self._window
+
+    def _trim(self, now: float) -> None:
+        while self._times and self._times[0] < now - self._window:
+            self._times.popleft()
+
+
+def render(
+    snap: StationSnapshot,
+    quality: LinkQuality,
+    model: DashboardModel,
+    fields: Sequence[str],
+) -> List[str]:
+    """Lines of text shown by the dashboard
+
+    :param snap: The station's snapshot
+    :type snap: StationSnapshot
+    :param quality: The station's link quality
+    :type quality: LinkQuality
+    :param model: Counts of received messages
+    :type model: DashboardModel
+    :param fields: Dot separated paths of the ``DATA`` fields to show
+    :type fields: Sequence[str]
+    :return: Lines to draw, top to bottom
+    :rtype: List[str]
+    """
+
+    def flag(name: str) -> str:
+        sent = getattr(snap.last_sent, name, None)
+        recv = getattr(snap.last_received, name, None)
+        return f"{name:<8}{'-' if sent is None else sent:>6}{'-' if recv is None else recv:>6}"
+
+    def stamp(t: float | None) -> str:
+        return "-" if t is None else str(datetime.datetime.fromtimestamp(t))
+
+    def seconds(s: float | None) -> str:
+        return "-" if s is None else f"{s * 1000:.1f} ms"
+
+    lines = [
+        "ORBITALCOMS GROUND STATION",
+        "",
+        f"{'FLAG':<8}{'SENT':>6}{'RECV':>6}",
+    ]
+    lines += [flag(f) for f in ("ARMED", "ABORT", "QDM", "STAB", "LAUNCH")]
+    lines += [
+        "",
+        f"Last sent:   {stamp(snap.last_sent_time)}",
+        f"Last recv:   {stamp(snap.last_received_time)}",
+        f"Received:    {model.received} ({model.rate():.1f} msg/s)",
+        f"Link:        {quality.state.value}",
+        f"RTT:         {seconds(quality.rtt)} (+/- {seconds(quality.rtt_var)})",
+        f"Loss:        {quality.loss:.0%}",
+        f"Silence:     {'-' if quality.silence is None else f'{quality.silence:.1f} s'}",
+        "",
+        "DATA",
+    ]
+    for field in fields:
+        value = lookup(snap.data, field)
+        lines.append(f"  {field:<16}{'-' if value is None else f'{value:.6g}'}")
+    lines += ["", KEY_HELP]
+    return lines
+
+
+class Dashboard:
+    """Draws a station's state in place in the terminal and passes key
+    presses to a handler
+    """
+
+    def __init__(
+        self,
+        gs: GroundStation,
+        on_key: Callable[[str], Any],
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        refresh_hz: float = DEFAULT_REFRESH_HZ,
+    ) -> None:
+        """
+        :param gs: Station to display
+        :type gs: GroundStation
+        :param on_key: Called with each printable key pressed
+        :type on_key: Callable[[str], Any]
+        :param fields: Dot separated paths of the ``DATA`` fields to show
+        :type fields: Sequence[str]
+        :param refresh_hz: Most times per second to redraw
+        :type refresh_hz: float
+        """
+        self._gs = gs
+        self._on_key = on_key
+        self._fields = fields
+        self._period = 1 / refresh_hz
+        self.model = DashboardModel()
+        self._gs.bind_queue(self.model)
+
+    def run(self) -> None:
+        """Show the dashboard until escape is pressed"""
+        if curses is None:
+            raise RuntimeError("The dashboard requires the curses module")
+        curses.wrapper(self._loop)
+
+    def _loop(self, stdscr: Any) -> None:
+        if hasattr(curses, "set_escdelay"):
+            curses.set_escdelay(25)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        stdscr.timeout(max(1, int(self._period * 1000)))
+
+        next_draw = 0.0
+        while True:
+            now = time.monotonic()
+            if now >= next_draw:
+                self._draw(stdscr)
+                next_draw = now + self._period
+            key = stdscr.getch()
+            if key == _ESC:
+                return
+            if 0 <= key < 256 and chr(key).isprintable():
+                self._on_key(chr(key))
+
+    def _draw(self, stdscr: Any) -> None:
+        lines = render(
+            self._gs.snapshot(), self._gs.link_quality, self.model, self._fields
+        )
+        height, width = stdscr.getmaxyx()
+        stdscr.erase()
+        for row, line in enumerate(lines[:height]):
+            try:
+                stdscr.addnstr(row, 0, line, width - 1)
+            except curses.error:
+                pass
+        stdscr.refresh()
@@ -1,16 +1,21 @@
 """Headless frontend to ensure that the orbitalcoms package can be used
 in a purely terminal based enviornment
+
+When run in a terminal the station is shown on a curses dashboard, see
+``dashboard``. Otherwise every received message is printed.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import sys
+from typing import TYPE_CHECKING, Sequence
 
 from pynput import keyboard
 from pynput.keyboard import Key, KeyCode
 
 from ..coms import messages
 from ..coms.messages.message import ComsMessage
+from . import dashboard
 
 if TYPE_CHECKING:
     from orbitalcoms.stations.groundstation import GroundStation
@@ -19,7 +24,6 @@ if TYPE_CHECKING:
 class GSKeyboardControl:
     def __init__(self, gs: GroundStation) -> None:
         self._gs = gs
-        self._gs.bind_queue(DisplayUpdater())
 
     def on_press(self, key: KeyCode | Key | None) -> bool:
         return True
@@ -28,75 +32,87 @@ class GSKeyboardControl:
         if key == Key.esc:
             # Stop the listener
             return False
-        if isinstance(key, KeyCode):
-            if key.char == "a":
-                m = messages.construct_message(
-                    {
-                        "ABORT": not self._gs.abort,
-                        "QDM": self._gs.qdm,
-                        "STAB": self._gs.stab,
-                        "LAUNCH": self._gs.launch,
-                        "ARMED": self._gs.armed,
-                        "DATA": self._gs.data,
-                    }
-                )
-                self._gs.send(m)
-                return True
-            if key.char == "l":
-                m = messages.construct_message(
-                    {
-                        "ABORT": self._gs.abort,
-                        "QDM": self._gs.qdm,
-                        "STAB": self._gs.stab,
-                        "LAUNCH": not self._gs.launch,
-                        "ARMED": self._gs.armed,
-                        "DATA": self._gs.data,
-                    }
-                )
-                self._gs.send(m)
-                return True
-            if key.char == "q":
-                m = messages.construct_message(
-                    {
-                        "ABORT": self._gs.abort,
-                        "QDM": not self._gs.qdm,
-                        "STAB": self._gs.stab,
-                        "LAUNCH": self._gs.launch,
-                        "ARMED": self._gs.armed,
-                        "DATA": self._gs.data,
-                    }
-                )
-                self._gs.send(m)
-                return True
-            if key.char == "r":
-                m = messages.construct_message(
-                    {
-                        "ABORT": self._gs.abort,
-                        "QDM": self._gs.qdm,
-                        "STAB": self._gs.stab,
-                        "LAUNCH": self._gs.launch,
-                        "ARMED": not self._gs.armed,
-                        "DATA": self._gs.data,
-                    }
-                )
-                self._gs.send(m)
-                return True
-            if key.char == "s":
-                m = messages.construct_message(
-                    {
-                        "ABORT": self._gs.abort,
-                        "QDM": self._gs.qdm,
-                        "STAB": not self._gs.stab,
-                        "LAUNCH": self._gs.launch,
-                        "ARMED": self._gs.armed,
-                        "DATA": self._gs.data,
-                    }
-                )
-                self._gs.send(m)
+        if isinstance(key, KeyCode) and key.char is not None:
+            if self.press(key.char):
                 return True
         print(f"Unhandled Input Key: {key}")
         return True
 
+    def press(self, char: str) -> bool:
+        """Toggle the mission flag bound to a key
+
+        :param char: The key pressed
+        :type char: str
+        :return: True if the key is bound to a flag
+        :rtype: bool
+        """
+        if char == "a":
+            m = messages.construct_message(
+                {
+                    "ABORT": not self._gs.abort,
+                    "QDM": self._gs.qdm,
+                    "STAB": self._gs.stab,
+                    "LAUNCH": self._gs.launch,
+                    "ARMED": self._gs.armed,
+                    "DATA": self._gs.data,
+                }
+            )
+            self._gs.send(m)
+            return True
+        if char == "l":
+            m = messages.construct_message(
+                {
+                    "ABORT": self._gs.abort,
+                    "QDM": self._gs.qdm,
+                    "STAB": self._gs.stab,
+                    "LAUNCH": not self._gs.launch,
+                    "ARMED": self._gs.armed,
+                    "DATA": self._gs.data,
+                }
+            )
+            self._gs.send(m)
+            return True
+        if char == "q":
+            m = messages.construct_message(
+                {
+                    "ABORT": self._gs.abort,
+                    "QDM": not self._gs.qdm,
+                    "STAB": self._gs.stab,
+                    "LAUNCH": self._gs.launch,
+                    "ARMED": self._gs.armed,
+                    "DATA": self._gs.data,
+                }
+            )
+            self._gs.send(m)
+            return True
+        if char == "r":
+            m = messages.construct_message(
+                {
+                    "ABORT": self._gs.abort,
+                    "QDM": self._gs.qdm,
+                    "STAB": self._gs.stab,
+                    "LAUNCH": self._gs.launch,
+                    "ARMED": not self._gs.armed,
+                    "DATA": self._gs.data,
+                }
+            )
+            self._gs.send(m)
+            return True
+        if char == "s":
+            m = messages.construct_message(
+                {
+                    "ABORT": self._gs.abort,
+                    "QDM": self._gs.qdm,
+                    "STAB": not self._gs.stab,
+                    "LAUNCH": self._gs.launch,
+                    "ARMED": self._gs.armed,
+                    "DATA": self._gs.data,
+                }
+            )
+            self._gs.send(m)
+            return True
+        return False
+
 
 class DisplayUpdater:
     def append(self, m: ComsMessage) -> None:
@@ -115,8 +131,20 @@ class DisplayUpdater:
         )
 
 
-def run_app(gs: GroundStation) -> None:
+def run_app(
+    gs: GroundStation,
+    fields: Sequence[str] = dashboard.DEFAULT_FIELDS,
+    refresh_hz: float = dashboard.DEFAULT_REFRESH_HZ,
+) -> None:
     keyboard_ctrl = GSKeyboardControl(gs)
+    if dashboard.curses is not None and sys.stdout.isatty():
+        dashboard.Dashboard(
+            gs, keyboard_ctrl.press, fields=fields, refresh_hz=refresh_hz
+        ).run()
+        return
+
+    # Without a terminal to draw in, print each message as it arrives
+    gs.bind_queue(DisplayUpdater())
     with keyboard.Listener(
         on_press=keyboard_ctrl.on_press, on_release=keyboard_ctrl.on_release
     ) as listener:
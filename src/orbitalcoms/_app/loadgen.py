@@ -0,0 +1,411 @@
+"""Load generator that drives any number of launch station links with
+synthetic telemetry and measures how the links keep up
+
+Each link sends from its own thread on a schedule fixed in advance, so a slow
+send shows up as a lower achieved rate rather than as drift. Sending stops
+at the end of the test, and messages that were due but not sent by then are
+counted as unsent. Messages carry
+their link, sequence number and send time in ``DATA["loadgen"]``. If the
+other end of a link echoes messages back, see ``EchoPeer``, the round trip
+latency of every echoed message is recorded and any message that is never
+echoed is counted as dropped.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterator, List, Sequence, Set
+
+from attrs import define, field
+
+from ..coms.drivers import ComsDriver
+from ..coms.messages import ComsMessage
+from ..coms.subscribers import ComsSubscription
+from ..stations.station import Station
+
+#: Arrival patterns understood by ``send_delays``
+PATTERNS = ("constant", "poisson", "burst")
+
+
+@define(frozen=True)
+class SizeDistribution:
+    """Distribution of the number of padding bytes added to each message
+
+    Written on the command line as ``fixed:N``, ``uniform:LOW:HIGH`` or
+    ``normal:MEAN:STDDEV``.
+    """
+
+    kind: str = "fixed"
+    a: float = 0
+    b: float = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> SizeDistribution:
+        """Create a distribution from its command line form
+
+        :param spec: The distribution, e.g. ``uniform:0:512``
+        :type spec: str
+        :raises ValueError: If the distribution is not understood
+        :return: The distribution
+        :rtype: SizeDistribution
+        """
+        kind, *params = spec.split(":")
+        expected = {"fixed": 1, "uniform": 2, "normal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Unknown payload size distribution '{spec}'")
+        values = [float(p) for p in params] + [0.0]
+        return cls(kind, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> int:
+        if self.kind == "uniform":
+            size = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            size = rng.gauss(self.a, self.b)
+        else:
+            size = self.a
+        return max(0, int(size))
+
+
+def send_delays(
+    pattern: str, rate: float, rng: random.Random, burst: int = 10
+) -> Iterator[float]:
+    """Seconds to wait before each send so that messages are sent at ``rate``
+    per second on average
+
+    - ``constant`` sends evenly spaced messages
+    - ``poisson`` sends with exponentially distributed gaps
+    - ``burst`` sends ``burst`` messages back to back, then waits
+
+    :param pattern: One of ``PATTERNS``
+    :type pattern: str
+    :param rate: Messages per second
+    :type rate: float
+    :param rng: Source of randomness
+    :type rng: random.Random
+    :param burst: Messages per burst of the ``burst`` pattern
+    :type burst: int
+    :raises ValueError: If the pattern is not known
+    :return: Endless delays
+    :rtype: Iterator[float]
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown arrival pattern '{pattern}'")
+    period = 1 / rate
+    n = 0
+    while True:
+        if pattern == "poisson":
+            yield rng.expovariate(rate)
+        elif pattern == "burst":
+            yield period * burst if (n + 1) % burst == 0 else 0.0
+        else:
+            yield period
+        n += 1
+
+
+class Trajectory:
+    """Synthetic balloon flight producing GPS, IMU and temperature readings
+    in the same shape as the launch station's telemetry
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        lat: float = 40.4237,
+        long: float = -86.9212,
+        alt: float = 200.0,
+        ascent: float = 5.0,
+    ) -> None:
+        """
+        :param rng: Source of sensor noise
+        :type rng: random.Random
+        :param lat: Starting latitude in degrees
+        :type lat: float
+        :param long: Starting longitude in degrees
+        :type long: float
+        :param alt: Starting altitude in meters
+        :type alt: float
+        :param ascent: Rate of climb in meters per second
+        :type ascent: float
+        """
+        self._rng = rng
+        self._lat = lat
+        self._long = long
+        self._alt = alt
+        self._ascent = ascent
+        # Drift with a slowly changing wind
+        self._heading = rng.uniform(0, 2 * math.pi)
+
+    def at(self, t: float) -> Dict[str, Any]:
+        """Readings ``t`` seconds into the flight
+
+        :param t: Seconds since launch
+        :type t: float
+        :return: Telemetry data
+        :rtype: Dict[str, Any]
+        """
+        noise = self._rng.gauss
+        alt = self._alt + self._ascent * t
+        heading = self._heading + 0.01 * t
+        drift = 2e-5 * t
+        return {
+            "origin": "balloon",
+            "GPS": {
+                "lat": self._lat + drift * math.cos(heading) + noise(0, 1e-6),
+                "long": self._long + drift * math.sin(heading) + noise(0, 1e-6),
+                "alt": alt + noise(0, 2.0),
+            },
+            "gyro": {
+                "x": noise(0, 0.05),
+                "y": noise(0, 0.05),
+                "z": 0.2 * math.sin(0.5 * t) + noise(0, 0.05),
+            },
+            "temp": 15.0 - 0.0065 * alt + noise(0, 0.1),
+            "acc": {
+                "x": noise(0, 0.1),
+                "y": noise(0, 0.1),
+                "z": 9.81 + noise(0, 0.1),
+            },
+        }
+
+
+@define
+class LoadConfig:
+    """How a ``LoadGenerator`` sends"""
+
+    #: Messages per second sent on each link
+    rate: float = 10.0
+    #: Seconds to send for
+    duration: float = 10.0
+    #: One of ``PATTERNS``
+    pattern: str = "constant"
+    #: Messages per burst of the ``burst`` pattern
+    burst: int = 10
+    #: Padding bytes added to each message
+    payload: SizeDistribution = field(factory=SizeDistribution)
+    #: Seconds to wait for echoes once sending stops
+    drain: float = 1.0
+    #: Seed for payload sizes, send times and telemetry
+    seed: int | None = None
+
+
+@define
+class LinkReport:
+    """What happened on one link during a load test"""
+
+    #: Messages sent
+    sent: int = 0
+    #: Messages that could not be sent
+    failed: int = 0
+    #: Messages due before the test ended that were never sent because the
+    #: link fell behind
+    unsent: int = 0
+    #: Messages echoed back by the other end
+    echoed: int = 0
+    #: Seconds spent sending
+    elapsed: float = 0.0
+    #: Round trip time in seconds of each echoed message
+    latencies: List[float] = field(factory=list)
+
+    @property
+    def rate(self) -> float:
+        """Messages sent per second"""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def dropped(self) -> int:
+        """Messages sent but never echoed. Only meaningful when the other
+        end echoes
+        """
+        return self.sent - self.echoed
+
+
+@define
+class LoadReport:
+    """What happened on every link during a load test"""
+
+    links: List[LinkReport]
+
+    @property
+    def sent(self) -> int:
+        return sum(link.sent for link in self.links)
+
+    @property
+    def failed(self) -> int:
+        return sum(link.failed for link in self.links)
+
+    @property
+    def unsent(self) -> int:
+        return sum(link.unsent for link in self.links)
+
+    @property
+    def echoed(self) -> int:
+        return sum(link.echoed for link in self.links)
+
+    @property
+    def dropped(self) -> int:
+        return sum(link.dropped for link in self.links)
+
+    @property
+    def rate(self) -> float:
+        """Messages sent per second across all links"""
+        return sum(link.rate for link in self.links)
+
+    @property
+    def latencies(self) -> List[float]:
+        return sorted(lat for link in self.links for lat in link.latencies)
+
+    def summary(self) -> str:
+        """Human readable summary of the report"""
+        lines = [
+            f"Links:    {len(self.links)}",
+            f"Sent:     {self.sent} ({self.rate:.1f} msg/s)",
+            f"Failed:   {self.failed}",
+            f"Unsent:   {self.unsent}",
+            f"Echoed:   {self.echoed}",
+            f"Dropped:  {self.dropped}",
+        ]
+        lats = self.latencies
+        if lats:
+            p99 = lats[min(len(lats) - 1, int(len(lats) * 0.99))]
+            lines.append(
+                "Latency:  "
+                f"mean {statistics.mean(lats) * 1000:.2f} ms, "
+                f"p50 {statistics.median(lats) * 1000:.2f} ms, "
+                f"p99 {p99 * 1000:.2f} ms, "
+                f"max {lats[-1] * 1000:.2f} ms"
+            )
+        else:
+            lines.append("Latency:  no echoes received")
+        return "\n".join(lines)
+
+
+class _EchoCollector:
+    """Queue bound to a station that records the echoes of its own messages"""
+
+    def __init__(self, link: int, report: LinkReport) -> None:
+        self._link = link
+        self._report = report
+        self._seen: Set[int] = set()
+        self._lock = Lock()
+
+    def append(self, m: ComsMessage) -> None:
+        now = time.time()
+        tag = m.DATA.get("loadgen") if isinstance(m.DATA, dict) else None
+        if not isinstance(tag, dict) or tag.get("link") != self._link:
+            return
+        with self._lock:
+            if tag["seq"] in self._seen:
+                return
+            self._seen.add(tag["seq"])
+            self._report.echoed += 1
+            self._report.latencies.append(now - tag["t"])
+
+
+class LoadGenerator:
+    """Sends synthetic telemetry over many stations at once"""
+
+    def __init__(self, stations: Sequence[Station], config: LoadConfig) -> None:
+        """
+        :param stations: Stations to send from, one per link. Their queues
+            are replaced to collect echoes
+        :type stations: Sequence[Station]
+        :param config: How to send
+        :type config: LoadConfig
+        """
+        self._stations = stations
+        self._config = config
+        self._stop = Event()
+
+    def stop(self) -> None:
+        """Stop sending before the configured duration has passed"""
+        self._stop.set()
+
+    def run(self) -> LoadReport:
+        """Send on every link for the configured duration, then wait for
+        echoes
+
+        :return: What happened on each link
+        :rtype: LoadReport
+        """
+        seeds = random.Random(self._config.seed)
+        report = LoadReport([LinkReport() for _ in self._stations])
+        threads = []
+        for i, (station, link) in enumerate(zip(self._stations, report.links)):
+            station.bind_queue(_EchoCollector(i, link))
+            rng = random.Random(seeds.getrandbits(64))
+            threads.append(
+                Thread(target=self._send_loop, args=(i, station, link, rng), daemon=True)
+            )
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if self._config.drain > 0:
+            deadline = time.monotonic() + self._config.drain
+            while time.monotonic() < deadline and report.echoed < report.sent:
+                time.sleep(0.01)
+        return report
+
+    def _send_loop(
+        self, link: int, station: Station, report: LinkReport, rng: random.Random
+    ) -> None:
+        config = self._config
+        trajectory = Trajectory(rng)
+        delays = send_delays(config.pattern, config.rate, rng, config.burst)
+        start = time.monotonic()
+        end = start + config.duration
+        next_send = start
+        seq = 0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if next_send >= end:
+                break
+            if now >= end:
+                # Fell behind, so the rest of the schedule was never sent
+                while next_send < end:
+                    report.unsent += 1
+                    next_send += next(delays)
+                break
+            if next_send > now:
+                self._stop.wait(next_send - now)
+                continue
+            data = trajectory.at(next_send - start)
+            data["pad"] = "x" * config.payload.sample(rng)
+            data["loadgen"] = {"link": link, "seq": seq, "t": time.time()}
+            sent = station.send(
+                {"ABORT": 0, "QDM": 0, "STAB": 0, "LAUNCH": 0, "ARMED": 0, "DATA": data}
+            )
+            if sent:
+                report.sent += 1
+            else:
+                report.failed += 1
+            seq += 1
+            next_send += next(delays)
+        report.elapsed = time.monotonic() - start
+
+
+class EchoPeer:
+    """Writes every message a driver receives straight back, so that a
+    ``LoadGenerator`` on the other end can measure round trip latency
+    """
+
+    def __init__(self, driver: ComsDriver) -> None:
+        self._driver = driver
+        self.echoed = 0
+        self._sub = ComsSubscription(self._echo)
+
+    def _echo(self, m: ComsMessage) -> None:
+        if self._driver.write(m, suppress_errors=True):
+            self.echoed += 1
+
+    def start(self) -> None:
+        self._driver.register_subscriber(self._sub)
+        self._driver.start_read_loop()
+
+    def stop(self) -> None:
+        self._driver.unregister_subscriber(self._sub)
+        self._driver.end_read_loop()
@@ -0,0 +1,160 @@
+"""Live plots of numeric ``DATA`` fields for the development GUI
+
+Samples are kept in fixed size ring buffers and reduced to one min/max pair
+per pixel column before drawing, so the cost of a redraw depends only on the
+size of the buffers and the width of the plot, never on the sample rate.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+from threading import Lock
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .._utils.datapath import lookup
+
+#: Samples kept for each plotted field
+DEFAULT_HISTORY = 2000
+
+#: Fields plotted when none are chosen on the command line
+DEFAULT_FIELDS = ("GPS.alt", "acc.x", "acc.y", "acc.z")
+
+_COLORS = ("#1f77b4", "#d62728", "#2ca02c", "#9467bd", "#ff7f0e", "#8c564b")
+
+
+class SampleRing:
+    """Fixed size buffer of the most recent samples of one field
+
+    Samples may be appended from any thread while another reads them.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY) -> None:
+        if capacity < 1:
+            raise ValueError("A sample ring must hold at least one sample")
+        self._buf: List[float] = [0.0] * capacity
+        self._head = 0
+        self._size = 0
+        self._lock = Lock()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        with self._lock:
+            self._buf[self._head] = value
+            self._head = (self._head + 1) % len(self._buf)
+            self._size = min(self._size + 1, len(self._buf))
+
+    def values(self) -> List[float]:
+        """Copy of the buffered samples, oldest first"""
+        with self._lock:
+            if self._size < len(self._buf):
+                return self._buf[: self._size]
+            return self._buf[self._head :] + self._buf[: self._head]
+
+
+def decimate_minmax(values: Sequence[float], columns: int) -> List[Tuple[float, float]]:
+    """Reduce samples to the smallest and largest value in each column
+
+    :param values: Samples, oldest first
+    :type values: Sequence[float]
+    :param columns: Most columns to reduce the samples to
+    :type columns: int
+    :return: One ``(min, max)`` pair per column. If there are no more samples
+        than columns, one pair per sample
+    :rtype: List[Tuple[float, float]]
+    """
+    n = len(values)
+    if n <= columns:
+        return [(v, v) for v in values]
+    out = []
+    for c in range(columns):
+        chunk = values[c * n // columns : (c + 1) * n // columns]
+        out.append((min(chunk), max(chunk)))
+    return out
+
+
+class PlotPanel(tk.Frame):
+    """Stacked canvases with one live plot per ``DATA`` field
+
+    ``sample`` may be called from any thread. ``redraw`` must be called from
+    the Tk main loop and only redraws plots that have new samples.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        *args: Any,
+        history: int = DEFAULT_HISTORY,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._rings: Dict[str, SampleRing] = {f: SampleRing(history) for f in fields}
+        self._stale = set(fields)
+        self._stale_lock = Lock()
+        self._canvases: Dict[str, tk.Canvas] = {}
+        self._lines: Dict[str, int] = {}
+        self._labels: Dict[str, int] = {}
+
+        self.columnconfigure(index=0, weight=1)
+        for row, field in enumerate(fields):
+            self.rowconfigure(index=row, weight=1)
+            canvas = tk.Canvas(self, height=80, background="white")
+            canvas.grid(column=0, row=row, sticky="nsew")
+            canvas.bind("<Configure>", lambda _, f=field: self._mark_stale(f))
+            self._canvases[field] = canvas
+            self._lines[field] = canvas.create_line(
+                0, 0, 0, 0, fill=_COLORS[row % len(_COLORS)]
+            )
+            self._labels[field] = canvas.create_text(4, 4, anchor="nw", text=field)
+
+    def _mark_stale(self, field: str) -> None:
+        with self._stale_lock:
+            self._stale.add(field)
+
+    def sample(self, data: Any) -> None:
+        """Record the plotted fields of new mission data
+
+        :param data: Mission data, usually the ``DATA`` of a message
+        :type data: Any
+        """
+        for field, ring in self._rings.items():
+            value = lookup(data, field)
+            if value is not None:
+                ring.append(value)
+                self._mark_stale(field)
+
+    def redraw(self) -> None:
+        with self._stale_lock:
+            stale, self._stale = self._stale, set()
+        for field in stale:
+            self._draw(field)
+
+    def _draw(self, field: str) -> None:
+        canvas = self._canvases[field]
+        width = max(canvas.winfo_width(), 2)
+        height = max(canvas.winfo_height(), 2)
+        values = self._rings[field].values()
+        if not values:
+            return
+        cols = decimate_minmax(values, width)
+        lo = min(c[0] for c in cols)
+        hi = max(c[1] for c in cols)
+        span = (hi - lo) or 1.0
+        scale_x = (width - 1) / max(len(cols) - 1, 1)
+
+        def y(v: float) -> float:
+            return (height - 2) - (v - lo) / span * (height - 4)
+
+        points: List[float] = []
+        for i, (vmin, vmax) in enumerate(cols):
+            x = i * scale_x
+            points += [x, y(vmin), x, y(vmax)]
+        canvas.coords(self._lines[field], *points)
+        canvas.itemconfigure(
+            self._labels[field], text=f"{field}: {values[-1]:.4g} [{lo:.4g}, {hi:.4g}]"
+        )
@@ -0,0 +1,408 @@
+"""Relay frontend that shares the ground station's single link to the launch
+station with any number of observers over TCP and unix domain sockets
+
+Every message received from the launch station is re-broadcast to all
+connected clients, framed the same way as ``SocketComsStrategy``, so that an
+observer can simply be another ``orbitalcoms`` ground station pointed at the
+relay. Only the client connected to the control listener may send commands;
+anything sent by an observer is discarded.
+
+All client sockets are served from a single ``selectors`` loop. Each client
+has a bounded output queue, and a client that cannot keep up either has its
+oldest queued messages dropped or is disconnected. A stalled client therefore
+never holds up the link to the launch station.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import socket
+import stat
+import traceback
+from collections import deque
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Tuple
+
+from attrs import define
+
+from .._utils import log
+from ..coms.errors import ComsDriverReadError, ComsMessageParseError
+from ..coms.messages import ComsMessage
+from ..coms.strategies.socketstrat import FrameDecoder, encode_frame
+
+if TYPE_CHECKING:
+    from orbitalcoms.stations.groundstation import GroundStation
+
+logger = log.make_logger(__name__, logging.INFO)
+
+_RECV_SIZE = 65536
+
+
+@define
+class RelayStats:
+    """Counters describing the work done by a ``TelemetryRelay``"""
+
+    #: Clients currently connected
+    clients: int = 0
+    #: Messages received from the launch station and broadcast
+    broadcast: int = 0
+    #: Messages queued for clients
+    queued: int = 0
+    #: Queued messages discarded because a client fell behind
+    dropped: int = 0
+    #: Clients disconnected because they fell behind
+    evicted: int = 0
+    #: Commands forwarded from the controller to the launch station
+    commands: int = 0
+    #: Messages sent by observers, which are not allowed to send commands
+    rejected: int = 0
+
+
+class _Client:
+    """A connected observer or controller and its queued output"""
+
+    def __init__(self, sock: socket.socket, name: str, controller: bool) -> None:
+        self.sock = sock
+        self.name = name
+        self.controller = controller
+        self.decoder = FrameDecoder()
+        self.out: Deque[memoryview] = deque()
+        self.out_bytes = 0
+
+
+class TelemetryRelay:
+    """Broadcasts messages to many clients from a single ``selectors`` loop
+
+    Messages are handed to the relay with ``append`` from any thread, which
+    makes the relay usable as a station's queue. The loop itself runs in the
+    thread that calls ``serve_forever`` or in a thread made by ``start``.
+    Listeners should be added before the loop is started.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[ComsMessage], bool],
+        max_buffer: int = 256 * 1024,
+        disconnect_slow: bool = False,
+    ) -> None:
+        """Create a new ``TelemetryRelay``
+
+        :param send: Callback used to forward the controller's commands to
+            the launch station. It is called from the relay's loop, so must
+            not wait for the link. Usually ``GroundStation.send_nowait``
+        :type send: Callable[[ComsMessage], bool]
+        :param max_buffer: Most bytes that may be queued for a single client
+        :type max_buffer: int
+        :param disconnect_slow: Disconnect clients that fall behind instead of
+            dropping their oldest queued messages
+        :type disconnect_slow: bool
+        """
+        self.stats = RelayStats()
+        self.max_buffer = max_buffer
+        self.disconnect_slow = disconnect_slow
+        self._send = send
+        self._sel = selectors.DefaultSelector()
+        self._listeners: Dict[socket.socket, Tuple[bool, str | None]] = {}
+        self._clients: Dict[socket.socket, _Client] = {}
+        self._controller: _Client | None = None
+        self._latest: bytes | None = None
+        self._pending: List[bytes] = []
+        self._lock = Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ)
+        self._running = True
+        self._thread: Thread | None = None
+
+    def listen_tcp(
+        self, host: str = "", port: int = 0, controller: bool = False
+    ) -> Tuple[str, int]:
+        """Accept clients on a TCP address
+
+        :param host: IP address to accept clients at
+        :type host: str
+        :param port: port to accept clients at. If 0, any free port is used
+        :type port: int
+        :param controller: Whether clients accepted here are controllers
+        :type controller: bool
+        :returns: The address clients can connect to
+        :rtype: Tuple[str, int]
+        """
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host, port))
+        self._add_listener(server, controller, None)
+        addr: Tuple[str, int] = server.getsockname()
+        return addr
+
+    def listen_unix(self, path: str, controller: bool = False) -> None:
+        """Accept clients on a unix domain socket
+
+        A stale socket left at the path by a previous run is replaced. The
+        socket file is removed when the relay is closed.
+
+        :param path: File system path to accept clients at
+        :type path: str
+        :param controller: Whether clients accepted here are controllers
+        :type controller: bool
+        """
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        self._add_listener(server, controller, path)
+
+    def _add_listener(
+        self, server: socket.socket, controller: bool, path: str | None
+    ) -> None:
+        server.listen(16)
+        server.setblocking(False)
+        self._listeners[server] = (controller, path)
+        self._sel.register(server, selectors.EVENT_READ, server)
+
+    @property
+    def clients(self) -> int:
+        """Number of clients currently connected
+
+        :returns: Number of connected clients
+        :rtype: int
+        """
+        return len(self._clients)
+
+    def append(self, m: ComsMessage) -> None:
+        """Broadcast a message to all clients. Safe to call from any thread
+
+        :param m: Message received from the launch station
+        :type m: ComsMessage
+        """
+        frame = encode_frame(m)
+        with self._lock:
+            self._pending.append(frame)
+            wake = len(self._pending) == 1
+        if wake:
+            self._wake()
+
+    def start(self) -> None:
+        """Serve clients from a background thread"""
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Serve clients until ``close`` is called"""
+        try:
+            while self._running:
+                for key, events in self._sel.select():
+                    data = key.data
+                    if isinstance(data, _Client):
+                        if data.sock not in self._clients:
+                            continue  # Disconnected earlier in this iteration
+                        if events & selectors.EVENT_READ:
+                            self._read(data)
+                        if (
+                            events & selectors.EVENT_WRITE
+                            and data.sock in self._clients
+                        ):
+                            self._flush(data)
+                    elif isinstance(data, socket.socket):
+                        self._accept(data)
+                    else:
+                        self._drain_wake()
+                        self._broadcast_pending()
+        finally:
+            self._cleanup()
+
+    def close(self) -> None:
+        """Stop serving and disconnect all clients"""
+        self._running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Loop is already due to wake up
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept(self, server: socket.socket) -> None:
+        try:
+            sock, addr = server.accept()
+        except BlockingIOError:
+            return
+        controller, _ = self._listeners[server]
+        name = str(addr) if addr else "unix"
+        if controller and self._controller is not None:
+            logger.info(f"Refused controller {name}, one is already connected")
+            sock.close()
+            return
+        sock.setblocking(False)
+        client = _Client(sock, name, controller)
+        self._clients[sock] = client
+        self._sel.register(sock, selectors.EVENT_READ, client)
+        if controller:
+            self._controller = client
+        self.stats.clients = len(self._clients)
+        logger.info(f"Connected {'controller' if controller else 'observer'} {name}")
+        if self._latest is not None:
+            self._queue(client, self._latest)
+            self._flush(client)
+
+    def _disconnect(self, client: _Client) -> None:
+        self._sel.unregister(client.sock)
+        client.sock.close()
+        del self._clients[client.sock]
+        if client is self._controller:
+            self._controller = None
+        self.stats.clients = len(self._clients)
+        logger.info(f"Disconnected {client.name}")
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(_RECV_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(client)
+            return
+        if not client.controller:
+            # Observers may be ordinary ground stations that send commands
+            # when their buttons are pressed. Read them to keep the socket
+            # drained but never forward them.
+            self.stats.rejected += 1
+            return
+        try:
+            messages = client.decoder.feed(data)
+        except (ComsDriverReadError, ComsMessageParseError, TypeError, ValueError):
+            # Includes frames that are not UTF-8 or are missing fields, which
+            # must not take the relay down with the controller that sent them
+            logger.error(f"Bad data from controller: {traceback.format_exc()}")
+            self._disconnect(client)
+            return
+        for m in messages:
+            if self._send(m):
+                self.stats.commands += 1
+
+    def _broadcast_pending(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self._latest = pending[-1]
+        self.stats.broadcast += len(pending)
+        for client in list(self._clients.values()):
+            for frame in pending:
+                if not self._queue(client, frame):
+                    break
+            if client.sock in self._clients:
+                self._flush(client)
+
+    def _queue(self, client: _Client, frame: bytes) -> bool:
+        """Queue a frame for a client, dropping older frames or disconnecting
+        the client if its queue would grow too large
+
+        :returns: Whether the client is still connected
+        :rtype: bool
+        """
+        self.stats.queued += 1
+        while client.out_bytes + len(frame) > self.max_buffer and client.out:
+            if self.disconnect_slow:
+                self.stats.evicted += 1
+                self._disconnect(client)
+                return False
+            if len(client.out) == 1:
+                # The head may have been partially sent and must be finished
+                break
+            # Every message carries the complete mission state, so the oldest
+            # queued frames are the least useful
+            dropped = client.out[1]
+            del client.out[1]
+            client.out_bytes -= len(dropped)
+            self.stats.dropped += 1
+        client.out.append(memoryview(frame))
+        client.out_bytes += len(frame)
+        return True
+
+    def _flush(self, client: _Client) -> None:
+        """Send as much queued output as the socket accepts without blocking"""
+        try:
+            while client.out:
+                head = client.out[0]
+                sent = client.sock.send(head)
+                client.out_bytes -= sent
+                if sent < len(head):
+                    client.out[0] = head[sent:]
+                    break
+                client.out.popleft()
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._disconnect(client)
+            return
+        events = selectors.EVENT_READ
+        if client.out:
+            events |= selectors.EVENT_WRITE
+        if self._sel.get_key(client.sock).events != events:
+            self._sel.modify(client.sock, events, client)
+
+    def _cleanup(self) -> None:
+        for client in list(self._clients.values()):
+            self._disconnect(client)
+        for server, (_, path) in self._listeners.items():
+            self._sel.unregister(server)
+            server.close()
+            if path is not None and os.path.exists(path):
+                os.unlink(path)
+        self._listeners.clear()
+        self._sel.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
+def run_app(
+    gs: GroundStation,
+    host: str = "127.0.1.1",
+    port: int = 5100,
+    control_port: int = 5101,
+    unix_path: str | None = None,
+) -> None:
+    """Relay the ground station's messages until interrupted
+
+    :param gs: Ground station holding the link to the launch station
+    :type gs: GroundStation
+    :param host: IP address to accept clients at
+    :type host: str
+    :param port: port to accept observers at
+    :type port: int
+    :param control_port: port to accept the controller at
+    :type control_port: int
+    :param unix_path: File system path to also accept observers at
+    :type unix_path: str | None
+    """
+    relay = TelemetryRelay(gs.send_nowait)
+    relay.listen_tcp(host, port)
+    relay.listen_tcp(host, control_port, controller=True)
+    if unix_path is not None:
+        relay.listen_unix(unix_path)
+    gs.bind_queue(relay)
+    print(
+        f"Relaying to observers at {host}:{port}, controller at {host}:{control_port}"
+    )
+    try:
+        relay.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gs.bind_queue(None)
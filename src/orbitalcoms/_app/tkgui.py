@@ -10,12 +10,15 @@ import json
 import logging
 import tkinter as tk
 import traceback
+from threading import Event
 from tkinter import messagebox
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Sequence
 
 from .._utils.log import make_logger
 from ..coms.errors import ComsDriverWriteError
 from ..coms.messages.message import ComsMessage
+from ..stations.transitions import MissionFlag
+from .plot import DEFAULT_HISTORY, PlotPanel
 
 if TYPE_CHECKING:
     from ..stations.groundstation import GroundStation
@@ -23,18 +26,41 @@ if TYPE_CHECKING:
 
 _logger = make_logger(__name__, logging.INFO)
 
+#: Most times per second the display is redrawn
+DEFAULT_FPS = 20
+
 
 class GroundStationFrame(tk.Frame):
     class FrameUpdateQueue:
+        """Marks the frame as needing a redraw. Safe to call from any thread,
+        the redraw itself always happens on the Tk main loop
+        """
+
         def __init__(self, gui: GroundStationFrame) -> None:
             self._gui = gui
 
-        def append(self, _: Any) -> None:
-            self._gui.update_disp()
-
-    def __init__(self, gs: GroundStation, *args: Any, **kwargs: Any) -> None:
+        def append(self, msg: ComsMessage) -> None:
+            if self._gui.plots is not None:
+                self._gui.plots.sample(msg.DATA)
+            self._gui.mark_dirty()
+
+    def __init__(
+        self,
+        gs: GroundStation,
+        *args: Any,
+        fps: float = DEFAULT_FPS,
+        plot_fields: Sequence[str] = (),
+        plot_history: int = DEFAULT_HISTORY,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._gs = gs
+        self._frame_ms = max(1, int(1000 / fps))
+        self._dirty = Event()
+        self._shown_txt: Dict[tk.Text, str] = {}
+        self._shown_data: Any = None
+        self._data_str = "null"
+        self._shown_allowed: MissionFlag | None = None
 
         # Config Window
         self.grid(column=0, row=0, sticky="nsew")
@@ -83,18 +109,35 @@ class GroundStationFrame(tk.Frame):
         self.btn_stab.grid(column=0, row=3, sticky="nsew")
         self.btn_launch.grid(column=0, row=4, sticky="nsew")
 
+        self._flag_btns = {
+            MissionFlag.ARMED: self.btn_arm,
+            MissionFlag.ABORT: self.btn_abort,
+            MissionFlag.QDM: self.btn_qdm,
+            MissionFlag.STAB: self.btn_stab,
+            MissionFlag.LAUNCH: self.btn_launch,
+        }
+
         # Text
         self.txt_sent = tk.Text(self)
         self.txt_recv = tk.Text(self)
         self.txt_data = tk.Text(self)
-        self._gs.bind_queue(GroundStationFrame.FrameUpdateQueue(self))
 
         self.txt_sent.grid(column=1, row=0, rowspan=5, sticky="nsew")
         self.txt_recv.grid(column=2, row=0, rowspan=5, sticky="nsew")
         self.txt_data.grid(column=3, row=0, rowspan=5, sticky="nsew")
 
+        # Plots
+        self.plots: PlotPanel | None = None
+        if plot_fields:
+            self.rowconfigure(index=5, weight=len(plot_fields))
+            self.plots = PlotPanel(plot_fields, self, history=plot_history)
+            self.plots.grid(column=0, row=5, columnspan=4, sticky="nsew")
+
+        self._gs.bind_queue(GroundStationFrame.FrameUpdateQueue(self))
+
         # Start Display
         self.update_disp()
+        self.after(self._frame_ms, self._redraw_tick)
 
     def send_state(self, update: str) -> None:
         state = (
@@ -106,6 +149,25 @@ class GroundStationFrame(tk.Frame):
         self._gs.send(state)
         self.update_disp()
 
+    def mark_dirty(self) -> None:
+        """Request a redraw on the next frame"""
+        self._dirty.set()
+
+    def _redraw_tick(self) -> None:
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self.update_disp()
+        if self.plots is not None:
+            self.plots.redraw()
+        self.after(self._frame_ms, self._redraw_tick)
+
+    def _set_text(self, txt: tk.Text, content: str) -> None:
+        if self._shown_txt.get(txt) == content:
+            return
+        txt.delete(1.0, "end")
+        txt.insert(1.0, content)
+        self._shown_txt[txt] = content
+
     def update_disp(self) -> None:
         def coms_msg_txt_fomat(msg: ComsMessage | None, title: str = "") -> str:
             if title:
@@ -125,26 +187,34 @@ class GroundStationFrame(tk.Frame):
                 return datetime.datetime.fromtimestamp(time)
             return "None"
 
-        self.txt_sent.delete(1.0, "end")
-        self.txt_sent.insert(
-            1.0,
-            coms_msg_txt_fomat(self._gs.last_sent, "SENT")
-            + f"\n\nTime Sent: {make_time_stamp(self._gs.last_sent_time)}",
-        )
+        snap = self._gs.snapshot()
 
-        self.txt_recv.delete(1.0, "end")
-        self.txt_recv.insert(
-            1.0,
-            coms_msg_txt_fomat(self._gs.last_received, "RECV")
-            + f"\n\nTime Recv: {make_time_stamp(self._gs.last_received_time)}",
+        # Grey out buttons that would make an invalid mission state change
+        allowed = self._gs.allowed_toggles
+        if allowed != self._shown_allowed:
+            for flag, btn in self._flag_btns.items():
+                btn.configure(state=tk.NORMAL if flag in allowed else tk.DISABLED)
+            self._shown_allowed = allowed
+
+        self._set_text(
+            self.txt_sent,
+            coms_msg_txt_fomat(snap.last_sent, "SENT")
+            + f"\n\nTime Sent: {make_time_stamp(snap.last_sent_time)}",
+        )
+        self._set_text(
+            self.txt_recv,
+            coms_msg_txt_fomat(snap.last_received, "RECV")
+            + f"\n\nTime Recv: {make_time_stamp(snap.last_received_time)}",
         )
 
-        self.txt_data.delete(1.0, "end")
-        try:
-            data_str = json.dumps(self._gs.data, indent=2)
-        except Exception:
-            data_str = str(self._gs.data)
-        self.txt_data.insert(1.0, f"DATA:\n====\n{data_str}")
+        # Only re-serialize the data when the station has new data
+        if snap.data is not self._shown_data:
+            try:
+                self._data_str = json.dumps(snap.data, indent=2)
+            except Exception:
+                self._data_str = str(snap.data)
+            self._shown_data = snap.data
+        self._set_text(self.txt_data, f"DATA:\n====\n{self._data_str}")
 
     def reset_read_proc(self) -> None:
         _logger.warning("--> Reseting ComsDriver Read Proc")
@@ -163,14 +233,25 @@ class GroundStationFrame(tk.Frame):
         _logger.warning("<-- Last Msg Resent!")
 
 
-def run_app(gs: GroundStation) -> None:
+def run_app(
+    gs: GroundStation,
+    fps: float = DEFAULT_FPS,
+    plot_fields: Sequence[str] = (),
+    plot_history: int = DEFAULT_HISTORY,
+) -> None:
     root = tk.Tk()
     root.title("Development GS GUI")
     width = 800
-    height = 600
+    height = 600 + 100 * len(plot_fields)
     root.geometry(f"{width}x{height}")
 
-    gs_gui = GroundStationFrame(gs, master=root)
+    gs_gui = GroundStationFrame(
+        gs,
+        master=root,
+        fps=fps,
+        plot_fields=plot_fields,
+        plot_history=plot_history,
+    )
 
     # Top level protocols
     def on_close() -> None:
@@ -0,0 +1,24 @@
+"""Lookup of values in nested mission data by dot separated paths"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def lookup(data: Any, path: str) -> float | None:
+    """Find a number in nested mission data
+
+    :param data: Mission data, usually the ``DATA`` of a message
+    :type data: Any
+    :param path: Dot separated keys to the number, e.g. ``"GPS.alt"``
+    :type path: str
+    :return: The number, or None if the path does not lead to one
+    :rtype: float | None
+    """
+    for key in path.split("."):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    if isinstance(data, bool) or not isinstance(data, (int, float)):
+        return None
+    return float(data)
@@ -0,0 +1,288 @@
+"""Process-wide scheduler running periodic work for every station from a
+single thread
+
+Timers are kept in a binary heap ordered by deadline. Cancelling a timer
+only marks it, and the heap discards marked entries when they reach the
+top. Moving a timer later, which is what happens to a resend timer on every
+send, only updates its deadline; the heap entry is moved the next time it
+reaches the top. Both are O(1), and only moving a timer earlier costs a heap
+push.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import os
+import time
+import traceback
+import weakref
+from threading import Condition, Thread
+from typing import Callable, List, Tuple
+
+from . import log
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+#: Function run by the scheduler. Returns the delay in seconds until it should
+#: run again, or None if it should not run again
+TimerCallback = Callable[[], "float | None"]
+
+
+class TimerHandle:
+    """A function scheduled to run on a ``Scheduler``"""
+
+    __slots__ = (
+        "_scheduler",
+        "_callback",
+        "deadline",
+        "cancelled",
+        "_queued_at",
+        "_in_heap",
+        "_running",
+        "_rescheduled",
+    )
+
+    def __init__(self, scheduler: Scheduler, callback: TimerCallback) -> None:
+        self._scheduler = scheduler
+        self._callback = callback
+        #: Monotonic time at which the function should run
+        self.deadline = 0.0
+        #: Whether the timer has been cancelled
+        self.cancelled = False
+        # Deadline of this timer's entry in the heap, which may be earlier
+        # than the real deadline if the timer has been moved later
+        self._queued_at = 0.0
+        self._in_heap = False
+        self._running = False
+        self._rescheduled = False
+
+    @property
+    def active(self) -> bool:
+        """Whether the function is waiting to run or running
+
+        :returns: If the timer is active
+        :rtype: bool
+        """
+        return not self.cancelled and (self._in_heap or self._running)
+
+    def cancel(self) -> None:
+        """Stop the function from running. Takes O(1) time"""
+        self._scheduler._cancel(self)
+
+    def reschedule(self, delay: float) -> None:
+        """Run the function after a delay from now instead of at its current
+        deadline. A cancelled or finished timer is scheduled again.
+
+        :param delay: Seconds from now to run the function
+        :type delay: float
+        """
+        self._scheduler._reschedule(self, time.monotonic() + delay)
+
+
+class Scheduler:
+    """Runs many timers from one background thread
+
+    The thread is started when a timer is scheduled and exits once no timers
+    are left. Functions run on the scheduler's thread and should return
+    quickly, since a slow function delays every other timer.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        # Heap entries that will be discarded when they reach the top
+        self._garbage = 0
+        self._cv = Condition()
+        self._thread: Thread | None = None
+        _schedulers.add(self)
+
+    def __len__(self) -> int:
+        """Number of entries in the heap, including entries of cancelled and
+        moved timers that have not been discarded yet
+
+        :returns: Number of heap entries
+        :rtype: int
+        """
+        return len(self._heap)
+
+    def call_later(self, delay: float, callback: TimerCallback) -> TimerHandle:
+        """Run a function after a delay
+
+        :param delay: Seconds from now to run the function
+        :type delay: float
+        :param callback: Function to run. It returns the delay until it should
+            run again, or None to run only once
+        :type callback: Callable[[], float | None]
+        :returns: Handle to cancel or reschedule the function with
+        :rtype: TimerHandle
+        """
+        handle = TimerHandle(self, callback)
+        self._reschedule(handle, time.monotonic() + delay)
+        return handle
+
+    def _push(self, handle: TimerHandle) -> None:
+        """Add an entry for a timer at its deadline, waking the thread if
+        it is now first. Must be called holding the lock
+        """
+        if handle._in_heap:
+            self._garbage += 1  # The timer's old entry is now stale
+        handle._queued_at = handle.deadline
+        handle._in_heap = True
+        heapq.heappush(self._heap, (handle.deadline, next(self._counter), handle))
+        if self._thread is None:
+            self._thread = Thread(
+                target=self._run, name="orbitalcoms-scheduler", daemon=True
+            )
+            self._thread.start()
+        elif self._heap[0][2] is handle:
+            self._cv.notify()
+
+    def _reschedule(self, handle: TimerHandle, deadline: float) -> None:
+        with self._cv:
+            if handle.cancelled:
+                handle.cancelled = False
+                if handle._in_heap:
+                    self._garbage -= 1  # Its entry is live again
+            handle.deadline = deadline
+            if handle._running:
+                handle._rescheduled = True
+            elif not handle._in_heap or deadline < handle._queued_at:
+                self._push(handle)
+            # Otherwise the timer was moved later and its entry is fixed up
+            # when it reaches the top of the heap
+
+    def _cancel(self, handle: TimerHandle) -> None:
+        with self._cv:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            if handle._in_heap:
+                self._garbage += 1
+                if self._garbage >= len(self._heap):
+                    self._cv.notify()  # Let the idle thread exit
+                elif self._garbage > 64 and self._garbage > len(self._heap) // 2:
+                    self._compact()
+
+    def _compact(self) -> None:
+        """Discard stale entries. Must be called holding the lock"""
+        heap = []
+        for entry in self._heap:
+            when, _, handle = entry
+            if not handle._in_heap or when != handle._queued_at:
+                continue
+            if handle.cancelled:
+                handle._in_heap = False
+                continue
+            heap.append(entry)
+        heapq.heapify(heap)
+        self._heap = heap
+        self._garbage = 0
+
+    def _next_due(self) -> TimerHandle | None:
+        """Wait for and remove the next timer that is due. Must be called
+        holding the lock
+
+        :returns: The timer to run, or None if there are no timers left
+        :rtype: TimerHandle | None
+        """
+        while True:
+            if self._garbage >= len(self._heap):
+                self._compact()
+            if not self._heap:
+                return None
+            when, _, handle = self._heap[0]
+            if not handle._in_heap or when != handle._queued_at:
+                heapq.heappop(self._heap)
+                self._garbage -= 1
+                continue
+            if handle.cancelled:
+                heapq.heappop(self._heap)
+                handle._in_heap = False
+                self._garbage -= 1
+                continue
+            if handle.deadline > when:
+                # The timer was moved later since this entry was pushed
+                entry = (handle.deadline, next(self._counter), handle)
+                heapq.heapreplace(self._heap, entry)
+                handle._queued_at = handle.deadline
+                continue
+            now = time.monotonic()
+            if when > now:
+                self._cv.wait(when - now)
+                continue
+            heapq.heappop(self._heap)
+            handle._in_heap = False
+            handle._running = True
+            return handle
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                handle = self._next_due()
+                if handle is None:
+                    # Nothing left to run, a new thread is started when a
+                    # timer is next scheduled
+                    self._thread = None
+                    return
+            try:
+                delay = handle._callback()
+            except Exception:
+                logger.error(f"Scheduled function raised {traceback.format_exc()}")
+                delay = None
+            with self._cv:
+                handle._running = False
+                if handle.cancelled:
+                    pass
+                elif handle._rescheduled:
+                    self._push(handle)
+                elif delay is not None:
+                    handle.deadline = time.monotonic() + delay
+                    self._push(handle)
+                handle._rescheduled = False
+
+
+_default: Scheduler | None = None
+_schedulers: weakref.WeakSet[Scheduler] = weakref.WeakSet()
+
+
+def get_scheduler() -> Scheduler:
+    """Get the scheduler shared by everything in this process
+
+    :returns: The process-wide scheduler
+    :rtype: Scheduler
+    """
+    global _default
+    if _default is None:
+        _default = Scheduler()
+    return _default
+
+
+def _before_fork() -> None:
+    # Hold every lock so that a child is never forked while one is taken
+    for sched in list(_schedulers):
+        sched._cv.acquire()
+
+
+def _after_fork_in_parent() -> None:
+    for sched in list(_schedulers):
+        sched._cv.release()
+
+
+def _after_fork_in_child() -> None:
+    # Threads do not survive a fork, so timers scheduled before it are
+    # dropped rather than run by the child
+    for sched in list(_schedulers):
+        sched._cv = Condition()
+        sched._thread = None
+        sched._heap = []
+        sched._garbage = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_before_fork,
+        after_in_parent=_after_fork_in_parent,
+        after_in_child=_after_fork_in_child,
+    )
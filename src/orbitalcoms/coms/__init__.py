@@ -1,21 +1,82 @@
-from .drivers import ComsDriver, ComsDriverReadLoop
+from .drivers import (
+    ComsDriver,
+    ComsDriverPollingReadLoop,
+    ComsDriverReadLoop,
+    ComsDriverWriteLoop,
+    ComsIOLoop,
+    IOLoopStats,
+    LaneStats,
+    WritePriority,
+)
 from .errors import ComsDriverReadError, ComsDriverWriteError, ComsMessageParseError
 from .messages import ComsMessage, ParsableComType, construct_message
 from .strategies import (
     ComsStrategy,
+    FragmentStats,
+    Framing,
+    ImpairedComsStrategy,
+    Impairment,
+    ImpairmentStats,
+    InProcessBus,
+    InProcessBusStrategy,
+    LineStats,
     LocalComsStrategy,
+    MulticastPublishStrategy,
+    MulticastSubscribeStrategy,
+    OverflowPolicy,
+    PollableComsStrategy,
+    RateLimitedComsStrategy,
+    Reassembler,
+    ReliableComsStrategy,
+    ReliableLinkStats,
+    SeqPacketComsStrategy,
     SerialComsStrategy,
+    SharedMemoryComsStrategy,
     SocketComsStrategy,
+    TeeComsStrategy,
+    TokenBucket,
+    UdpComsStrategy,
+    UdpLinkStats,
+    WrappedComsStrategy,
 )
 from .subscribers import ComsSubscription, ComsSubscriptionLike, OneTimeComsSubscription
 
 __all__ = [
     "ComsDriver",
     "ComsDriverReadLoop",
+    "ComsDriverPollingReadLoop",
+    "ComsDriverWriteLoop",
+    "ComsIOLoop",
+    "IOLoopStats",
+    "LaneStats",
+    "WritePriority",
     "ComsStrategy",
+    "PollableComsStrategy",
+    "RateLimitedComsStrategy",
+    "InProcessBus",
+    "InProcessBusStrategy",
     "LocalComsStrategy",
     "SerialComsStrategy",
+    "SharedMemoryComsStrategy",
+    "OverflowPolicy",
     "SocketComsStrategy",
+    "SeqPacketComsStrategy",
+    "UdpComsStrategy",
+    "UdpLinkStats",
+    "MulticastPublishStrategy",
+    "MulticastSubscribeStrategy",
+    "TeeComsStrategy",
+    "TokenBucket",
+    "ReliableComsStrategy",
+    "ReliableLinkStats",
+    "ImpairedComsStrategy",
+    "Impairment",
+    "ImpairmentStats",
+    "Reassembler",
+    "FragmentStats",
+    "Framing",
+    "LineStats",
+    "WrappedComsStrategy",
     "ComsDriverReadError",
     "ComsDriverWriteError",
     "ComsMessageParseError",
@@ -1,4 +1,15 @@
 from .driver import ComsDriver
-from .driverreadloop import ComsDriverReadLoop
+from .driverreadloop import ComsDriverPollingReadLoop, ComsDriverReadLoop
+from .driverwriteloop import ComsDriverWriteLoop, LaneStats, WritePriority
+from .ioloop import ComsIOLoop, IOLoopStats
 
-__all__ = ["ComsDriver", "ComsDriverReadLoop"]
+__all__ = [
+    "ComsDriver",
+    "ComsDriverReadLoop",
+    "ComsDriverPollingReadLoop",
+    "ComsIOLoop",
+    "IOLoopStats",
+    "ComsDriverWriteLoop",
+    "LaneStats",
+    "WritePriority",
+]
@@ -3,13 +3,16 @@ from __future__ import annotations
 import logging
 import traceback
 from threading import Condition
-from typing import TYPE_CHECKING, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, Set
 
 from ..._utils import log
 from ..errors import ComsDriverReadError, ComsDriverWriteError
 from ..messages import construct_message
+from ..strategies.strategy import PollableComsStrategy
 from ..subscribers import OneTimeComsSubscription
-from .driverreadloop import ComsDriverReadLoop
+from .driverreadloop import ComsDriverPollingReadLoop, ComsDriverReadLoop
+from .driverwriteloop import ComsDriverWriteLoop, LaneStats, WritePriority
+from .ioloop import ComsIOLoop
 
 if TYPE_CHECKING:
     from ..messages import ComsMessage, ParsableComType
@@ -27,18 +30,26 @@ class ComsDriver:
     and alerting a subsrciptions when a new message has been reciveived.
     """
 
-    def __init__(self, strategy: ComsStrategy) -> None:
+    def __init__(
+        self, strategy: ComsStrategy, io_loop: ComsIOLoop | None = None
+    ) -> None:
         """Initializes a ComsDrivers with a provided strategy.
 
         :param strategy: An object which describes how to read/write messages
         :type strategy: ComsStrategy
+        :param io_loop: A loop shared with other drivers to read messages
+            from. If None, the driver starts a read loop of its own
+        :type io_loop: ComsIOLoop | None
         """
         self.subscrbers: Set[ComsSubscriptionLike] = set()
         self._read_loop: ComsDriverReadLoop | None = None
+        self._io_loop = io_loop
+        self._write_loop: ComsDriverWriteLoop | None = None
         self._strategy = strategy
 
     def __del__(self) -> None:
         self.end_read_loop()
+        self.end_write_loop()
 
     @property
     def strategy(self) -> ComsStrategy:
@@ -50,16 +61,34 @@ class ComsDriver:
         """
         return self._strategy
 
-    def start_read_loop(self, block: bool = False) -> ComsDriverReadLoop:
+    @property
+    def io_loop(self) -> ComsIOLoop | None:
+        """The loop shared with other drivers that this driver reads from,
+        if any
+
+        :return: The shared loop
+        :rtype: ComsIOLoop | None
+        """
+        return self._io_loop
+
+    def start_read_loop(self, block: bool = False) -> ComsDriverReadLoop | ComsIOLoop:
         """Creates and starts a new thread that will receive and notify all
         subscribers to the ComsDriver when a new messages has been succefully
         recieved.
 
+        If the driver was given a shared io loop, the strategy is added to
+        that loop instead of starting a thread.
+
         :param block: State whether readloop should be run in a blocking manner
         :type block: bool
         :return: A thread handling the recieving a new messages
-        :rtype: ComsDriverReadLoop
+        :rtype: ComsDriverReadLoop | ComsIOLoop
         """
+        if self._io_loop is not None:
+            self._io_loop.add(self._strategy, self._notify_subscribers)
+            if block:
+                self._io_loop.join()
+            return self._io_loop
         if self._read_loop:
             self.end_read_loop()
         self._read_loop = self._spawn_read_loop_thread()
@@ -76,6 +105,8 @@ class ComsDriver:
             read loop to join. If None, wait indefinitely
         :type timeout: float | None
         """
+        if self._io_loop is not None:
+            self._io_loop.remove(self._strategy, timeout=timeout)
         if self._read_loop:
             if self._read_loop.is_alive():
                 self._read_loop.stop(timeout=timeout)
@@ -84,11 +115,57 @@ class ComsDriver:
     def _spawn_read_loop_thread(self) -> ComsDriverReadLoop:
         """Protected method for instancing a ComsDriverReadLoop.
 
+        Strategies that can be polled are read directly from the read loop
+        thread, all others are read in a subprocess per message.
+
         :return: A thread capable of recieving new messages
         :rtype: ComsDriverReadLoop
         """
+        if isinstance(self._strategy, PollableComsStrategy):
+            return ComsDriverPollingReadLoop(
+                self._strategy, self._notify_subscribers, daemon=True
+            )
         return ComsDriverReadLoop(self._strategy, self._notify_subscribers, daemon=True)
 
+    def start_write_loop(self) -> ComsDriverWriteLoop:
+        """Creates and starts a new thread that writes messages to the
+        strategy in order of priority. Until the write loop is ended,
+        ``write`` queues messages for it instead of writing them directly.
+
+        :return: A thread writing queued messages
+        :rtype: ComsDriverWriteLoop
+        """
+        if self._write_loop:
+            self.end_write_loop()
+        self._write_loop = ComsDriverWriteLoop(self._strategy, daemon=True)
+        self._write_loop.start()
+        return self._write_loop
+
+    def end_write_loop(self, timeout: float | None = None) -> None:
+        """Ends and dereferences the current write loop once every queued
+        message has been written. Later messages are written directly.
+
+        :param timeout: The amount of time in seconds to wait for the
+            write loop to join. If None, wait indefinitely
+        :type timeout: float | None
+        """
+        if self._write_loop:
+            if self._write_loop.is_alive():
+                self._write_loop.stop(timeout=timeout)
+            self._write_loop = None
+
+    @property
+    def write_stats(self) -> Dict[WritePriority, LaneStats]:
+        """Queue depth and wait time of each lane of the write loop
+
+        :return: Counters of each lane, which are all zero if the write
+            loop has not been started
+        :rtype: Dict[WritePriority, LaneStats]
+        """
+        if self._write_loop is None:
+            return {p: LaneStats() for p in WritePriority}
+        return self._write_loop.stats
+
     @property
     def is_reading(self) -> bool:
         """Boolean property that let's the caller know if the
@@ -97,6 +174,8 @@ class ComsDriver:
         :return: If the read loop active
         :rtype: bool
         """
+        if self._io_loop is not None:
+            return self._io_loop.is_reading(self._strategy)
         return self._read_loop is not None and self._read_loop.is_alive()
 
     def read(self, timeout: float | None = None) -> ComsMessage:
@@ -128,30 +207,99 @@ class ComsDriver:
                 raise ComsDriverReadError("Failed to read next message")
         return message
 
-    def write(self, m: ParsableComType, suppress_errors: bool = False) -> bool:
+    def write(
+        self,
+        m: ParsableComType,
+        suppress_errors: bool = False,
+        priority: WritePriority | None = None,
+    ) -> bool:
         """This method takes an object that can be parsed and used to
         construct a new ComsMessage. This message is then passed to a
         the ComsDriver communincation strategy to be sent to its counterpart.
 
+        If the write loop has been started, the message is queued in the
+        lane for its priority and this method blocks until it is sent.
+
         :param m: Something that can be parsed and constructed into
             a ComsMessage
         :type m: ParasableComType
         :param suppress_errors: If a ComsMessage cannot be constructed
             or the message cannot be sent, should an Exception be rasied
         :type suppress_errors: bool
+        :param priority: Lane to queue the message in if the write loop has
+            been started. If None, the lane is picked from the message
+        :type priority: WritePriority | None
         :raises ComsDriverWriteError: If a message could not be constructed or
             if the constructed message could not be sent
         :return: Wether the message was successfully sent
         :rtype: bool
         """
         try:
-            self._strategy.write(construct_message(m))
+            message = construct_message(m)
+            write_loop = self._write_loop
+            if write_loop is not None and write_loop.is_alive():
+                write_loop.submit(message, priority).wait()
+            else:
+                self._strategy.write(message)
             return True
         except Exception as e:
             if suppress_errors:
                 return False
             raise ComsDriverWriteError(f"Failed to send message '{m}'") from e
 
+    def write_nowait(
+        self,
+        m: ParsableComType,
+        suppress_errors: bool = False,
+        priority: WritePriority | None = None,
+        on_written: Callable[[ComsMessage], Any] | None = None,
+        on_failed: Callable[[BaseException], Any] | None = None,
+    ) -> bool:
+        """Queue a message to be sent by the write loop without waiting for
+        it to be written, starting the write loop if it is not running.
+
+        State and telemetry that is still queued when a newer message of the
+        same kind is queued is replaced by the newer message. Failures to
+        write the message are logged.
+
+        :param m: Something that can be parsed and constructed into
+            a ComsMessage
+        :type m: ParasableComType
+        :param suppress_errors: If a ComsMessage cannot be constructed
+            or queued, should an Exception be rasied
+        :type suppress_errors: bool
+        :param priority: Lane to queue the message in. If None, the lane is
+            picked from the message
+        :type priority: WritePriority | None
+        :param on_written: Called from the write loop with the message as it
+            was written, once it has been written
+        :type on_written: Callable[[ComsMessage], Any] | None
+        :param on_failed: Called from the write loop with the exception
+            raised if the message could not be written
+        :type on_failed: Callable[[BaseException], Any] | None
+        :raises ComsDriverWriteError: If a message could not be constructed or
+            queued
+        :return: Wether the message was successfully queued
+        :rtype: bool
+        """
+        try:
+            message = construct_message(m)
+            write_loop = self._write_loop
+            if write_loop is None or not write_loop.is_alive():
+                write_loop = self.start_write_loop()
+            write_loop.submit(
+                message,
+                priority,
+                nowait=True,
+                on_written=on_written,
+                on_failed=on_failed,
+            )
+            return True
+        except Exception as e:
+            if suppress_errors:
+                return False
+            raise ComsDriverWriteError(f"Failed to queue message '{m}'") from e
+
     def register_subscriber(self, sub: ComsSubscriptionLike) -> None:
         """Takes a an object that will reacts to new messages. The subscriber is added to
         an internal set (meaning that order of subscribers updating cannot be guaranteed)
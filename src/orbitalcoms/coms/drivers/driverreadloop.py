@@ -11,7 +11,7 @@ from ..._utils import log
 
 if TYPE_CHECKING:
     from ..messages import ComsMessage
-    from ..strategies.strategy import ComsStrategy
+    from ..strategies.strategy import ComsStrategy, PollableComsStrategy
 
 logger = log.make_logger(__name__, logging.ERROR)
 
@@ -105,6 +105,61 @@ class ComsDriverReadLoop(Thread):
         self.join(timeout=timeout)
 
 
+class ComsDriverPollingReadLoop(ComsDriverReadLoop):
+    """A ComsDriverReadLoop for strategies that are able to give up waiting
+    for a message after a timeout.
+
+    Rather than spawning a new process for every message, the strategy is
+    polled directly from this thread. Between polls the thread checks
+    whether it has been asked to stop, so it never needs to be killed.
+    """
+
+    def __init__(
+        self,
+        coms_strat: PollableComsStrategy,
+        recv_callback: Callable[[ComsMessage], Any],
+        name: str | None = None,
+        daemon: bool | None = None,
+        poll_timeout: float = 0.2,
+    ) -> None:
+        """Constructor for a new ComsDriverPollingReadLoop.
+        Overides ComsDriverReadLoop.__init__
+
+        :param coms_strat: A strategy that informs how to poll for incoming data
+        :type coms_strat: PollableComsStrategy
+        :param recv_callback: A function detailing what to do with recived input
+        :type recv_callback: Callable[[ComsMessage], Any]
+        :param name: The name of the thread
+        :type name: str | None
+        :param daemon: Wether or not to run the thread as a daemon
+        :type daemon: bool | None
+        :param poll_timeout: Longest time in seconds to wait on the strategy
+            before checking if the thread should stop
+        :type poll_timeout: float
+        """
+        super().__init__(coms_strat, recv_callback, name=name, daemon=daemon)
+        self._poll_strat = coms_strat
+        self._poll_timeout = poll_timeout
+
+    def run(self) -> None:
+        """The main process of the thread.
+
+        Overides ComsDriverReadLoop.run
+        """
+        while not self._stop_event.is_set():
+            try:
+                received = self._poll_strat.poll(timeout=self._poll_timeout)
+            except Exception:
+                logger.error(
+                    f"While polling next ComsMessage got exception {traceback.format_exc()}"
+                )
+                # Do not spin on a strategy that fails without blocking
+                self._stop_event.wait(self._poll_timeout)
+                continue
+            if received is not None:
+                self._recv_callback(received)
+
+
 def _get_msg(strat: ComsStrategy, conn: _ConnectionBase) -> None:
     """Function run to get receive next message
 
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import logging
+import time
+import traceback
+from collections import deque
+from enum import IntEnum
+from threading import Condition, Event, Thread
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Tuple
+
+from attrs import define, evolve
+
+from ..._utils import log
+from ..errors import ComsDriverWriteError
+from ..messages.envelope import split_meta
+from ..messages.message import ComsMessage
+
+if TYPE_CHECKING:
+    from ..strategies.strategy import ComsStrategy
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+
+class WritePriority(IntEnum):
+    """Lanes of a ``ComsDriverWriteLoop``. Lower values are written first"""
+
+    #: Messages that change the mission state, such as an abort
+    COMMAND = 0
+    #: Messages repeating the current mission state, such as resends
+    STATE = 1
+    #: Messages carrying data
+    TELEMETRY = 2
+    #: Large transfers that may wait behind everything else
+    BULK = 3
+
+
+# Lanes in which a message queued without waiting replaces an older one that
+# has not been written yet, since only the newest state or reading matters
+_COALESCED = frozenset({WritePriority.STATE, WritePriority.TELEMETRY})
+
+
+@define
+class LaneStats:
+    """Counters describing the messages that went through one lane of a
+    ``ComsDriverWriteLoop``
+    """
+
+    #: Messages currently waiting to be written
+    depth: int = 0
+    #: Most messages that have been waiting at once
+    max_depth: int = 0
+    #: Messages written
+    written: int = 0
+    #: Messages whose write raised an exception
+    failed: int = 0
+    #: Messages replaced by a newer message before they were written
+    coalesced: int = 0
+    #: Total seconds messages spent waiting before being written
+    total_wait: float = 0.0
+    #: Longest time in seconds a message spent waiting before being written
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Average time in seconds messages spent waiting before being written
+
+        :returns: Mean wait in seconds
+        :rtype: float
+        """
+        done = self.written + self.failed
+        return self.total_wait / done if done else 0.0
+
+
+class _PendingWrite:
+    """A message waiting in a lane of a ``ComsDriverWriteLoop``"""
+
+    def __init__(
+        self, message: ComsMessage, priority: WritePriority, nowait: bool = False
+    ) -> None:
+        self.message = message
+        self.priority = priority
+        self.nowait = nowait
+        self.queued_at = time.monotonic()
+        self.error: BaseException | None = None
+        self._done = Event()
+        self._on_written: List[Callable[[ComsMessage], Any]] = []
+        self._on_failed: List[Callable[[BaseException], Any]] = []
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the message to be written
+
+        :param timeout: Time in seconds to wait. If None, wait indefinitely
+        :type timeout: float | None
+        :raises ComsDriverWriteError: The message could not be written
+        :returns: Whether the message was written in time
+        :rtype: bool
+        """
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise ComsDriverWriteError("Failed to write message") from self.error
+        return True
+
+    def _finish(
+        self, written: ComsMessage | None = None, error: BaseException | None = None
+    ) -> None:
+        self.error = error
+        self._done.set()
+        if written is not None:
+            for callback in self._on_written:
+                try:
+                    callback(written)
+                except Exception:
+                    logger.error(
+                        f"on_written raised exception: {traceback.format_exc()}"
+                    )
+        elif error is not None:
+            for on_failed in self._on_failed:
+                try:
+                    on_failed(error)
+                except Exception:
+                    logger.error(
+                        f"on_failed raised exception: {traceback.format_exc()}"
+                    )
+
+
+def _flags(m: ComsMessage) -> Tuple[int, int, int, int, int | None]:
+    return (m.ABORT, m.QDM, m.STAB, m.LAUNCH, m.ARMED)
+
+
+class ComsDriverWriteLoop(Thread):
+    """The ComsDriverWriteLoop is a thread that can be spawned by a
+    ComsDriver to write messages to its strategy in order of priority,
+    rather than in the order they were written by the caller.
+
+    Messages wait in one lane per ``WritePriority`` and the loop always
+    writes the oldest message of the most urgent lane that is not empty. A
+    message being written is never interrupted, so an abort goes out as
+    soon as the message currently being written has been sent, no matter
+    how much telemetry is waiting.
+
+    Messages queued without waiting for them to be written are coalesced
+    in the state and telemetry lanes. If one is still waiting when a newer
+    one arrives, the newer message takes its place in the lane, so that an
+    overloaded link sends the latest reading instead of falling further
+    and further behind. Commands and link control frames are never
+    coalesced.
+
+    Because messages can overtake each other, telemetry is written with
+    the mission flags of the newest mission message handed to the loop.
+    Otherwise telemetry queued before an abort would arrive after it and
+    appear to undo it. Commands and state are always written as they were
+    queued, and link control frames, which may echo the other station's
+    flags, are never taken as the newest mission state.
+    """
+
+    def __init__(
+        self,
+        coms_strat: ComsStrategy,
+        name: str | None = None,
+        daemon: bool | None = None,
+    ) -> None:
+        """Constructor for a new ComsDriverWriteLoop. Overides Thread.__init__
+
+        :param coms_strat: A strategy that informs how to write messages
+        :type coms_strat: ComsStrategy
+        :param name: The name of the thread
+        :type name: str | None
+        :param daemon: Wether or not to run the thread as a daemon
+        :type daemon: bool | None
+        """
+        super().__init__(name=name, daemon=daemon)
+        self._coms_strat = coms_strat
+        self._cv = Condition()
+        self._lanes: Dict[WritePriority, Deque[_PendingWrite]] = {
+            p: deque() for p in WritePriority
+        }
+        self._stats = {p: LaneStats() for p in WritePriority}
+        self._latest: Tuple[int, int, int, int, int | None] | None = None
+        # Coalescable message at the back of each coalesced lane
+        self._coalescable: Dict[WritePriority, _PendingWrite] = {}
+        self._stopped = False
+
+    @property
+    def stats(self) -> Dict[WritePriority, LaneStats]:
+        """Counters for every lane
+
+        :returns: A copy of the counters of each lane
+        :rtype: Dict[WritePriority, LaneStats]
+        """
+        with self._cv:
+            return {p: evolve(s) for p, s in self._stats.items()}
+
+    def submit(
+        self,
+        m: ComsMessage,
+        priority: WritePriority | None = None,
+        nowait: bool = False,
+        on_written: Callable[[ComsMessage], Any] | None = None,
+        on_failed: Callable[[BaseException], Any] | None = None,
+    ) -> _PendingWrite:
+        """Queue a message to be written
+
+        :param m: A message to write
+        :type m: ComsMessage
+        :param priority: Lane to queue the message in. If None, a message
+            that changes the mission flags is a command, a message carrying
+            data is telemetry and any other message is state
+        :type priority: WritePriority | None
+        :param nowait: Whether the caller will not wait for the message to
+            be written. Such messages may be replaced by newer ones and
+            failures to write them are logged
+        :type nowait: bool
+        :param on_written: Called from the loop with the message as it was
+            written, once it has been written. Not called if the write fails
+            or the message is replaced by a newer one
+        :type on_written: Callable[[ComsMessage], Any] | None
+        :param on_failed: Called from the loop with the exception raised if
+            the message could not be written. Not called if the message is
+            replaced by a newer one
+        :type on_failed: Callable[[BaseException], Any] | None
+        :raises ComsDriverWriteError: The write loop has been stopped
+        :returns: Handle that can be waited on until the message is written
+        :rtype: _PendingWrite
+        """
+        with self._cv:
+            if self._stopped:
+                raise ComsDriverWriteError("Write loop has been stopped")
+            if priority is None:
+                priority = self._classify(m)
+            # Telemetry follows the mission state rather than setting it,
+            # unless no state is known yet
+            ctl = bool(split_meta(m)[1].get("ctl"))
+            if not ctl and (
+                priority is not WritePriority.TELEMETRY or self._latest is None
+            ):
+                self._latest = _flags(m)
+            stats = self._stats[priority]
+            # Link control frames each measure the link, so none may replace
+            # or be replaced by another message
+            coalesce = nowait and not ctl and priority in _COALESCED
+            pending = self._coalescable.get(priority)
+            if coalesce and pending is not None:
+                pending.message = m
+                pending._on_written = [] if on_written is None else [on_written]
+                pending._on_failed = [] if on_failed is None else [on_failed]
+                stats.coalesced += 1
+                return pending
+            pending = _PendingWrite(m, priority, nowait)
+            if on_written is not None:
+                pending._on_written.append(on_written)
+            if on_failed is not None:
+                pending._on_failed.append(on_failed)
+            self._lanes[priority].append(pending)
+            if coalesce:
+                self._coalescable[priority] = pending
+            else:
+                self._coalescable.pop(priority, None)
+            stats.depth += 1
+            stats.max_depth = max(stats.max_depth, stats.depth)
+            self._cv.notify()
+            return pending
+
+    def run(self) -> None:
+        """The main process of the thread.
+
+        Overides Thread.run
+        """
+        while True:
+            with self._cv:
+                pending = self._next()
+                if pending is None:
+                    return
+                m = pending.message
+                if (
+                    pending.priority is WritePriority.TELEMETRY
+                    and self._latest is not None
+                    and _flags(m) != self._latest
+                ):
+                    abort, qdm, stab, launch, armed = self._latest
+                    m = ComsMessage(abort, qdm, stab, launch, armed, m.DATA)
+            error: BaseException | None = None
+            try:
+                self._coms_strat.write(m)
+            except Exception as e:
+                error = e
+                if pending.nowait:
+                    logger.error(f"Failed to write message: {traceback.format_exc()}")
+            with self._cv:
+                stats = self._stats[pending.priority]
+                if error is None:
+                    stats.written += 1
+                else:
+                    stats.failed += 1
+            if error is None:
+                pending._finish(written=m)
+            else:
+                pending._finish(error=error)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """A method to stop accepting messages and end the thread once every
+        queued message has been written
+
+        :param timeout: Time to wait for this thread to join. None means to
+            wait forever
+        :type timeout: float | None
+        """
+        with self._cv:
+            self._stopped = True
+            self._cv.notify()
+        self.join(timeout=timeout)
+
+    def _classify(self, m: ComsMessage) -> WritePriority:
+        """Pick the lane for a message submitted without a priority. Must be
+        called holding the lock
+        """
+        if _flags(m) != self._latest:
+            return WritePriority.COMMAND
+        if split_meta(m)[0].DATA:
+            return WritePriority.TELEMETRY
+        return WritePriority.STATE
+
+    def _next(self) -> _PendingWrite | None:
+        """Wait for and remove the most urgent queued message. Must be called
+        holding the lock
+
+        :returns: The message to write, or None once the loop has been
+            stopped and every lane is empty
+        :rtype: _PendingWrite | None
+        """
+        while True:
+            for priority, lane in self._lanes.items():
+                if lane:
+                    pending = lane.popleft()
+                    if self._coalescable.get(priority) is pending:
+                        del self._coalescable[priority]
+                    wait = time.monotonic() - pending.queued_at
+                    stats = self._stats[priority]
+                    stats.depth -= 1
+                    stats.total_wait += wait
+                    stats.max_wait = max(stats.max_wait, wait)
+                    return pending
+            if self._stopped:
+                return None
+            self._cv.wait()
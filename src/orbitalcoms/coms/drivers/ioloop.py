@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import logging
+import selectors
+import socket
+import time
+import traceback
+from threading import Event, Lock, Thread, current_thread
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+from attrs import define
+
+from ..._utils import log
+from ..strategies.strategy import PollableComsStrategy
+from .driverreadloop import ComsDriverReadLoop
+
+if TYPE_CHECKING:
+    from ..messages import ComsMessage
+    from ..strategies.strategy import ComsStrategy
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+# Most messages read from one strategy before the others get a turn
+_MAX_BATCH = 64
+
+
+@define
+class IOLoopStats:
+    """Counters for a ``ComsIOLoop``"""
+
+    #: Strategies read through the loop's own thread
+    serviced: int = 0
+    #: Strategies that cannot be polled, each read by a read loop of its own
+    fallback: int = 0
+    #: Strategies that have no file descriptor and are checked every
+    #: ``poll_interval``
+    polled: int = 0
+    #: Times the loop woke up to service strategies
+    wakeups: int = 0
+    #: Messages handed to callbacks
+    messages: int = 0
+    #: Exceptions raised while reading a strategy
+    errors: int = 0
+    #: Strategies no longer read because they were closed
+    closed: int = 0
+
+
+class _Source:
+    """A strategy read by a ``ComsIOLoop`` and what to do with its messages"""
+
+    def __init__(
+        self, strategy: ComsStrategy, callback: Callable[[ComsMessage], Any]
+    ) -> None:
+        self.strategy = strategy
+        self.callback = callback
+        self.fd: int | None = None
+        self.registered = False
+        self.active = True
+        # Set when the strategy may have more messages than were read
+        self.ready = False
+        # After an error the strategy is left alone until this time
+        self.resume_at = 0.0
+        self.fallback: ComsDriverReadLoop | None = None
+
+
+class ComsIOLoop(Thread):
+    """A thread that reads many strategies at once, so that a process
+    talking to many stations does not need a read loop for each of them
+
+    Strategies with a file descriptor, such as sockets and serial ports, are
+    waited on together with ``selectors`` and polled without a timeout once
+    readable. Pollable strategies without one, such as an ``InProcessBus``,
+    are polled every ``poll_interval``. Strategies that cannot be polled at
+    all are read by a ``ComsDriverReadLoop`` of their own.
+
+    Messages are handed to each strategy's callback from this thread, so
+    callbacks should return quickly.
+
+    A strategy that fails because it was closed, such as a socket or serial
+    port closed elsewhere or a connection the peer hung up, is no longer
+    read.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        daemon: bool | None = True,
+        poll_interval: float = 0.01,
+        error_backoff: float = 0.2,
+    ) -> None:
+        """Constructor for a new ComsIOLoop. Overides Thread.__init__
+
+        :param name: The name of the thread
+        :type name: str | None
+        :param daemon: Wether or not to run the thread as a daemon
+        :type daemon: bool | None
+        :param poll_interval: Time in seconds between polls of strategies
+            that have no file descriptor
+        :type poll_interval: float
+        :param error_backoff: Time in seconds a strategy is left alone after
+            raising an exception, so that a broken link is not spun on
+        :type error_backoff: float
+        """
+        super().__init__(name=name, daemon=daemon)
+        self.poll_interval = poll_interval
+        self.error_backoff = error_backoff
+        self.stats = IOLoopStats()
+        self._stop_event = Event()
+        self._lock = Lock()
+        self._sources: Dict[int, _Source] = {}
+        self._removed: List[_Source] = []
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def add(
+        self, strategy: ComsStrategy, callback: Callable[[ComsMessage], Any]
+    ) -> None:
+        """Start reading a strategy, starting the loop if it is not running.
+        If the strategy is already being read, its callback is replaced
+
+        :param strategy: A strategy that informs how to read incoming data
+        :type strategy: ComsStrategy
+        :param callback: A function detailing what to do with recived input
+        :type callback: Callable[[ComsMessage], Any]
+        """
+        self.remove(strategy)
+        source = _Source(strategy, callback)
+        if isinstance(strategy, PollableComsStrategy):
+            try:
+                source.fd = strategy.fileno()  # type: ignore[attr-defined]
+            except (AttributeError, OSError, TypeError, ValueError):
+                source.fd = None
+        else:
+            source.fallback = ComsDriverReadLoop(strategy, callback, daemon=True)
+            source.fallback.start()
+        with self._lock:
+            self._sources[id(strategy)] = source
+            if self.ident is None and not self._stop_event.is_set():
+                self.start()
+        self._count()
+        self._wake()
+
+    def remove(self, strategy: ComsStrategy, timeout: float | None = None) -> None:
+        """Stop reading a strategy. No message is handed to its callback
+        after this returns, other than one already being handed over. If
+        the strategy is not being read, this method is a NOP
+
+        :param strategy: A strategy passed to ``add``
+        :type strategy: ComsStrategy
+        :param timeout: The amount of time in seconds to wait for the read
+            loop of a strategy that cannot be polled to join. If None, wait
+            indefinitely
+        :type timeout: float | None
+        """
+        with self._lock:
+            source = self._sources.pop(id(strategy), None)
+            if source is None:
+                return
+            source.active = False
+            self._removed.append(source)
+        if source.fallback is not None and source.fallback.is_alive():
+            source.fallback.stop(timeout=timeout)
+        self._count()
+        self._wake()
+
+    def is_reading(self, strategy: ComsStrategy) -> bool:
+        """Whether a strategy is being read by the loop
+
+        :param strategy: A strategy passed to ``add``
+        :type strategy: ComsStrategy
+        :return: If the strategy is being read
+        :rtype: bool
+        """
+        with self._lock:
+            source = self._sources.get(id(strategy))
+        if source is None:
+            return False
+        if source.fallback is not None:
+            return source.fallback.is_alive()
+        return self.is_alive()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """A method to set events to safly end thread and
+        clean up any/all used resources
+
+        :param timeout: Amount of time in seconds to block calling
+            thread before returning with None meaning an infinte time
+        :type timeout: float  | None
+        """
+        with self._lock:
+            self._stop_event.set()
+            sources = list(self._sources.values())
+            self._sources.clear()
+        for source in sources:
+            if source.fallback is not None and source.fallback.is_alive():
+                source.fallback.stop(timeout=timeout)
+        self._wake()
+        if self.ident is not None and self is not current_thread():
+            self.join(timeout=timeout)
+
+    def run(self) -> None:
+        """The main process of the thread.
+
+        Overides Thread.run
+        """
+        try:
+            while not self._stop_event.is_set():
+                sources = self._prepare()
+                events = self._selector.select(self._timeout(sources))
+                self.stats.wakeups += 1
+                for key, _ in events:
+                    if key.data is None:
+                        self._drain_wakeups()
+                    else:
+                        key.data.ready = True
+                now = time.monotonic()
+                for source in sources:
+                    if source.resume_at > now or source.fallback is not None:
+                        continue
+                    if source.fd is None or source.ready:
+                        self._service(source, now)
+        finally:
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _prepare(self) -> List[_Source]:
+        """Bring the selector up to date with the strategies being read
+
+        :return: The strategies being read
+        :rtype: List[_Source]
+        """
+        with self._lock:
+            removed, self._removed = self._removed, []
+            sources = list(self._sources.values())
+        for source in removed:
+            self._unregister(source)
+        now = time.monotonic()
+        reading = []
+        for source in sources:
+            # A closed descriptor is dropped from the selector without ever
+            # becoming readable, so it is checked for here
+            if source.fallback is None and self._is_closed(source):
+                self._drop(source)
+                continue
+            if source.fd is not None and not source.registered:
+                if source.resume_at <= now:
+                    self._register(source)
+            reading.append(source)
+        return reading
+
+    def _timeout(self, sources: List[_Source]) -> float | None:
+        """Longest time the selector may wait before a strategy needs
+        servicing
+
+        :param sources: The strategies being read
+        :type sources: List[_Source]
+        :return: Time in seconds, or None to wait for a file descriptor
+        :rtype: float | None
+        """
+        timeout: float | None = None
+        now = time.monotonic()
+        for source in sources:
+            if source.fallback is not None:
+                continue
+            if source.resume_at > now:
+                wait = source.resume_at - now
+            elif source.ready:
+                return 0
+            elif source.fd is None:
+                wait = self.poll_interval
+            else:
+                continue
+            timeout = wait if timeout is None else min(timeout, wait)
+        return timeout
+
+    def _service(self, source: _Source, now: float) -> None:
+        """Hand every message waiting on a strategy to its callback
+
+        :param source: The strategy to read
+        :type source: _Source
+        :param now: The time the loop woke up
+        :type now: float
+        """
+        strategy: PollableComsStrategy = source.strategy  # type: ignore[assignment]
+        source.ready = False
+        for _ in range(_MAX_BATCH):
+            if not source.active:
+                return
+            try:
+                received = strategy.poll(timeout=0)
+            except Exception as e:
+                # The peer hanging up also closes the link for good
+                if isinstance(e, (ConnectionError, EOFError)) or self._is_closed(
+                    source
+                ):
+                    self._drop(source)
+                    return
+                logger.error(
+                    f"While polling next ComsMessage got exception {traceback.format_exc()}"
+                )
+                self.stats.errors += 1
+                source.resume_at = now + self.error_backoff
+                self._unregister(source)
+                return
+            if received is None:
+                return
+            self.stats.messages += 1
+            try:
+                source.callback(received)
+            except Exception:
+                logger.error(f"callback raised exception: {traceback.format_exc()}")
+        # Give the other strategies a turn before reading the rest
+        source.ready = True
+
+    def _register(self, source: _Source) -> None:
+        try:
+            self._selector.register(
+                source.fd, selectors.EVENT_READ, source  # type: ignore[arg-type]
+            )
+        except (KeyError, OSError, ValueError):
+            logger.error(f"Could not wait on strategy: {traceback.format_exc()}")
+            source.fd = None
+            self._count()
+            return
+        source.registered = True
+
+    def _unregister(self, source: _Source) -> None:
+        if not source.registered:
+            return
+        source.registered = False
+        try:
+            self._selector.unregister(source.fd)  # type: ignore[arg-type]
+        except (KeyError, OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _is_closed(source: _Source) -> bool:
+        """Whether a strategy has been closed and will never have another
+        message to read
+
+        :param source: The strategy to check
+        :type source: _Source
+        :return: If the strategy is closed
+        :rtype: bool
+        """
+        if getattr(source.strategy, "closed", False) is True:
+            return True
+        if source.fd is None:
+            return False
+        try:
+            fd = source.strategy.fileno()  # type: ignore[attr-defined]
+        except Exception:
+            return True
+        return fd is None or fd < 0
+
+    def _drop(self, source: _Source) -> None:
+        """Stop reading a strategy that has been closed"""
+        logger.error(f"Stopped reading strategy {source.strategy!r} as it was closed")
+        self.stats.closed += 1
+        self._unregister(source)
+        with self._lock:
+            if self._sources.get(id(source.strategy)) is source:
+                del self._sources[id(source.strategy)]
+            source.active = False
+        self._count()
+
+    def _count(self) -> None:
+        """Update the counts of strategies in the stats"""
+        with self._lock:
+            sources = list(self._sources.values())
+        self.stats.fallback = sum(s.fallback is not None for s in sources)
+        self.stats.serviced = len(sources) - self.stats.fallback
+        self.stats.polled = sum(s.fallback is None and s.fd is None for s in sources)
+
+    def _wake(self) -> None:
+        """Interrupt the selector so that changes are picked up"""
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Already awake, or the loop has finished
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
@@ -0,0 +1,60 @@
+"""Helpers for carrying link metadata inside a ``ComsMessage``
+
+Strategies that layer a protocol on top of another strategy, such as
+sequence numbers or acknowledgements, need to send information alongside a
+message without changing its mission flags. That information is kept under a
+single reserved key of the message's ``DATA``, which is removed again before
+the message is handed to the user.
+
+Frames whose metadata sets ``ctl`` are link control frames, such as
+heartbeats. They are never delivered to the user and do not need to arrive
+reliably.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+from .message import ComsMessage
+
+#: Key of ``DATA`` reserved for link metadata
+META_KEY = "_OC"
+
+
+def attach_meta(m: ComsMessage, **meta: Any) -> ComsMessage:
+    """Create a copy of a message carrying link metadata
+
+    Metadata already attached to the message is kept unless it is
+    overwritten by a key of the same name.
+
+    :param m: Message to attach metadata to
+    :type m: ComsMessage
+    :param meta: Metadata to attach. Values should be JSON serializable
+    :type meta: Any
+    :returns: New message carrying the metadata
+    :rtype: ComsMessage
+    """
+    data = dict(m.DATA) if m.DATA is not None else {}
+    data[META_KEY] = {**data.get(META_KEY, {}), **meta}
+    return ComsMessage(m.ABORT, m.QDM, m.STAB, m.LAUNCH, m.ARMED, data)
+
+
+def split_meta(m: ComsMessage) -> Tuple[ComsMessage, Dict[str, Any]]:
+    """Separate a message from the link metadata attached to it
+
+    If removing the metadata leaves ``DATA`` empty, the returned message has
+    no ``DATA``.
+
+    :param m: Message that may carry metadata
+    :type m: ComsMessage
+    :returns: The message without metadata and the metadata, which is empty
+        if none was attached
+    :rtype: Tuple[ComsMessage, Dict[str, Any]]
+    """
+    if m.DATA is None or META_KEY not in m.DATA:
+        return m, {}
+    data = dict(m.DATA)
+    meta = data.pop(META_KEY)
+    if not isinstance(meta, dict):
+        meta = {}
+    return ComsMessage(m.ABORT, m.QDM, m.STAB, m.LAUNCH, m.ARMED, data or None), meta
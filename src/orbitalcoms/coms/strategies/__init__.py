@@ -1,11 +1,45 @@
+from .busstrat import InProcessBus, InProcessBusStrategy
+from .fragment import FragmentStats, Reassembler
+from .framing import Framing, LineStats
+from .impairedstrat import ImpairedComsStrategy, Impairment, ImpairmentStats
 from .localstrat import LocalComsStrategy
+from .multicaststrat import MulticastPublishStrategy, MulticastSubscribeStrategy
+from .ratelimit import TokenBucket
+from .reliablestrat import ReliableComsStrategy, ReliableLinkStats
 from .serialstrat import SerialComsStrategy
-from .socketstrat import SocketComsStrategy
-from .strategy import ComsStrategy
+from .shmstrat import OverflowPolicy, SharedMemoryComsStrategy
+from .socketstrat import SeqPacketComsStrategy, SocketComsStrategy
+from .strategy import ComsStrategy, PollableComsStrategy, RateLimitedComsStrategy
+from .teestrat import TeeComsStrategy
+from .udpstrat import UdpComsStrategy, UdpLinkStats
+from .wrapperstrat import WrappedComsStrategy
 
 __all__ = [
+    "InProcessBus",
+    "InProcessBusStrategy",
     "LocalComsStrategy",
     "SerialComsStrategy",
+    "SharedMemoryComsStrategy",
+    "OverflowPolicy",
     "SocketComsStrategy",
+    "SeqPacketComsStrategy",
+    "UdpComsStrategy",
+    "UdpLinkStats",
+    "MulticastPublishStrategy",
+    "MulticastSubscribeStrategy",
+    "TeeComsStrategy",
+    "ReliableComsStrategy",
+    "ReliableLinkStats",
+    "ImpairedComsStrategy",
+    "Impairment",
+    "ImpairmentStats",
+    "Reassembler",
+    "FragmentStats",
+    "Framing",
+    "LineStats",
+    "WrappedComsStrategy",
     "ComsStrategy",
+    "PollableComsStrategy",
+    "RateLimitedComsStrategy",
+    "TokenBucket",
 ]
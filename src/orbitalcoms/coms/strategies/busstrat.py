@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections import deque
+from threading import Condition, Lock
+from typing import Deque, Tuple
+
+from ..messages import ComsMessage
+from .strategy import PollableComsStrategy
+
+
+class InProcessBus:
+    """A message bus connecting any number of ``InProcessBusStrategy``s that
+    live in the same process
+
+    Every message written by a member of the bus is delivered to every other
+    member of the bus. Messages are handed over by reference, so no encoding,
+    decoding, or copying takes place. ``ComsMessage``s are frozen, but the
+    dict held in their ``DATA`` field is not, so it should not be mutated
+    once the message has been written.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # Replaced rather than mutated so that publishing never needs the lock
+        self._members: Tuple[InProcessBusStrategy, ...] = ()
+
+    def connect(self, maxlen: int | None = None) -> InProcessBusStrategy:
+        """Create a new strategy that is a member of this bus
+
+        :param maxlen: Maximum number of unread messages the new member may
+            hold before the oldest are dropped. If None, the inbox is unbounded
+        :type maxlen: int | None
+        :returns: A new member of the bus
+        :rtype: InProcessBusStrategy
+        """
+        return InProcessBusStrategy(self, maxlen=maxlen)
+
+    @property
+    def members(self) -> Tuple[InProcessBusStrategy, ...]:
+        """The strategies currently attached to the bus
+
+        :returns: Attached strategies
+        :rtype: Tuple[InProcessBusStrategy, ...]
+        """
+        return self._members
+
+    def publish(
+        self, m: ComsMessage, sender: InProcessBusStrategy | None = None
+    ) -> None:
+        """Deliver a message to every member of the bus other than the sender
+
+        :param m: Message to deliver
+        :type m: ComsMessage
+        :param sender: Member that sent the message, if any
+        :type sender: InProcessBusStrategy | None
+        """
+        for member in self._members:
+            if member is not sender:
+                member._deliver(m)
+
+    def _attach(self, member: InProcessBusStrategy) -> None:
+        with self._lock:
+            if member not in self._members:
+                self._members = self._members + (member,)
+
+    def _detach(self, member: InProcessBusStrategy) -> None:
+        with self._lock:
+            self._members = tuple(m for m in self._members if m is not member)
+
+
+class InProcessBusStrategy(PollableComsStrategy):
+    """Communication strategy for stations running in the same process
+
+    Useful for simulations and stress testing where the overhead of sockets,
+    serial ports, or interprocess communication would otherwise dominate.
+    """
+
+    def __init__(self, bus: InProcessBus | None = None, maxlen: int | None = None):
+        """Create a new ``InProcessBusStrategy`` attached to a bus
+
+        :param bus: Bus to attach to. If None, a new bus is created
+        :type bus: InProcessBus | None
+        :param maxlen: Maximum number of unread messages to hold before the
+            oldest are dropped. If None, the inbox is unbounded
+        :type maxlen: int | None
+        """
+        self._bus = bus if bus is not None else InProcessBus()
+        self._inbox: Deque[ComsMessage] = deque(maxlen=maxlen)
+        self._cv = Condition()
+        self.dropped = 0
+        self._bus._attach(self)
+
+    @property
+    def bus(self) -> InProcessBus:
+        """The bus this strategy is a member of
+
+        :returns: Bus the strategy reads from and writes to
+        :rtype: InProcessBus
+        """
+        return self._bus
+
+    def read(self) -> ComsMessage:
+        """Wait for and return the next message delivered by the bus
+
+        :returns: Oldest unread message
+        :rtype: ComsMessage
+        """
+        while True:
+            m = self.poll()
+            if m is not None:
+                return m
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message delivered by the bus if one
+        arrives within the timeout
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Oldest unread message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        try:
+            return self._inbox.popleft()
+        except IndexError:
+            pass
+        with self._cv:
+            if not self._cv.wait_for(lambda: len(self._inbox) > 0, timeout=timeout):
+                return None
+            return self._inbox.popleft()
+
+    def write(self, m: ComsMessage) -> None:
+        """Deliver a message to every other member of the bus
+
+        :param m: A message to send to all other members of the bus
+        :type m: ComsMessage
+        """
+        self._bus.publish(m, sender=self)
+
+    def close(self) -> None:
+        """Leave the bus. Messages written to the bus will no longer be received"""
+        self._bus._detach(self)
+
+    def _deliver(self, m: ComsMessage) -> None:
+        with self._cv:
+            if len(self._inbox) == self._inbox.maxlen:
+                self.dropped += 1
+            self._inbox.append(m)
+            self._cv.notify()
@@ -0,0 +1,186 @@
+"""Splitting encoded messages into fragments small enough for a link's
+maximum frame size, and putting them back together
+
+A fragment starts with an ASCII header ``#<id>.<index>.<count>|`` where the
+message id is hexadecimal. An encoded ``ComsMessage`` always starts with
+``{``, so frames that were not fragmented pass through unchanged and can be
+read by stations that do not know about fragments.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+from attrs import define
+
+_MARK = b"#"
+_END = b"|"
+# Most fragments a single message may be split into
+MAX_FRAGMENTS = 4096
+
+
+@define
+class FragmentStats:
+    """Counters describing the work done by a ``Reassembler``"""
+
+    #: Fragments received
+    fragments: int = 0
+    #: Messages put back together from their fragments
+    reassembled: int = 0
+    #: Messages given up on because a fragment did not arrive in time
+    expired: int = 0
+    #: Messages given up on to make room for newer ones
+    evicted: int = 0
+    #: Fragments whose header could not be parsed
+    malformed: int = 0
+
+
+def _header(msg_id: int, index: int, count: int) -> bytes:
+    return b"#%x.%d.%d|" % (msg_id, index, count)
+
+
+def fragment(payload: bytes, mtu: int, msg_id: int) -> List[bytes]:
+    """Split an encoded message into fragments of at most ``mtu`` bytes
+
+    :param payload: Encoded message
+    :type payload: bytes
+    :param mtu: Largest frame in bytes, including the fragment header
+    :type mtu: int
+    :param msg_id: Id shared by every fragment of the message
+    :type msg_id: int
+    :raises ValueError: The MTU cannot fit a fragment header and any data,
+        or the message needs too many fragments
+    :returns: The message itself if it fits in one frame, otherwise its
+        fragments in order
+    :rtype: List[bytes]
+    """
+    if len(payload) <= mtu and not payload.startswith(_MARK):
+        return [payload]
+    count = 1
+    while True:
+        room = mtu - len(_header(msg_id, count - 1, count))
+        if room <= 0:
+            raise ValueError(f"MTU of {mtu} bytes is too small to fragment")
+        needed = max(-(-len(payload) // room), 1)
+        if needed <= count:
+            break
+        count = needed
+    if count > MAX_FRAGMENTS:
+        raise ValueError(f"Message would need {count} fragments")
+    fragments = []
+    for index in range(count):
+        start = index * room
+        end = start + room
+        fragments.append(_header(msg_id, index, count) + payload[start:end])
+    return fragments
+
+
+@define
+class _Partial:
+    count: int
+    started: float
+    parts: Dict[int, bytes]
+
+
+class Reassembler:
+    """Puts fragmented messages back together
+
+    Fragments of at most ``max_pending`` messages are kept at once. A message
+    whose fragments have not all arrived within ``timeout`` seconds of the
+    first one is dropped, as is the oldest incomplete message when a new one
+    would exceed the limit, so a lost fragment only costs its own message.
+    """
+
+    def __init__(self, max_pending: int = 16, timeout: float = 5.0) -> None:
+        """Create a new ``Reassembler``
+
+        :param max_pending: Most incomplete messages to keep at once
+        :type max_pending: int
+        :param timeout: Seconds to wait for the rest of a message's fragments
+        :type timeout: float
+        """
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.stats = FragmentStats()
+        self._pending: OrderedDict[Tuple[Hashable, int], _Partial] = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """Number of incomplete messages being kept
+
+        :returns: Number of incomplete messages
+        :rtype: int
+        """
+        return len(self._pending)
+
+    def feed(self, frame: bytes, source: Hashable = None) -> bytes | None:
+        """Handle a received frame
+
+        :param frame: A frame as read from the link
+        :type frame: bytes
+        :param source: Sender of the frame. Fragments from different senders
+            are never combined
+        :type source: Hashable
+        :returns: The complete encoded message once all of its fragments have
+            arrived, the frame itself if it is not a fragment, otherwise None
+        :rtype: bytes | None
+        """
+        if not frame.startswith(_MARK):
+            return frame
+        self.stats.fragments += 1
+        now = time.monotonic()
+        self._expire(now)
+        parsed = self._parse(frame)
+        if parsed is None:
+            self.stats.malformed += 1
+            return None
+        msg_id, index, count, data = parsed
+        key = (source, msg_id)
+        partial = self._pending.get(key)
+        if partial is None or partial.count != count:
+            if partial is None and len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.stats.evicted += 1
+            partial = _Partial(count, now, {})
+            self._pending[key] = partial
+            self._pending.move_to_end(key)
+        partial.parts[index] = data
+        if len(partial.parts) < count:
+            return None
+        del self._pending[key]
+        self.stats.reassembled += 1
+        return b"".join(partial.parts[i] for i in range(count))
+
+    def _expire(self, now: float) -> None:
+        """Drop messages that have been incomplete for too long"""
+        while self._pending:
+            key, partial = next(iter(self._pending.items()))
+            if now - partial.started <= self.timeout:
+                break
+            del self._pending[key]
+            self.stats.expired += 1
+
+    @staticmethod
+    def _parse(frame: bytes) -> Tuple[int, int, int, bytes] | None:
+        """Split a fragment into its header fields and data
+
+        :param frame: A fragment
+        :type frame: bytes
+        :returns: Message id, index, count and data, or None if the header is
+            malformed
+        :rtype: Tuple[int, int, int, bytes] | None
+        """
+        end = frame.find(_END)
+        if end < 0:
+            return None
+        try:
+            msg_id, index, count = frame[1:end].split(b".")
+            parsed = int(msg_id, 16), int(index), int(count)
+        except ValueError:
+            return None
+        if not 0 <= parsed[1] < parsed[2] <= MAX_FRAGMENTS:
+            return None
+        start = end + 1
+        return parsed[0], parsed[1], parsed[2], frame[start:]
@@ -0,0 +1,256 @@
+"""Framing for byte stream links such as serial radios
+
+With ``Framing.COBS`` every frame carries a CRC and is encoded with
+Consistent Overhead Byte Stuffing so that it never contains a zero byte.
+A single zero byte then marks the end of each frame. A corrupted frame fails
+its CRC and is dropped on its own, and the reader picks up again at the very
+next zero byte rather than losing sync with the sender.
+"""
+
+from __future__ import annotations
+
+import enum
+import zlib
+from typing import List
+
+from attrs import define
+
+DELIMITER = b"\0"
+
+
+class Framing(enum.Enum):
+    """How frames are marked on a byte stream"""
+
+    #: Encoded messages terminated by a carriage return
+    CR = "cr"
+    #: COBS encoded frames with a CRC, terminated by a zero byte
+    COBS = "cobs"
+
+
+def _make_crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = (crc << 1) ^ 0x1021 if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC16_TABLE = _make_crc16_table()
+
+
+def crc16(data: bytes, crc: int = 0xFFFF) -> int:
+    """Table driven CRC-16/CCITT-FALSE of some bytes
+
+    :param data: Bytes to checksum
+    :type data: bytes
+    :param crc: CRC of any preceding bytes
+    :type crc: int
+    :returns: The CRC
+    :rtype: int
+    """
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def crc32(data: bytes) -> int:
+    """CRC-32 of some bytes, as used by zlib
+
+    :param data: Bytes to checksum
+    :type data: bytes
+    :returns: The CRC
+    :rtype: int
+    """
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """Encode bytes so that they contain no zero bytes
+
+    :param data: Bytes to encode
+    :type data: bytes
+    :returns: Encoded bytes, without a trailing delimiter
+    :rtype: bytes
+    """
+    out = bytearray()
+    for block in data.split(DELIMITER):
+        while len(block) >= 0xFE:
+            out.append(0xFF)
+            out += block[:0xFE]
+            block = block[0xFE:]
+        out.append(len(block) + 1)
+        out += block
+    return bytes(out)
+
+
+def cobs_decode(data: bytes) -> bytes:
+    """Reverse ``cobs_encode``
+
+    :param data: Encoded bytes, without a trailing delimiter
+    :type data: bytes
+    :raises ValueError: The bytes are not a valid encoding
+    :returns: Decoded bytes
+    :rtype: bytes
+    """
+    out = bytearray()
+    i = 0
+    size = len(data)
+    while i < size:
+        code = data[i]
+        if code == 0:
+            raise ValueError("Zero byte inside of a COBS frame")
+        start = i + 1
+        i += code
+        if i > size:
+            raise ValueError("COBS frame is truncated")
+        out += data[start:i]
+        if code != 0xFF and i < size:
+            out.append(0)
+    return bytes(out)
+
+
+@define
+class LineStats:
+    """Counters describing the quality of a framed link"""
+
+    #: Frames received intact
+    frames: int = 0
+    #: Frames dropped because their CRC did not match
+    crc_errors: int = 0
+    #: Frames dropped because they were not validly encoded
+    decode_errors: int = 0
+    #: Frames dropped because no delimiter arrived within the largest
+    #: allowed frame size
+    overruns: int = 0
+    #: Bytes thrown away while resynchronizing after an overrun
+    discarded: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of received frames that were dropped
+
+        :returns: Error rate, or 0 if nothing has been received
+        :rtype: float
+        """
+        bad = self.crc_errors + self.decode_errors + self.overruns
+        total = bad + self.frames
+        return bad / total if total else 0.0
+
+
+class CobsFramer:
+    """Turns payloads into COBS frames with a CRC and back again
+
+    Received bytes are scanned once for delimiters. A frame that fails to
+    decode or whose CRC does not match is dropped and counted, and reading
+    carries on from the next delimiter.
+    """
+
+    def __init__(self, crc_bits: int = 16, max_frame: int = 4096) -> None:
+        """Create a new ``CobsFramer``
+
+        :param crc_bits: Width of the CRC carried by each frame, 16 or 32
+        :type crc_bits: int
+        :param max_frame: Most bytes to buffer while waiting for a delimiter
+        :type max_frame: int
+        """
+        if crc_bits not in (16, 32):
+            raise ValueError("CRC must be 16 or 32 bits")
+        self.crc_size = crc_bits // 8
+        self.max_frame = max_frame
+        self.stats = LineStats()
+        self._buffer = bytearray()
+        self._skipping = False
+
+    def _crc(self, data: bytes) -> bytes:
+        crc = crc16(data) if self.crc_size == 2 else crc32(data)
+        return crc.to_bytes(self.crc_size, "big")
+
+    def encode(self, payload: bytes) -> bytes:
+        """Frame a payload
+
+        :param payload: Bytes to frame
+        :type payload: bytes
+        :returns: The frame, including its delimiter
+        :rtype: bytes
+        """
+        return cobs_encode(payload + self._crc(payload)) + DELIMITER
+
+    def max_payload(self, mtu: int) -> int:
+        """Largest payload whose frame fits within ``mtu`` bytes
+
+        :param mtu: Largest frame in bytes, including the delimiter
+        :type mtu: int
+        :returns: Largest payload size in bytes
+        :rtype: int
+        """
+        size = mtu - self.crc_size - 2
+        while size + self.crc_size + 2 + (size + self.crc_size) // 0xFE > mtu:
+            size -= 1
+        return size
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Handle bytes received from the link
+
+        :param data: Bytes as read from the link
+        :type data: bytes
+        :returns: Payloads of the intact frames completed by these bytes
+        :rtype: List[bytes]
+        """
+        payloads: List[bytes] = []
+        start = 0
+        while True:
+            end = data.find(DELIMITER, start)
+            if end < 0:
+                self._extend(data[start:])
+                return payloads
+            self._extend(data[start:end])
+            start = end + 1
+            if self._skipping:
+                self._skipping = False
+                continue
+            payload = self._decode(bytes(self._buffer))
+            self._buffer.clear()
+            if payload is not None:
+                payloads.append(payload)
+
+    def _extend(self, data: bytes) -> None:
+        """Buffer part of a frame, dropping it if it grows too large"""
+        if self._skipping:
+            self.stats.discarded += len(data)
+            return
+        self._buffer += data
+        if len(self._buffer) > self.max_frame:
+            self.stats.overruns += 1
+            self.stats.discarded += len(self._buffer)
+            self._buffer.clear()
+            self._skipping = True
+
+    def _decode(self, frame: bytes) -> bytes | None:
+        """Decode a frame and check its CRC
+
+        :param frame: A frame, without its delimiter
+        :type frame: bytes
+        :returns: The frame's payload, or None if it was dropped
+        :rtype: bytes | None
+        """
+        if not frame:
+            # Back to back delimiters carry nothing and are not an error
+            return None
+        try:
+            decoded = cobs_decode(frame)
+        except ValueError:
+            self.stats.decode_errors += 1
+            return None
+        split = len(decoded) - self.crc_size
+        if split < 0:
+            self.stats.decode_errors += 1
+            return None
+        payload = decoded[:split]
+        if decoded[split:] != self._crc(payload):
+            self.stats.crc_errors += 1
+            return None
+        self.stats.frames += 1
+        return payload
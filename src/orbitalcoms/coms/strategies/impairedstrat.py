@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+import traceback
+from collections import deque
+from threading import Condition, Event, Lock, Thread
+from typing import Callable, Deque, List
+
+from attrs import define
+
+from ..._utils import log
+from ..._utils.scheduler import Scheduler, get_scheduler
+from ..messages.message import ComsMessage
+from .strategy import ComsStrategy
+from .wrapperstrat import WrappedComsStrategy
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+# Longest time in seconds the reader takes to notice the strategy was closed
+_CLOSE_CHECK_INTERVAL = 0.1
+
+
+@define(frozen=True)
+class Impairment:
+    """How an ``ImpairedComsStrategy`` degrades messages in one direction"""
+
+    #: Seconds every message is delayed by
+    latency: float = 0.0
+    #: Most extra seconds a message is delayed by, chosen uniformly at random
+    jitter: float = 0.0
+    #: Bytes per second the link carries. Messages queue behind each other
+    #: once it is full. If None, the link is infinitely fast
+    bandwidth: float | None = None
+    #: Probability that a message is lost
+    loss: float = 0.0
+    #: Probability that a message is delivered twice
+    duplicate: float = 0.0
+    #: Probability that a message is held back so that later messages
+    #: overtake it
+    reorder: float = 0.0
+    #: Extra seconds a reordered message is held back by
+    reorder_delay: float = 0.05
+
+
+@define
+class ImpairmentStats:
+    """Counters for one direction of an ``ImpairedComsStrategy``"""
+
+    #: Messages handed to the link
+    messages: int = 0
+    #: Messages lost
+    lost: int = 0
+    #: Extra copies of messages sent
+    duplicated: int = 0
+    #: Messages held back to be overtaken
+    reordered: int = 0
+    #: Messages, including copies, that have come out of the link
+    delivered: int = 0
+
+
+class _Direction:
+    """Decides when, and how many times, messages come out of one direction
+    of the link
+    """
+
+    def __init__(self, impairment: Impairment, rng: random.Random) -> None:
+        self.impairment = impairment
+        self.rng = rng
+        self.stats = ImpairmentStats()
+        self._busy_until = 0.0
+        self._lock = Lock()
+
+    def delays(self, m: ComsMessage) -> List[float]:
+        """Seconds from now at which each copy of a message comes out of the
+        link. Empty if the message is lost
+        """
+        imp = self.impairment
+        with self._lock:
+            self.stats.messages += 1
+            now = time.monotonic()
+            departs = now
+            if imp.bandwidth is not None:
+                # The message is on the link until its last byte is sent,
+                # even if it is then lost
+                size = len(m.as_str.encode())
+                departs = max(self._busy_until, now) + size / imp.bandwidth
+                self._busy_until = departs
+            if self.rng.random() < imp.loss:
+                self.stats.lost += 1
+                return []
+            copies = 1
+            if self.rng.random() < imp.duplicate:
+                copies = 2
+                self.stats.duplicated += 1
+            delays = []
+            for _ in range(copies):
+                delay = departs - now + imp.latency + self.rng.uniform(0, imp.jitter)
+                if self.rng.random() < imp.reorder:
+                    delay += imp.reorder_delay
+                    self.stats.reordered += 1
+                delays.append(delay)
+            return delays
+
+
+class ImpairedComsStrategy(WrappedComsStrategy):
+    """Wraps a strategy to behave like a poor radio link
+
+    Messages written and read can be delayed, limited to a bandwidth,
+    reordered, duplicated and lost, each direction according to its own
+    ``Impairment``. With a ``seed`` the same messages are impaired the same
+    way every run.
+
+    Delayed messages are handed on by a ``Scheduler`` rather than by sleeping,
+    so ``write`` returns immediately and a message written to the wrapped
+    strategy later is written from the scheduler's thread. Wrap strategies
+    whose writes are quick, such as an ``InProcessBus`` or socket. Errors
+    from such delayed writes are logged, since the caller has moved on.
+
+    Received messages are read from the wrapped strategy by a background
+    thread so that they are timed from when they arrived, not from when the
+    strategy is next polled. ``close`` stops the thread.
+    """
+
+    def __init__(
+        self,
+        inner: ComsStrategy,
+        write: Impairment | None = None,
+        read: Impairment | None = None,
+        seed: int | None = None,
+        scheduler: Scheduler | None = None,
+    ) -> None:
+        """Create a new ``ImpairedComsStrategy``
+
+        :param inner: The strategy to impair
+        :type inner: ComsStrategy
+        :param write: How written messages are impaired. If None, they are
+            written immediately
+        :type write: Impairment | None
+        :param read: How read messages are impaired. If None, they are
+            returned immediately
+        :type read: Impairment | None
+        :param seed: Seed for reproducible impairments
+        :type seed: int | None
+        :param scheduler: Scheduler that hands on delayed messages. If None,
+            the process-wide scheduler
+        :type scheduler: Scheduler | None
+        """
+        super().__init__(inner)
+        rng = random.Random(seed)
+        self._write = _Direction(write or Impairment(), random.Random(rng.getrandbits(64)))
+        self._read = _Direction(read or Impairment(), random.Random(rng.getrandbits(64)))
+        self._scheduler = scheduler or get_scheduler()
+        self._ready: Deque[ComsMessage] = deque()
+        self._cv = Condition()
+        self._impaired_reader: Thread | None = None
+        self._closed = Event()
+
+    @property
+    def write_stats(self) -> ImpairmentStats:
+        """Counters for written messages"""
+        return self._write.stats
+
+    @property
+    def read_stats(self) -> ImpairmentStats:
+        """Counters for read messages"""
+        return self._read.stats
+
+    def write(self, m: ComsMessage) -> None:
+        """Hand a message to the impaired link. Returns without waiting for
+        the message to be written to the wrapped strategy
+
+        :param m: A message to write
+        :type m: ComsMessage
+        """
+        for delay in self._write.delays(m):
+            self._after(delay, self._write, lambda: self.inner.write(m))
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message to come out of the impaired
+        link
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        with self._cv:
+            if self._impaired_reader is None and not self._closed.is_set():
+                self._impaired_reader = Thread(target=self._read_inner, daemon=True)
+                self._impaired_reader.start()
+            if not self._cv.wait_for(lambda: len(self._ready) > 0, timeout=timeout):
+                return None
+            return self._ready.popleft()
+
+    def _read_inner(self) -> None:
+        """Pass every message read from the wrapped strategy through the
+        impaired link
+        """
+        while not self._closed.is_set():
+            try:
+                # Wake up now and then to notice the strategy was closed
+                m = self._poll_inner(_CLOSE_CHECK_INTERVAL)
+            except Exception:
+                if self._closed.is_set():
+                    break
+                logger.error(
+                    f"While reading wrapped strategy got exception {traceback.format_exc()}"
+                )
+                # Do not spin on a strategy that keeps failing
+                self._closed.wait(0.2)
+                continue
+            if m is not None:
+                for delay in self._read.delays(m):
+                    self._after(delay, self._read, lambda m=m: self._deliver(m))
+
+    def close(self) -> None:
+        """Stop reading and close the wrapped strategy, if it can be closed.
+        Delayed messages still in the link are dropped, whether they were
+        written or read
+        """
+        self._closed.set()
+        reader = self._impaired_reader
+        if reader is not None and reader.is_alive():
+            reader.join(timeout=1)
+        super().close()
+
+    def _deliver(self, m: ComsMessage) -> None:
+        with self._cv:
+            self._ready.append(m)
+            self._cv.notify()
+
+    def _after(
+        self, delay: float, direction: _Direction, action: Callable[[], object]
+    ) -> None:
+        """Run an action once a message comes out of the link
+
+        :param delay: Seconds until the message comes out
+        :type delay: float
+        :param direction: Direction the message travels in
+        :type direction: _Direction
+        :param action: What to do with the message
+        :type action: Callable[[], object]
+        """
+
+        if delay <= 0:
+            # Not delayed, so errors can be raised to the caller
+            direction.stats.delivered += 1
+            action()
+            return
+
+        def run() -> None:
+            # Messages still in the link when it was closed never come out,
+            # in either direction
+            if self._closed.is_set():
+                return
+            direction.stats.delivered += 1
+            try:
+                action()
+            except Exception:
+                logger.error(
+                    f"Failed to hand on impaired message: {traceback.format_exc()}"
+                )
+
+        self._scheduler.call_later(delay, run)
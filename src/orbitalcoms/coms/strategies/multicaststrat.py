@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import socket
+import struct
+import time
+
+from ..errors.errors import ComsDriverWriteError
+from ..messages.message import ComsMessage
+from .udpstrat import Address, UdpComsStrategy
+
+DEFAULT_GROUP = "239.255.42.99"
+DEFAULT_PORT = 5007
+
+
+class MulticastPublishStrategy(UdpComsStrategy):
+    """Informs how to publish messages to an IP multicast group
+
+    Every message is sent once to the group, however many subscribers have
+    joined it, so the cost of publishing does not grow with the number of
+    subscribers. Publishing is one way, a publisher never reads a message.
+    """
+
+    @classmethod
+    def create(
+        cls,
+        group: str = DEFAULT_GROUP,
+        port: int = DEFAULT_PORT,
+        ttl: int = 1,
+        interface: str = "0.0.0.0",
+    ) -> MulticastPublishStrategy:
+        """Create a socket that publishes to a multicast group
+
+        :param group: Multicast group address to publish to
+        :type group: str
+        :param port: Port subscribers listen on
+        :type port: int
+        :param ttl: Number of routers the datagrams may cross. The default of
+            1 keeps them on the local network
+        :type ttl: int
+        :param interface: IP address of the interface to publish on
+        :type interface: str
+        :returns: A strategy to publish messages with
+        :rtype: MulticastPublishStrategy
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        sock.setsockopt(
+            socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface)
+        )
+        return cls(sock, peer=(group, port))
+
+    def fileno(self) -> int:
+        """Publishers never read messages, so there is nothing to wait on
+
+        :raises OSError: Always
+        """
+        raise OSError("Multicast publishers have no messages to wait on")
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Publishers never read messages. Waits out the timeout and
+        returns None
+
+        :param timeout: Time in seconds to wait. If None, wait indefinitely
+        :type timeout: float | None
+        :returns: None
+        :rtype: None
+        """
+        while timeout is None:
+            time.sleep(3600)
+        time.sleep(timeout)
+        return None
+
+    def _learn_peer(self, addr: Address, session: int, hello: bool) -> None:
+        """Publishers always send to their group"""
+
+
+class MulticastSubscribeStrategy(UdpComsStrategy):
+    """Informs how to receive messages published to an IP multicast group
+
+    Subscribers are read-only, attempting to write a message will fail.
+    """
+
+    @classmethod
+    def join(
+        cls,
+        group: str = DEFAULT_GROUP,
+        port: int = DEFAULT_PORT,
+        interface: str = "0.0.0.0",
+    ) -> MulticastSubscribeStrategy:
+        """Create a socket that has joined a multicast group
+
+        Any number of subscribers can join the same group and port on the
+        same machine.
+
+        :param group: Multicast group address to join
+        :type group: str
+        :param port: Port the publisher sends to
+        :type port: int
+        :param interface: IP address of the interface to join the group on
+        :type interface: str
+        :returns: A strategy to receive published messages with
+        :rtype: MulticastSubscribeStrategy
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            # Binding to the group keeps out datagrams sent to the same port
+            # on other groups, but is not supported everywhere
+            sock.bind((group, port))
+        except OSError:
+            sock.bind(("", port))
+        membership = struct.pack(
+            "4s4s", socket.inet_aton(group), socket.inet_aton(interface)
+        )
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        return cls(sock)
+
+    def write(self, m: ComsMessage) -> None:
+        """Subscribers are read-only
+
+        :param m: [UNUSED] A message to write
+        :type m: ComsMessage
+        :raises ComsDriverWriteError: Always
+        """
+        raise ComsDriverWriteError("Cannot write to a multicast subscription")
+
+    def hello(self) -> None:
+        """Subscribers never send datagrams"""
+
+    def _learn_peer(self, addr: Address, session: int, hello: bool) -> None:
+        """Subscribers never send datagrams"""
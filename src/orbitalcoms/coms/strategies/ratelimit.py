@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Any, Dict
+
+import serial
+
+
+class TokenBucket:
+    """Paces writes to the number of bytes per second a link can carry
+
+    The bucket holds up to ``burst`` bytes worth of tokens and refills at
+    ``rate`` bytes per second. Writing takes tokens from the bucket, waiting
+    for it to refill if there are not enough. A write larger than ``burst``
+    only waits for a full bucket and leaves it in debt, so later writes wait
+    for the debt to be paid off instead of the large write never going out.
+
+    Tokens are reserved before waiting, so concurrent writers are paced in
+    the order they arrived.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Create a new ``TokenBucket`` that starts full
+
+        :param rate: Bytes per second the link can carry
+        :type rate: float
+        :param burst: Most bytes that may be written at once without waiting
+        :type burst: float
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+        if burst <= 0:
+            raise ValueError("Burst must be greater than 0")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._stamp = time.monotonic()
+        self._lock = Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    @property
+    def utilization(self) -> float:
+        """How full the link is, as the fraction of the burst allowance that
+        is in use. Values above 1 mean writes are waiting for the link
+
+        :returns: Utilization of the link
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            return 1 - self._tokens / self.burst
+
+    def delay_for(self, size: int) -> float:
+        """Time a write would have to wait without taking any tokens
+
+        :param size: Size in bytes of the write
+        :type size: int
+        :returns: Seconds the write would wait
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            return self._delay(size)
+
+    def take(self, size: int) -> float:
+        """Take tokens for a write, waiting until the link can carry it
+
+        :param size: Size in bytes of the write
+        :type size: int
+        :returns: Seconds spent waiting
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            delay = self._delay(size)
+            self._tokens -= size
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def _delay(self, size: int) -> float:
+        """Seconds until the bucket holds enough tokens for a write. Must be
+        called holding the lock
+        """
+        return max(min(size, self.burst) - self._tokens, 0) / self.rate
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill. Must be called
+        holding the lock
+        """
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._stamp) * self.rate, self.burst)
+        self._stamp = now
+
+
+def serial_bytes_per_second(ser: serial.Serial) -> float:
+    """Number of bytes per second a serial connection can carry, counting
+    the start, parity and stop bits sent with every byte
+
+    :param ser: Serial connection to measure
+    :type ser: serial.Serial
+    :returns: Bytes per second
+    :rtype: float
+    """
+    parity = 0 if ser.parity == serial.PARITY_NONE else 1
+    bits: float = 1 + ser.bytesize + parity + ser.stopbits
+    return float(ser.baudrate) / bits
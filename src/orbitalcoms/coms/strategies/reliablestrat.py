@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+import traceback
+from collections import deque
+from threading import Condition
+from typing import Any, Deque, Dict
+
+from attrs import define
+
+from ..._utils import log
+from ..errors.errors import ComsDriverWriteError
+from ..messages.envelope import attach_meta, split_meta
+from ..messages.message import ComsMessage
+from .strategy import ComsStrategy
+from .wrapperstrat import WrappedComsStrategy
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+# Clock granularity used when calculating the retransmission timeout
+_GRANULARITY = 0.01
+
+
+@define
+class ReliableLinkStats:
+    """Counters describing the work done by a ``ReliableComsStrategy``"""
+
+    #: New messages sent
+    sent: int = 0
+    #: Messages sent again because they were not acknowledged in time
+    retransmitted: int = 0
+    #: Sent messages acknowledged by the peer
+    acknowledged: int = 0
+    #: Sent messages given up on after too many retransmissions
+    failed: int = 0
+    #: Received messages returned to the reader
+    delivered: int = 0
+    #: Received messages that had already been delivered
+    duplicates: int = 0
+
+
+@define
+class _InFlight:
+    """A sent message waiting to be acknowledged"""
+
+    message: ComsMessage
+    first_sent: float
+    deadline: float
+    retries: int = 0
+
+
+class ReliableComsStrategy(WrappedComsStrategy):
+    """Makes sure messages written to a strategy arrive, in order
+
+    Every written message is given a sequence number and kept until the peer
+    acknowledges it. Messages that are not acknowledged within the
+    retransmission timeout (RTO) are sent again. The RTO adapts to the
+    measured round trip time as described in RFC 6298, ignoring samples
+    from retransmitted messages (Karn's algorithm) and doubling after each
+    timeout. At most ``window`` messages can be waiting for an
+    acknowledgement at once, other than aborts, which are never held back
+    by the window.
+
+    The peer must also use a ``ReliableComsStrategy``. Received messages are
+    delivered exactly once and in the order they were written, and messages
+    from a peer not using sequence numbers are delivered as they arrive.
+
+    Link control frames, such as heartbeats, are passed through without
+    sequence numbers.
+
+    Retransmissions are made while the strategy is polled, which a
+    ``ComsDriver`` does continuously once its read loop is started.
+    """
+
+    def __init__(
+        self,
+        inner: ComsStrategy,
+        window: int = 8,
+        initial_rto: float = 1.0,
+        min_rto: float = 0.2,
+        max_rto: float = 60.0,
+        max_retries: int | None = 8,
+        write_timeout: float | None = 5.0,
+    ) -> None:
+        """Create a new ``ReliableComsStrategy``
+
+        :param inner: The strategy to send messages over
+        :type inner: ComsStrategy
+        :param window: Most messages that may be waiting for an
+            acknowledgement at once
+        :type window: int
+        :param initial_rto: Retransmission timeout in seconds used before
+            the round trip time has been measured
+        :type initial_rto: float
+        :param min_rto: Smallest retransmission timeout in seconds
+        :type min_rto: float
+        :param max_rto: Largest retransmission timeout in seconds
+        :type max_rto: float
+        :param max_retries: Number of retransmissions after which a message is
+            given up on. If None, messages are retransmitted until acknowledged
+        :type max_retries: int | None
+        :param write_timeout: Longest time in seconds to block writing while
+            the window is full. If None, wait indefinitely, which blocks the
+            writer forever once the link goes down
+        :type write_timeout: float | None
+        """
+        super().__init__(inner)
+        self.window = window
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.max_retries = max_retries
+        self.write_timeout = write_timeout
+        self.stats = ReliableLinkStats()
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.rto = initial_rto
+        # Guards all state below and serializes writes to the inner strategy
+        self._cv = Condition()
+        self._session = random.getrandbits(32)
+        self._next_seq = 0
+        self._in_flight: Dict[int, _InFlight] = {}
+        self._peer_session: int | None = None
+        self._expected = 0
+        self._out_of_order: Dict[int, ComsMessage] = {}
+        self._ready: Deque[ComsMessage] = deque()
+
+    @property
+    def unacknowledged(self) -> int:
+        """Number of sent messages waiting for an acknowledgement
+
+        :returns: Number of unacknowledged messages
+        :rtype: int
+        """
+        return len(self._in_flight)
+
+    def write(self, m: ComsMessage) -> None:
+        """Send a message and keep it until it is acknowledged
+
+        :param m: A message to send
+        :type m: ComsMessage
+        :raises ComsDriverWriteError: The window stayed full for longer than
+            the write timeout
+        """
+        message, meta = split_meta(m)
+        if meta.get("ctl"):
+            # Control frames are best effort, retransmitting a heartbeat
+            # would only distort the round trip time it measures
+            with self._cv:
+                self.inner.write(m)
+            return
+        with self._cv:
+            # An abort must never wait behind messages the peer has not
+            # acknowledged, it is still retransmitted until it is
+            if not message.ABORT and not self._cv.wait_for(
+                lambda: len(self._in_flight) < self.window, timeout=self.write_timeout
+            ):
+                raise ComsDriverWriteError("Too many unacknowledged messages")
+            seq = self._next_seq
+            framed = attach_meta(m, sid=self._session, seq=seq, base=self._base())
+            self.inner.write(framed)
+            now = time.monotonic()
+            self._in_flight[seq] = _InFlight(framed, now, now + self.rto)
+            self._next_seq += 1
+            self.stats.sent += 1
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message in the order it was sent,
+        retransmitting unacknowledged messages while waiting
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cv:
+                until_retransmit = self._retransmit_expired()
+                if self._ready:
+                    self.stats.delivered += 1
+                    return self._ready.popleft()
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if until_retransmit is not None:
+                wait = until_retransmit if wait is None else min(wait, until_retransmit)
+            m = self._poll_inner(wait)
+            if m is not None:
+                with self._cv:
+                    self._receive(m)
+            elif deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def _base(self) -> int:
+        """Lowest sequence number the peer may still need to wait for"""
+        return min(self._in_flight) if self._in_flight else self._next_seq
+
+    def _retransmit_expired(self) -> float | None:
+        """Retransmit every message whose timeout has expired
+
+        :returns: Seconds until the next timeout expires or None if no
+            messages are waiting for an acknowledgement
+        :rtype: float | None
+        """
+        now = time.monotonic()
+        expired = [s for s, e in self._in_flight.items() if e.deadline <= now]
+        if expired:
+            self.rto = min(self.rto * 2, self.max_rto)
+        for seq in expired:
+            entry = self._in_flight[seq]
+            if self.max_retries is not None and entry.retries >= self.max_retries:
+                del self._in_flight[seq]
+                self.stats.failed += 1
+                self._cv.notify_all()
+                logger.error(f"Gave up on message {seq} after {entry.retries} retries")
+                continue
+            entry.retries += 1
+            entry.deadline = now + self.rto
+            self.stats.retransmitted += 1
+            self._write_inner(attach_meta(entry.message, base=self._base()))
+        if not self._in_flight:
+            return None
+        return max(min(e.deadline for e in self._in_flight.values()) - now, 0)
+
+    def _receive(self, m: ComsMessage) -> None:
+        """Handle a message read from the inner strategy, queueing it to be
+        delivered if it is next in order
+
+        :param m: Message read from the inner strategy
+        :type m: ComsMessage
+        """
+        framed = m
+        m, meta = split_meta(framed)
+        if "ack" in meta:
+            self._on_ack(meta)
+            return
+        if "seq" not in meta:
+            # Left untouched, control frames keep their metadata
+            self._ready.append(framed)
+            return
+        seq: int = meta["seq"]
+        base: int = meta.get("base", seq)
+        if meta.get("sid") != self._peer_session:
+            self._peer_session = meta.get("sid")
+            self._expected = base
+            self._out_of_order.clear()
+        elif base > self._expected:
+            # The peer gave up on the messages before base
+            self._expected = base
+            for stale in [s for s in self._out_of_order if s < base]:
+                del self._out_of_order[stale]
+        if seq < self._expected or seq in self._out_of_order:
+            self.stats.duplicates += 1
+        else:
+            self._out_of_order[seq] = m
+        while self._expected in self._out_of_order:
+            self._ready.append(self._out_of_order.pop(self._expected))
+            self._expected += 1
+        # Acknowledgements echo the flags they acknowledge so that they are
+        # harmless to a peer that does not understand them
+        self._write_inner(
+            attach_meta(
+                ComsMessage(m.ABORT, m.QDM, m.STAB, m.LAUNCH, m.ARMED),
+                sid=self._peer_session,
+                ack=self._expected,
+                sack=sorted(self._out_of_order),
+            )
+        )
+
+    def _on_ack(self, meta: Dict[str, Any]) -> None:
+        """Forget messages acknowledged by the peer and update the
+        retransmission timeout
+
+        :param meta: Metadata of an acknowledgement
+        :type meta: Dict[str, Any]
+        """
+        if meta.get("sid") != self._session:
+            return
+        ack: int = meta["ack"]
+        sacked = set(meta.get("sack", ()))
+        acked = [s for s in self._in_flight if s < ack or s in sacked]
+        if not acked:
+            return
+        newest = self._in_flight[max(acked)]
+        if newest.retries == 0:
+            self._sample_rtt(time.monotonic() - newest.first_sent)
+        for seq in acked:
+            del self._in_flight[seq]
+        self.stats.acknowledged += len(acked)
+        self._cv.notify_all()
+
+    def _sample_rtt(self, rtt: float) -> None:
+        """Update the smoothed round trip time and the retransmission timeout
+        with a new measurement as described in RFC 6298
+
+        :param rtt: Measured round trip time in seconds
+        :type rtt: float
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        rto = self.srtt + max(_GRANULARITY, 4 * self.rttvar)
+        self.rto = min(max(rto, self.min_rto), self.max_rto)
+
+    def _write_inner(self, m: ComsMessage) -> None:
+        """Write a retransmission or acknowledgement, logging failures since
+        the message will be sent again later anyway
+
+        :param m: Message to write to the inner strategy
+        :type m: ComsMessage
+        """
+        try:
+            self.inner.write(m)
+        except Exception:
+            logger.error(
+                f"Failed to write to wrapped strategy: {traceback.format_exc()}"
+            )
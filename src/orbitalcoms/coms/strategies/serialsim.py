@@ -0,0 +1,258 @@
+"""Simulated serial link between two pseudoterminals
+
+Each end of the link is the slave side of a pty, so anything that opens a
+serial port by path, such as ``SerialComsStrategy.from_args`` or
+``create_serial_launch_station``, can be pointed at it. Bytes written to one
+end are delivered to the other no faster than the chosen baudrate allows and
+may be corrupted or dropped on the way.
+
+Pseudoterminals are only available on unix like systems.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import select
+import time
+import tty
+from threading import Event, Thread
+from typing import List
+
+from attrs import define
+
+# Bytes moved through the link at once. Small enough that pacing stays
+# accurate to about a millisecond at 115200 baud
+_CHUNK = 16
+
+
+@define(frozen=True)
+class LineImpairment:
+    """Errors introduced by a ``SimulatedSerialLink``"""
+
+    #: Probability that any single bit is flipped
+    bit_error_rate: float = 0.0
+    #: Probability that any single byte is lost
+    drop_rate: float = 0.0
+    #: Probability that a burst of corrupted bytes starts at any byte
+    burst_rate: float = 0.0
+    #: Number of bytes corrupted by a burst
+    burst_length: int = 8
+
+
+class SimLinkStats:
+    """Counters for one direction of a ``SimulatedSerialLink``"""
+
+    def __init__(self) -> None:
+        #: Bytes written to the sending end
+        self.sent = 0
+        #: Bytes delivered to the receiving end
+        self.delivered = 0
+        #: Bytes lost on the way
+        self.dropped = 0
+        #: Bits flipped, including those flipped by bursts
+        self.flipped = 0
+        #: Bursts of corrupted bytes
+        self.bursts = 0
+
+
+class _Direction:
+    """Moves bytes from one pty master to another at the link's baudrate"""
+
+    def __init__(
+        self,
+        src: int,
+        dst: int,
+        byte_time: float,
+        impairment: LineImpairment,
+        rng: random.Random,
+    ) -> None:
+        self.src = src
+        self.dst = dst
+        self.byte_time = byte_time
+        self.impairment = impairment
+        self.rng = rng
+        self.stats = SimLinkStats()
+        self._burst_left = 0
+        self._next_flip = self._bits_to_next_flip()
+        # Time the last byte written finishes arriving at the other end
+        self._busy_until = 0.0
+
+    def _bits_to_next_flip(self) -> int:
+        """Bits to leave alone before the next flipped bit, drawn from the
+        geometric distribution so that no random number is needed per bit
+        """
+        ber = self.impairment.bit_error_rate
+        if ber <= 0:
+            return -1
+        if ber >= 1:
+            return 0
+        return int(math.log(1 - self.rng.random()) / math.log(1 - ber))
+
+    def impair(self, data: bytes) -> bytes:
+        imp = self.impairment
+        if imp == LineImpairment():
+            return data
+        out = bytearray()
+        for b in data:
+            if imp.drop_rate and self.rng.random() < imp.drop_rate:
+                self.stats.dropped += 1
+                continue
+            if not self._burst_left and imp.burst_rate:
+                if self.rng.random() < imp.burst_rate:
+                    self._burst_left = imp.burst_length
+                    self.stats.bursts += 1
+            if self._burst_left:
+                self._burst_left -= 1
+                mask = self.rng.randrange(1, 256)
+                b ^= mask
+                self.stats.flipped += bin(mask).count("1")
+            bit = 0
+            while 0 <= self._next_flip < 8 - bit:
+                bit += self._next_flip
+                b ^= 1 << bit
+                self.stats.flipped += 1
+                bit += 1
+                self._next_flip = self._bits_to_next_flip()
+            if self._next_flip >= 0:
+                self._next_flip -= 8 - bit
+            out.append(b)
+        return bytes(out)
+
+    def pump(self, data: bytes, stop: Event) -> None:
+        """Deliver bytes read from the source, waiting for each chunk to
+        finish arriving as it would on a real line
+        """
+        self.stats.sent += len(data)
+        for i in range(0, len(data), _CHUNK):
+            chunk = data[i : i + _CHUNK]
+            now = time.monotonic()
+            self._busy_until = max(self._busy_until, now) + len(chunk) * self.byte_time
+            if self._busy_until > now and stop.wait(self._busy_until - now):
+                return
+            chunk = self.impair(chunk)
+            self.stats.delivered += len(chunk)
+            while chunk:
+                try:
+                    chunk = chunk[os.write(self.dst, chunk) :]
+                except BlockingIOError:
+                    # Nobody is reading the other end, wait for room
+                    if stop.wait(0.01):
+                        return
+
+
+class SimulatedSerialLink:
+    """Two pseudoterminals joined by a simulated serial line
+
+    Open ``port_a`` and ``port_b`` like any other serial port. Every byte
+    takes ``bits_per_byte / baudrate`` seconds to cross the link, which by
+    default is the ten bits of 8N1 framing.
+    """
+
+    def __init__(
+        self,
+        baudrate: int = 9600,
+        impairment: LineImpairment | None = None,
+        bits_per_byte: int = 10,
+        seed: int | None = None,
+    ) -> None:
+        """
+        :param baudrate: Bits per second the simulated line carries
+        :type baudrate: int
+        :param impairment: Errors introduced in both directions. If None,
+            the line is perfect
+        :type impairment: LineImpairment | None
+        :param bits_per_byte: Bits sent on the line per byte, including
+            start, parity and stop bits
+        :type bits_per_byte: int
+        :param seed: Seed for reproducible errors
+        :type seed: int | None
+        """
+        self.baudrate = baudrate
+        self.impairment = impairment or LineImpairment()
+        master_a, self._slave_a = os.openpty()
+        master_b, self._slave_b = os.openpty()
+        self._masters = [master_a, master_b]
+        for fd in (self._slave_a, self._slave_b):
+            tty.setraw(fd)
+        for fd in self._masters:
+            os.set_blocking(fd, False)
+        rng = random.Random(seed)
+        byte_time = bits_per_byte / baudrate
+        self._a_to_b = _Direction(
+            master_a,
+            master_b,
+            byte_time,
+            self.impairment,
+            random.Random(rng.getrandbits(64)),
+        )
+        self._b_to_a = _Direction(
+            master_b,
+            master_a,
+            byte_time,
+            self.impairment,
+            random.Random(rng.getrandbits(64)),
+        )
+        self._stop = Event()
+        self._threads: List[Thread] = []
+
+    def __enter__(self) -> SimulatedSerialLink:
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    @property
+    def port_a(self) -> str:
+        """Path of one end of the link"""
+        return os.ttyname(self._slave_a)
+
+    @property
+    def port_b(self) -> str:
+        """Path of the other end of the link"""
+        return os.ttyname(self._slave_b)
+
+    @property
+    def stats_a_to_b(self) -> SimLinkStats:
+        return self._a_to_b.stats
+
+    @property
+    def stats_b_to_a(self) -> SimLinkStats:
+        return self._b_to_a.stats
+
+    def start(self) -> None:
+        """Start carrying bytes between the two ends"""
+        if self._threads:
+            return
+        for direction in (self._a_to_b, self._b_to_a):
+            t = Thread(target=self._run, args=(direction,), daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def close(self) -> None:
+        """Stop the link and close both pseudoterminals"""
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        for fd in self._masters + [self._slave_a, self._slave_b]:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._masters = []
+
+    def _run(self, direction: _Direction) -> None:
+        while not self._stop.is_set():
+            ready, _, _ = select.select([direction.src], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                data = os.read(direction.src, 4096)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return
+            direction.pump(data, self._stop)
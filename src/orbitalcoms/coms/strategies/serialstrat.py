@@ -1,47 +1,154 @@
 from __future__ import annotations
 
+import select
 import time
+from collections import deque
 from multiprocessing import Lock
+from typing import Deque, List
 
 import serial
 
 from orbitalcoms.coms.errors.errors import ComsMessageParseError
 
 from ..messages import ComsMessage, construct_message
+from .fragment import Reassembler, fragment
+from .framing import CobsFramer, Framing, LineStats
+from .ratelimit import TokenBucket, serial_bytes_per_second
 from .strategy import ComsStrategy
 
+# Seconds between checks of a port that has no file descriptor to wait on
+_POLL_INTERVAL = 0.05
+
 
 class SerialComsStrategy(ComsStrategy):
-    """Informs how to communicate over a serial port"""
+    """Informs how to communicate over a serial port
+
+    By default writes are paced to the number of bytes per second the port's
+    baudrate and framing can carry, rather than piling up in the operating
+    system's buffer where they can no longer be reordered or dropped.
+
+    If the radio has a maximum frame size, set ``mtu`` and messages too large
+    for one frame are sent as several fragments that are put back together
+    by the reader. A lost fragment only costs the message it belongs to.
+
+    With ``framing=Framing.COBS`` every frame carries a CRC and a corrupted
+    frame is dropped without losing sync. Both ends of the link must use the
+    same framing. ``line_stats`` counts dropped frames.
+    """
 
     __ENCODING = "utf-8"
 
-    def __init__(self, serial: serial.Serial) -> None:
+    def __init__(
+        self,
+        serial: serial.Serial,
+        rate_limit: bool = True,
+        burst: float | None = None,
+        mtu: int | None = None,
+        framing: Framing = Framing.CR,
+        crc_bits: int = 16,
+    ) -> None:
         """Create a new ``SerialComsStrategy`` for a provided socket
 
         :param serial: serial connection to read and write to
         :type serial: serial.Serial
+        :param rate_limit: Whether to pace writes to what the port can carry
+        :type rate_limit: bool
+        :param burst: Most bytes that may be written at once without waiting.
+            If None, half a second worth of bytes
+        :type burst: float | None
+        :param mtu: Largest frame in bytes the link can carry, including the
+            terminating carriage return. If None, messages are never split
+        :type mtu: int | None
+        :param framing: How frames are marked on the port
+        :type framing: Framing
+        :param crc_bits: Width of the CRC sent with each frame when using
+            ``Framing.COBS``, 16 or 32
+        :type crc_bits: int
         """
         self.ser = serial
         self._lock = Lock()
         if not self.ser.is_open:
             self.ser.open()
+        self.rate_limiter: TokenBucket | None = None
+        if rate_limit:
+            rate = serial_bytes_per_second(self.ser)
+            self.rate_limiter = TokenBucket(rate, burst or rate / 2)
+        self.mtu = mtu
+        self.reassembler = Reassembler()
+        self._next_id = 0
+        self.framing = framing
+        self.framer = CobsFramer(crc_bits) if framing is Framing.COBS else None
+        # Bytes of the frame that has not finished arriving
+        self._partial = b""
+        # Frames that have arrived but not yet been returned
+        self._frames: Deque[bytes] = deque()
 
     def __del__(self) -> None:
         self._shutdown()
 
     @classmethod
-    def from_args(cls, port: str, baudrate: int) -> SerialComsStrategy:
+    def from_args(
+        cls,
+        port: str,
+        baudrate: int,
+        rate_limit: bool = True,
+        framing: Framing = Framing.CR,
+    ) -> SerialComsStrategy:
         """Construct and wrap a serial connection in a ``SerialComsStrategy``
 
         :param port: Serial port on which to communitcate
         :type port: str
         :param buadrate: buadrate with which to communitcate
         :type baudrate: int
+        :param rate_limit: Whether to pace writes to what the port can carry
+        :type rate_limit: bool
+        :param framing: How frames are marked on the port
+        :type framing: Framing
         :returns: The statrategy to communicate over the new serial connection
         :rtype: SerialComsStrategy
         """
-        return cls(serial.Serial(port=port, baudrate=baudrate))
+        return cls(
+            serial.Serial(port=port, baudrate=baudrate), rate_limit, framing=framing
+        )
+
+    @property
+    def utilization(self) -> float:
+        """How full the link is. See ``TokenBucket.utilization``
+
+        :returns: Utilization of the link, or 0 if writes are not paced
+        :rtype: float
+        """
+        return 0.0 if self.rate_limiter is None else self.rate_limiter.utilization
+
+    @property
+    def line_stats(self) -> LineStats | None:
+        """Counters describing dropped frames. See ``LineStats``
+
+        :returns: Counters for the link, or None if frames carry no CRC
+        :rtype: LineStats | None
+        """
+        return None if self.framer is None else self.framer.stats
+
+    @property
+    def closed(self) -> bool:
+        """Whether the wrapped serial port has been closed
+
+        :returns: If no more messages can be read from the port
+        :rtype: bool
+        """
+        return not self.ser.is_open
+
+    def fileno(self) -> int:
+        """File descriptor of the wrapped serial port
+
+        :raises OSError: The port has no file descriptor, as on windows
+        :returns: File descriptor that becomes readable when data arrives
+        :rtype: int
+        """
+        fileno = getattr(self.ser, "fileno", None)
+        if fileno is None:
+            raise OSError("Serial port has no file descriptor")
+        return int(fileno())
 
     def read(self) -> ComsMessage:
         """Read bytes from the wrapped serial connection and attempt
@@ -50,22 +157,81 @@ class SerialComsStrategy(ComsStrategy):
         :returns: Newly read message
         :rtype: ComsMessage
         """
-        msg = ""
-        while self.ser.is_open:
-            if self.ser.in_waiting:
-                with self._lock:
-                    c = self.ser.read().decode(
+        while True:
+            m = self.poll()
+            if m is not None:
+                return m
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Read bytes waiting on the wrapped serial connection and return the
+        next message if one is completed within the timeout
+
+        Bytes of a message that has not fully arrived are kept for the next
+        poll, so the port can be polled without a timeout.
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :raises ComsMessageParseError: The port was closed before a message
+            arrived
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._frames:
+                return construct_message(
+                    self._frames.popleft().decode(
                         encoding=self.__ENCODING, errors="ignore"
                     )
-                    if c == "\r":
-                        return construct_message(msg)
-                    else:
-                        msg += c
-            else:
-                time.sleep(0.2)  # TODO: make this accessable to change by user
-        raise ComsMessageParseError(
-            "Failed to read a message before serial port was closed"
-        )
+                )
+            if not self.ser.is_open:
+                raise ComsMessageParseError(
+                    "Failed to read a message before serial port was closed"
+                )
+            waiting = self.ser.in_waiting
+            if waiting:
+                with self._lock:
+                    data = self.ser.read(waiting)
+                self._feed(data)
+                continue
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._wait_readable(remaining)
+
+    def _feed(self, data: bytes) -> None:
+        """Split bytes read from the port into frames and queue every
+        message they complete
+
+        :param data: Bytes as read from the port
+        :type data: bytes
+        """
+        if self.framer is not None:
+            payloads = self.framer.feed(data)
+        else:
+            *payloads, self._partial = (self._partial + data).split(b"\r")
+        for payload in payloads:
+            frame = self.reassembler.feed(payload)
+            if frame is not None:
+                self._frames.append(frame)
+
+    def _wait_readable(self, timeout: float | None) -> None:
+        """Wait until bytes may have arrived on the port
+
+        :param timeout: Longest time in seconds to wait. If None, wait
+            indefinitely
+        :type timeout: float | None
+        """
+        try:
+            fd = self.fileno()
+        except OSError:
+            # Without a descriptor to wait on, check the port periodically
+            time.sleep(
+                _POLL_INTERVAL if timeout is None else min(timeout, _POLL_INTERVAL)
+            )
+            return
+        select.select([fd], [], [], timeout)
 
     def write(self, m: ComsMessage) -> None:
         """Turn a ComsMessage into bytes, format them and send over the wrapped
@@ -74,10 +240,39 @@ class SerialComsStrategy(ComsStrategy):
         :param m: A message to write to the wrapped socket
         :type m: ComsMessage
         """
-        with self._lock:
-            self.ser.write(self._preprocess_write_msg(m))
-            if self.ser.out_waiting:
-                self.ser.flush()
+        payload = m.as_str.encode(encoding=self.__ENCODING)
+        if self.framer is not None:
+            frames = [self.framer.encode(f) for f in self._fragment(payload)]
+        elif self.mtu is not None:
+            frames = [f + b"\r" for f in self._fragment(payload)]
+        else:
+            frames = [self._preprocess_write_msg(m)]
+        for data in frames:
+            if self.rate_limiter is not None:
+                # Wait outside of the lock so that reading is not held up
+                self.rate_limiter.take(len(data))
+            with self._lock:
+                self.ser.write(data)
+                if self.ser.out_waiting:
+                    self.ser.flush()
+
+    def _fragment(self, payload: bytes) -> List[bytes]:
+        """Split an encoded message into payloads that fit in one frame
+
+        :param payload: Encoded message
+        :type payload: bytes
+        :returns: Payloads to frame and send in order
+        :rtype: List[bytes]
+        """
+        if self.mtu is None:
+            return [payload]
+        if self.framer is None:
+            room = self.mtu - 1
+        else:
+            room = self.framer.max_payload(self.mtu)
+        frags = fragment(payload, room, self._next_id)
+        self._next_id = (self._next_id + 1) & 0xFFFF
+        return frags
 
     @classmethod
     def _preprocess_write_msg(cls, m: ComsMessage) -> bytes:
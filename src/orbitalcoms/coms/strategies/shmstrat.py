@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import enum
+import os
+import select
+import struct
+import tempfile
+import time
+import uuid
+from typing import TYPE_CHECKING, Set, Tuple
+
+from ..errors.errors import ComsDriverWriteError, ComsMessageParseError
+from ..messages.message import ComsMessage, construct_message
+from .strategy import PollableComsStrategy
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+_MAGIC = 0x4F434D53  # "OCMS"
+_SEGMENT_HEADER = struct.Struct("<IIII")  # magic, version, slots, slot_size
+_SEGMENT_HEADER_SIZE = 64
+_U64 = struct.Struct("<Q")
+_SLOT_HEADER = struct.Struct("<QI4x")  # sequence, payload length
+# head and tail sit on their own cache lines so that the producer and consumer
+# do not invalidate each other's cache every time they update their index
+_RING_HEADER_SIZE = 128
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 64
+_ENCODING = "utf-8"
+_HAS_WAKEUP = hasattr(os, "mkfifo")
+# Segments created by this process, or the process it was forked from
+_created: Set[str] = set()
+
+
+class OverflowPolicy(enum.Enum):
+    """What a ``SharedMemoryComsStrategy`` should do when writing to a full ring"""
+
+    #: Wait for the reader to make space
+    BLOCK = "block"
+    #: Overwrite the oldest unread message
+    DROP_OLDEST = "drop-oldest"
+    #: Discard the message being written
+    DROP_NEWEST = "drop-newest"
+
+
+class _Ring:
+    """Single producer, single consumer ring of fixed size slots in shared memory
+
+    Each slot is stamped with a sequence number derived from the position it
+    was written at. The stamp is odd while the producer is writing to the
+    slot and even once it is complete, which allows the consumer to detect
+    a slot that has been overwritten under it without any locking.
+    """
+
+    def __init__(self, buf: memoryview, slots: int, slot_size: int) -> None:
+        self._buf = buf
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_payload = slot_size - _SLOT_HEADER.size
+
+    @classmethod
+    def size_for(cls, slots: int, slot_size: int) -> int:
+        return _RING_HEADER_SIZE + slots * slot_size
+
+    @property
+    def head(self) -> int:
+        return int(_U64.unpack_from(self._buf, _HEAD_OFFSET)[0])
+
+    @property
+    def tail(self) -> int:
+        return int(_U64.unpack_from(self._buf, _TAIL_OFFSET)[0])
+
+    def _slot_offset(self, pos: int) -> int:
+        return _RING_HEADER_SIZE + (pos % self.slots) * self.slot_size
+
+    def put(self, payload: bytes) -> None:
+        pos = self.head
+        offset = self._slot_offset(pos)
+        _U64.pack_into(self._buf, offset, 2 * pos + 1)
+        start = offset + _SLOT_HEADER.size
+        end = start + len(payload)
+        self._buf[start:end] = payload
+        _SLOT_HEADER.pack_into(self._buf, offset, 2 * pos + 2, len(payload))
+        _U64.pack_into(self._buf, _HEAD_OFFSET, pos + 1)
+
+    def get(self) -> Tuple[bytes | None, int]:
+        """Take the next complete payload out of the ring
+
+        :returns: The payload, or None if the ring is empty, and the number of
+            messages that were overwritten before they could be read
+        :rtype: Tuple[bytes | None, int]
+        """
+        lost = 0
+        pos = self.tail
+        while True:
+            head = self.head
+            if head == pos:
+                return None, lost
+            if head - pos > self.slots:
+                lost += head - pos - self.slots
+                pos = head - self.slots
+            offset = self._slot_offset(pos)
+            seq, length = _SLOT_HEADER.unpack_from(self._buf, offset)
+            if seq == 2 * pos + 2:
+                start = offset + _SLOT_HEADER.size
+                end = start + length
+                payload = bytes(self._buf[start:end])
+                if _U64.unpack_from(self._buf, offset)[0] == seq:
+                    _U64.pack_into(self._buf, _TAIL_OFFSET, pos + 1)
+                    return payload, lost
+            # The producer lapped us while we were reading this slot
+            lost += 1
+            pos += 1
+            _U64.pack_into(self._buf, _TAIL_OFFSET, pos)
+
+    def release(self) -> None:
+        self._buf.release()
+
+
+class SharedMemoryComsStrategy(PollableComsStrategy):
+    """Informs how to communicate with a process on the same machine
+    through shared memory
+
+    A shared memory link is made of two rings, one for each direction. One
+    side of the link creates the shared memory segment with ``create`` and
+    the other side attaches to it by name with ``attach``. Each ring must
+    only ever have one writer and one reader.
+
+    Where the platform supports it, named pipes are used to wake a reader
+    waiting for new messages. Otherwise the reader polls the ring.
+    """
+
+    def __init__(
+        self,
+        shm: SharedMemory,
+        tx: _Ring,
+        rx: _Ring,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        owner: bool = False,
+        tx_wake: str | None = None,
+        rx_wake: str | None = None,
+        write_timeout: float | None = None,
+    ) -> None:
+        """Create a new ``SharedMemoryComsStrategy``. Prefer using ``create``
+        and ``attach`` over calling this directly.
+
+        :param shm: Shared memory segment containing the rings
+        :type shm: SharedMemory
+        :param tx: Ring to write messages to
+        :type tx: _Ring
+        :param rx: Ring to read messages from
+        :type rx: _Ring
+        :param overflow: What to do when writing to a full ring
+        :type overflow: OverflowPolicy
+        :param owner: Whether this strategy should remove the segment on close
+        :type owner: bool
+        :param tx_wake: Path to the named pipe used to wake the peer
+        :type tx_wake: str | None
+        :param rx_wake: Path to the named pipe the peer uses to wake us
+        :type rx_wake: str | None
+        :param write_timeout: Longest time in seconds to block on a full ring
+            before giving up. If None, wait indefinitely
+        :type write_timeout: float | None
+        """
+        self._closed = True
+        self._shm = shm
+        self._tx = tx
+        self._rx = rx
+        self.overflow = overflow
+        self.write_timeout = write_timeout
+        self._owner = owner
+        self._wake_paths = (tx_wake, rx_wake)
+        self._tx_fd = _open_wake(tx_wake)
+        self._rx_fd = _open_wake(rx_wake)
+        self.overruns = 0
+        self.rejected = 0
+        self._closed = False
+
+    def __del__(self) -> None:
+        self.close()
+
+    @classmethod
+    def create(
+        cls,
+        name: str | None = None,
+        slots: int = 256,
+        slot_size: int = 4096,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        write_timeout: float | None = None,
+    ) -> SharedMemoryComsStrategy:
+        """Create a new shared memory link and return the creator's end of it
+
+        :param name: Name of the shared memory segment. If None, a unique
+            name is generated and can be read from the ``name`` property
+        :type name: str | None
+        :param slots: Number of messages each ring can hold
+        :type slots: int
+        :param slot_size: Size in bytes of each slot, limiting message size
+        :type slot_size: int
+        :param overflow: What to do when writing to a full ring
+        :type overflow: OverflowPolicy
+        :param write_timeout: Longest time in seconds to block on a full ring
+        :type write_timeout: float | None
+        :returns: The creating end of the link
+        :rtype: SharedMemoryComsStrategy
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        if slots < 1 or slot_size <= _SLOT_HEADER.size:
+            raise ValueError("Shared memory rings need at least one usable slot")
+        if name is None:
+            name = f"orbitalcoms-{uuid.uuid4().hex[:12]}"
+        ring_size = _Ring.size_for(slots, slot_size)
+        shm = SharedMemory(
+            name=name, create=True, size=_SEGMENT_HEADER_SIZE + 2 * ring_size
+        )
+        _created.add(name)
+        buf = _buffer(shm)
+        buf[: _SEGMENT_HEADER_SIZE + 2 * _RING_HEADER_SIZE] = bytes(
+            _SEGMENT_HEADER_SIZE + 2 * _RING_HEADER_SIZE
+        )
+        _SEGMENT_HEADER.pack_into(buf, 0, _MAGIC, 1, slots, slot_size)
+        a2b, b2a = _make_rings(shm, slots, slot_size)
+        a2b_wake, b2a_wake = _wake_paths(name)
+        if _HAS_WAKEUP:
+            for path in (a2b_wake, b2a_wake):
+                if os.path.exists(path):
+                    os.unlink(path)
+                os.mkfifo(path, 0o600)
+        return cls(
+            shm,
+            tx=a2b,
+            rx=b2a,
+            overflow=overflow,
+            owner=True,
+            tx_wake=a2b_wake if _HAS_WAKEUP else None,
+            rx_wake=b2a_wake if _HAS_WAKEUP else None,
+            write_timeout=write_timeout,
+        )
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        write_timeout: float | None = None,
+    ) -> SharedMemoryComsStrategy:
+        """Attach to a shared memory link made by ``create`` in another process
+
+        :param name: Name of the shared memory segment
+        :type name: str
+        :param overflow: What to do when writing to a full ring
+        :type overflow: OverflowPolicy
+        :param write_timeout: Longest time in seconds to block on a full ring
+        :type write_timeout: float | None
+        :returns: The attaching end of the link
+        :rtype: SharedMemoryComsStrategy
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        shm = SharedMemory(name=name)
+        if name not in _created:
+            _untrack(shm)
+        magic, _, slots, slot_size = _SEGMENT_HEADER.unpack_from(_buffer(shm), 0)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory segment '{name}' is not a coms link")
+        a2b, b2a = _make_rings(shm, slots, slot_size)
+        a2b_wake, b2a_wake = _wake_paths(name)
+        has_wake = _HAS_WAKEUP and os.path.exists(a2b_wake)
+        return cls(
+            shm,
+            tx=b2a,
+            rx=a2b,
+            overflow=overflow,
+            tx_wake=b2a_wake if has_wake else None,
+            rx_wake=a2b_wake if has_wake else None,
+            write_timeout=write_timeout,
+        )
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory segment, used to ``attach`` to the link
+
+        :returns: Name of the segment
+        :rtype: str
+        """
+        return str(self._shm.name)
+
+    def fileno(self) -> int:
+        """File descriptor that becomes readable when the peer writes a message
+
+        :raises OSError: The platform does not support wakeups
+        :returns: File descriptor to wait on
+        :rtype: int
+        """
+        if self._rx_fd is None:
+            raise OSError("Shared memory link has no wakeup descriptor")
+        return self._rx_fd
+
+    def read(self) -> ComsMessage:
+        """Wait for and return the next message written by the peer
+
+        :returns: Newly read message
+        :rtype: ComsMessage
+        """
+        while True:
+            m = self.poll()
+            if m is not None:
+                return m
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message written by the peer if one
+        arrives within the timeout
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Clear wakeups before checking the ring so that one for a
+            # message written after the check is never lost
+            self._drain_wakeups()
+            payload, lost = self._rx.get()
+            self.overruns += lost
+            if payload is not None:
+                try:
+                    return construct_message(payload.decode(encoding=_ENCODING))
+                except UnicodeDecodeError as e:
+                    raise ComsMessageParseError("Received malformed frame") from e
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._wait(remaining)
+
+    def write(self, m: ComsMessage) -> None:
+        """Encode a ComsMessage and place it in the peer's ring
+
+        :param m: A message to write to the peer
+        :type m: ComsMessage
+        :raises ComsDriverWriteError: The message does not fit in a slot or the
+            ring stayed full for longer than the write timeout
+        """
+        payload = m.as_str.encode(encoding=_ENCODING)
+        if len(payload) > self._tx.max_payload:
+            raise ComsDriverWriteError(
+                f"Message of {len(payload)} bytes does not fit in a "
+                f"{self._tx.max_payload} byte slot"
+            )
+        if self._tx.head - self._tx.tail >= self._tx.slots:
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self.rejected += 1
+                return
+            if self.overflow is OverflowPolicy.BLOCK:
+                self._wait_for_space()
+        self._tx.put(payload)
+        if self._tx_fd is not None:
+            try:
+                os.write(self._tx_fd, b"\0")
+            except BlockingIOError:
+                pass  # The pipe is full so the reader is already awake
+
+    def close(self) -> None:
+        """Detach from the shared memory link. If this end created the link,
+        the shared memory segment is also removed
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for fd in (self._tx_fd, self._rx_fd):
+            if fd is not None:
+                os.close(fd)
+        self._tx.release()
+        self._rx.release()
+        self._shm.close()
+        if self._owner:
+            _created.discard(self.name)
+            self._shm.unlink()
+            for path in self._wake_paths:
+                if path is not None and os.path.exists(path):
+                    os.unlink(path)
+
+    def _wait(self, timeout: float | None) -> None:
+        if self._rx_fd is None:
+            time.sleep(0.001 if timeout is None else min(timeout, 0.001))
+            return
+        select.select([self._rx_fd], [], [], timeout)
+
+    def _drain_wakeups(self) -> None:
+        if self._rx_fd is None:
+            return
+        try:
+            while os.read(self._rx_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wait_for_space(self) -> None:
+        deadline = (
+            None
+            if self.write_timeout is None
+            else time.monotonic() + self.write_timeout
+        )
+        while self._tx.head - self._tx.tail >= self._tx.slots:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ComsDriverWriteError("Timed out waiting for space in ring")
+            time.sleep(0.0001)
+
+
+def _make_rings(shm: SharedMemory, slots: int, slot_size: int) -> Tuple[_Ring, _Ring]:
+    ring_size = _Ring.size_for(slots, slot_size)
+    a2b_start = _SEGMENT_HEADER_SIZE
+    b2a_start = a2b_start + ring_size
+    b2a_end = b2a_start + ring_size
+    buf = _buffer(shm)
+    return (
+        _Ring(buf[a2b_start:b2a_start], slots, slot_size),
+        _Ring(buf[b2a_start:b2a_end], slots, slot_size),
+    )
+
+
+def _buffer(shm: SharedMemory) -> memoryview:
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"Shared memory segment '{shm.name}' has been closed")
+    return buf
+
+
+def _wake_paths(name: str) -> Tuple[str, str]:
+    base = os.path.join(tempfile.gettempdir(), name.lstrip("/"))
+    return f"{base}.a2b", f"{base}.b2a"
+
+
+def _open_wake(path: str | None) -> int | None:
+    if path is None:
+        return None
+    # Opening read/write means neither end blocks waiting for the other to open
+    return os.open(path, os.O_RDWR | os.O_NONBLOCK)
+
+
+def _untrack(shm: SharedMemory) -> None:
+    """Stop the resource tracker of an attaching process from removing a
+    segment it did not create when that process exits
+    """
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
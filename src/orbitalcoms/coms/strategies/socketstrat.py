@@ -1,30 +1,229 @@
 from __future__ import annotations
 
+import os
+import select
 import socket
+import stat
+import time
+from collections import deque
+from typing import Deque, List, Tuple, Type, TypeVar
 
 from ..errors.errors import ComsDriverReadError, ComsDriverWriteError
 from ..messages.message import ComsMessage, construct_message
-from .strategy import ComsStrategy
+from .strategy import PollableComsStrategy
 
+_TSocketStrat = TypeVar("_TSocketStrat", bound="_BaseSocketComsStrategy")
 
-class SocketComsStrategy(ComsStrategy):
-    """Informs how to communicate over a socket"""
+# Size of the ascii length header put in front of every message on a stream
+FRAME_HEADER_SIZE = 64
+# Most bytes read from a stream socket at once
+_RECV_SIZE = 4096
+_FRAME_ENCODING = "utf-8"
+
+
+def encode_frame(m: ComsMessage) -> bytes:
+    """Encode a message as it is sent over a stream by ``SocketComsStrategy``
+
+    :param m: A message to encode
+    :type m: ComsMessage
+    :raises ComsDriverWriteError: The message is too long to fit its length
+        in the header
+    :returns: Header and message bytes
+    :rtype: bytes
+    """
+    msg = m.as_str.encode(encoding=_FRAME_ENCODING)
+    header = str(len(msg)).encode(_FRAME_ENCODING)
+    if len(header) > FRAME_HEADER_SIZE:
+        raise ComsDriverWriteError("Message too long to generate header")
+    return header.ljust(FRAME_HEADER_SIZE) + msg
+
+
+class FrameDecoder:
+    """Incrementally splits bytes read from a non-blocking stream into
+    the messages encoded by ``encode_frame``
+    """
+
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        """Create a new ``FrameDecoder``
+
+        :param max_size: Largest message in bytes that will be accepted
+        :type max_size: int
+        """
+        self.max_size = max_size
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> List[ComsMessage]:
+        """Add bytes read from the stream and return any messages completed
 
-    __HEADER = 64
-    __ENCODING = "utf-8"
+        :param data: Bytes read from the stream
+        :type data: bytes
+        :raises ComsDriverReadError: The stream does not contain valid frames
+        :raises ComsMessageParseError: A frame does not hold a valid message
+        :returns: Messages completed by the new bytes, oldest first
+        :rtype: List[ComsMessage]
+        """
+        self._buf += data
+        messages = []
+        while len(self._buf) >= FRAME_HEADER_SIZE:
+            head = bytes(self._buf[:FRAME_HEADER_SIZE])
+            try:
+                size = int(head)
+            except ValueError:
+                raise ComsDriverReadError(f"Invalid header received: '{head!r}'")
+            if not 0 <= size <= self.max_size:
+                raise ComsDriverReadError(f"Invalid message size received: {size}")
+            end = FRAME_HEADER_SIZE + size
+            if len(self._buf) < end:
+                break
+            payload = bytes(self._buf[FRAME_HEADER_SIZE:end])
+            del self._buf[:end]
+            messages.append(construct_message(payload.decode(_FRAME_ENCODING)))
+        return messages
+
+
+class _BaseSocketComsStrategy(PollableComsStrategy):
+    """Socket handling shared by the stream and sequenced packet strategies
+
+    Subclasses decide how messages are read from and written to the socket.
+    """
+
+    # Type of socket used by the unix domain socket constructors
+    _UNIX_SOCK_TYPE = socket.SOCK_STREAM
 
     def __init__(self, socket: socket.socket) -> None:
-        """Create a new ``SocketComsStrategy`` for a provided socket
+        """Create a new strategy for a provided socket
 
         :param socket: Socket to read and write to
         :type socket: socket.socket
         """
         self.sock = socket
+        # Set once the peer has closed the connection
+        self._peer_closed = False
+
+    @classmethod
+    def accept_unix_connection_at(cls: Type[_TSocketStrat], path: str) -> _TSocketStrat:
+        """Create a unix domain socket at a path on the file system and wait
+        for a connection to communicate over
+
+        A stale socket left at the path by a previous run is replaced. The
+        socket file is removed once a connection has been accepted.
+
+        :param path: File system path to accept a connection at
+        :type path: str
+        :returns: A strategy to communicate over the newly made socket
+        :rtype: _BaseSocketComsStrategy
+        """
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        with socket.socket(socket.AF_UNIX, cls._UNIX_SOCK_TYPE) as server:
+            server.bind(path)
+            try:
+                server.listen(0)
+                conn, _ = server.accept()
+            finally:
+                os.unlink(path)
+        return cls(conn)
+
+    @classmethod
+    def connect_to_unix(cls: Type[_TSocketStrat], path: str) -> _TSocketStrat:
+        """Create a unix domain socket and attempt to connect to a peer
+        listening at a path on the file system
+
+        :param path: File system path to connect to
+        :type path: str
+        :returns: A strategy to communicate over the newly made socket
+        :rtype: _BaseSocketComsStrategy
+        """
+        sock = socket.socket(socket.AF_UNIX, cls._UNIX_SOCK_TYPE)
+        sock.connect(path)
+        return cls(sock)
+
+    @classmethod
+    def socketpair(
+        cls: Type[_TSocketStrat],
+    ) -> Tuple[_TSocketStrat, _TSocketStrat]:
+        """Create two strategies connected to each other through a pair of
+        unnamed sockets. Mostly useful for testing.
+
+        :returns: Connected strategies
+        :rtype: Tuple[_BaseSocketComsStrategy, _BaseSocketComsStrategy]
+        """
+        if hasattr(socket, "AF_UNIX"):
+            a, b = socket.socketpair(socket.AF_UNIX, cls._UNIX_SOCK_TYPE)
+        else:
+            a, b = socket.socketpair()
+        return cls(a), cls(b)
+
+    def fileno(self) -> int:
+        """File descriptor of the wrapped socket
+
+        :returns: File descriptor that becomes readable when data arrives
+        :rtype: int
+        """
+        return self.sock.fileno()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the wrapped socket has been closed, by either end
+
+        :returns: If no more messages can be read from the socket
+        :rtype: bool
+        """
+        return self._peer_closed or self.sock.fileno() < 0
+
+    def _recv(self, size: int) -> bytes:
+        """Receive bytes from the wrapped socket
+
+        :param size: Most bytes to receive
+        :type size: int
+        :raises ComsDriverReadError: The peer closed the connection
+        :returns: The received bytes
+        :rtype: bytes
+        """
+        try:
+            data = self.sock.recv(size)
+        except ConnectionError:
+            self._peer_closed = True
+            raise
+        if not data:
+            self._peer_closed = True
+            raise ComsDriverReadError("Connection closed by peer")
+        return data
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for data to arrive on the wrapped socket and read a message
+        if it arrives within the timeout
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return None
+        return self.read()
+
+
+class SocketComsStrategy(_BaseSocketComsStrategy):
+    """Informs how to communicate over a socket"""
+
+    def __init__(self, socket: socket.socket) -> None:
+        """Create a new ``SocketComsStrategy`` for a provided socket
+
+        :param socket: Stream socket to read and write to
+        :type socket: socket.socket
+        """
+        super().__init__(socket)
+        self._decoder = FrameDecoder()
+        # Messages that have arrived but not yet been returned
+        self._messages: Deque[ComsMessage] = deque()
 
     @classmethod
     def accept_connection_at(
-        cls, host: str = "", port: int = 5000
-    ) -> SocketComsStrategy:
+        cls: Type[_TSocketStrat], host: str = "", port: int = 5000
+    ) -> _TSocketStrat:
         """Create a socket and wait for a connection to communicate over
 
         :param host: IP address to accept a connection at
@@ -41,7 +240,9 @@ class SocketComsStrategy(ComsStrategy):
         return cls(conn)
 
     @classmethod
-    def connect_to(cls, host: str = "", port: int = 5000) -> SocketComsStrategy:
+    def connect_to(
+        cls: Type[_TSocketStrat], host: str = "", port: int = 5000
+    ) -> _TSocketStrat:
         """Create a socket and attempt to connect to peer to communicate with
 
         :param host: IP address to connect to
@@ -58,16 +259,39 @@ class SocketComsStrategy(ComsStrategy):
     def read(self) -> ComsMessage:
         """Read bytes from the wrapped socket and attempt to construct a message
 
+        :raises ComsDriverReadError: The peer closed the connection or sent
+            an invalid frame
         :returns: Newly read message
         :rtype: ComsMessage
         """
-        head = self.sock.recv(self.__HEADER).decode(encoding=self.__ENCODING)
-        if not head:
-            # FIXME: Need a more appropriate error here
-            raise ComsDriverReadError(f"Invalid header received: '{head}'")
-        return construct_message(
-            self.sock.recv(int(head)).decode(encoding=self.__ENCODING)
-        )
+        while not self._messages:
+            self._messages.extend(self._decoder.feed(self._recv(_RECV_SIZE)))
+        return self._messages.popleft()
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Read the bytes waiting on the wrapped socket and return the next
+        message if one is completed within the timeout
+
+        Bytes of a message that has not fully arrived are kept for the next
+        poll, so a peer that stops part way through a message does not block
+        the caller.
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :raises ComsDriverReadError: The peer closed the connection or sent
+            an invalid frame
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._messages:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            readable, _, _ = select.select([self.sock], [], [], wait)
+            if not readable:
+                return None
+            self._messages.extend(self._decoder.feed(self._recv(_RECV_SIZE)))
+        return self._messages.popleft()
 
     def write(self, m: ComsMessage) -> None:
         """Turn a ComsMessage into bytes, construct a valid header and send over socket
@@ -75,10 +299,47 @@ class SocketComsStrategy(ComsStrategy):
         :param m: A message to write to the wrapped socket
         :type m: ComsMessage
         """
-        msg = m.as_str.encode(encoding=self.__ENCODING)
-        header = str(len(msg)).encode(self.__ENCODING)
-        if len(header) > self.__HEADER:
-            raise ComsDriverWriteError("Message too long to generate header")
-        header += b" " * (self.__HEADER - len(header))
-        self.sock.send(header)
+        self.sock.sendall(encode_frame(m))
+
+
+class SeqPacketComsStrategy(_BaseSocketComsStrategy):
+    """Informs how to communicate over a unix domain ``SOCK_SEQPACKET`` socket
+
+    Sequenced packet sockets keep message boundaries, so every message is
+    sent as exactly one packet with no header. They only exist in the unix
+    domain, so unlike ``SocketComsStrategy`` there are no constructors for
+    network connections.
+    """
+
+    _UNIX_SOCK_TYPE = socket.SOCK_SEQPACKET
+
+    def __init__(self, socket: socket.socket, max_size: int = 65536) -> None:
+        """Create a new ``SeqPacketComsStrategy`` for a provided socket
+
+        :param socket: Sequenced packet socket to read and write to
+        :type socket: socket.socket
+        :param max_size: Largest packet in bytes that can be received
+        :type max_size: int
+        """
+        super().__init__(socket)
+        self.max_size = max_size
+
+    def read(self) -> ComsMessage:
+        """Read a packet from the wrapped socket and attempt to construct a message
+
+        :returns: Newly read message
+        :rtype: ComsMessage
+        """
+        packet = self._recv(self.max_size)
+        return construct_message(packet.decode(encoding=_FRAME_ENCODING))
+
+    def write(self, m: ComsMessage) -> None:
+        """Turn a ComsMessage into bytes and send it as a single packet
+
+        :param m: A message to write to the wrapped socket
+        :type m: ComsMessage
+        """
+        msg = m.as_str.encode(encoding=_FRAME_ENCODING)
+        if len(msg) > self.max_size:
+            raise ComsDriverWriteError("Message too long to send in one packet")
         self.sock.send(msg)
@@ -1,9 +1,15 @@
+from __future__ import annotations
+
 from abc import abstractmethod
+from typing import TYPE_CHECKING
 
-from typing_extensions import Protocol
+from typing_extensions import Protocol, runtime_checkable
 
 from ..messages.message import ComsMessage
 
+if TYPE_CHECKING:
+    from .ratelimit import TokenBucket
+
 
 class ComsStrategy(Protocol):
     """Protocol that informs how to read and write ``ComsMessages``
@@ -32,3 +38,48 @@ class ComsStrategy(Protocol):
         :type m: ComsMessage
         """
         ...
+
+
+@runtime_checkable
+class PollableComsStrategy(ComsStrategy, Protocol):
+    """Protocol for a ``ComsStrategy`` that can give up waiting for a message
+
+    Because a pollable strategy never blocks indefinitely, a ``ComsDriver``
+    can read from it in a thread that is able to check whether it has been
+    asked to stop, rather than in a separate process that must be killed.
+    This also means that any state kept by the strategy while reading
+    (buffers, counters, etc.) lives in the same process as the driver.
+    """
+
+    @abstractmethod
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next ``ComsMessage`` if one arrives within
+        the timeout.
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        ...
+
+
+@runtime_checkable
+class RateLimitedComsStrategy(ComsStrategy, Protocol):
+    """Protocol for a ``ComsStrategy`` whose writes are paced to what the
+    link can carry
+
+    Stations use the rate limiter to avoid queueing resends on a link that
+    is already saturated.
+    """
+
+    @property
+    @abstractmethod
+    def rate_limiter(self) -> TokenBucket | None:
+        """The rate limiter writes wait on, if any
+
+        :returns: Rate limiter of the link
+        :rtype: TokenBucket | None
+        """
+        ...
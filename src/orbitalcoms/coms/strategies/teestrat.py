@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from typing import Tuple
+
+from ..._utils import log
+from ..messages import ComsMessage
+from .strategy import ComsStrategy
+from .wrapperstrat import WrappedComsStrategy
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+
+class TeeComsStrategy(WrappedComsStrategy):
+    """Reads from one strategy and writes to it and any number of mirrors
+
+    This allows a station to keep its usual link while also copying every
+    message it sends somewhere else. For example, a Launch Station can talk
+    to the Ground Station over a socket while publishing its telemetry to
+    read-only consoles over multicast:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        LaunchStation(
+            ComsDriver(
+                TeeComsStrategy(
+                    SocketComsStrategy.accept_connection_at(host, port),
+                    MulticastPublishStrategy.create(),
+                )
+            )
+        )
+
+    A mirror failing to write is logged and counted in ``mirror_errors`` but
+    does not prevent the message being written to the primary strategy.
+    """
+
+    def __init__(self, primary: ComsStrategy, *mirrors: ComsStrategy) -> None:
+        """Create a new ``TeeComsStrategy``
+
+        :param primary: Strategy to read messages from and write messages to
+        :type primary: ComsStrategy
+        :param mirrors: Strategies that should receive a copy of every
+            written message
+        :type mirrors: ComsStrategy
+        """
+        super().__init__(primary)
+        self.mirrors: Tuple[ComsStrategy, ...] = mirrors
+        self.mirror_errors = 0
+
+    def write(self, m: ComsMessage) -> None:
+        """Write a message to the primary strategy and all mirrors
+
+        :param m: A message to write
+        :type m: ComsMessage
+        """
+        self.inner.write(m)
+        for mirror in self.mirrors:
+            try:
+                mirror.write(m)
+            except Exception:
+                self.mirror_errors += 1
+                logger.error(f"Failed to write to mirror: {traceback.format_exc()}")
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import random
+import select
+import socket
+import struct
+import time
+from typing import Tuple
+
+from attrs import define
+
+from ..errors.errors import ComsDriverWriteError, ComsMessageParseError
+from ..messages.message import ComsMessage, construct_message
+from .fragment import Reassembler, fragment
+from .strategy import PollableComsStrategy
+
+# magic, session, sequence number, send timestamp
+_HEADER = struct.Struct("!2sIQd")
+_MAGIC = b"OC"
+_MAX_DATAGRAM = 65507
+# Number of sequence numbers behind the newest that are remembered in order
+# to tell duplicates apart from late frames
+_WINDOW = 1024
+_WINDOW_MASK = (1 << _WINDOW) - 1
+
+Address = Tuple[str, int]
+
+
+@define
+class UdpLinkStats:
+    """Counters describing the quality of a datagram link"""
+
+    #: Datagrams sent
+    sent: int = 0
+    #: Datagrams received carrying a message
+    received: int = 0
+    #: Messages returned to the reader
+    delivered: int = 0
+    #: Sequence numbers that were skipped and have not arrived since
+    lost: int = 0
+    #: Datagrams that arrived after a newer datagram
+    reordered: int = 0
+    #: Datagrams that were received more than once
+    duplicates: int = 0
+    #: Datagrams discarded because a newer message was already delivered
+    #: or because they were older than the maximum age
+    stale: int = 0
+    #: Datagrams that could not be parsed
+    malformed: int = 0
+
+    @property
+    def loss_rate(self) -> float:
+        """Fraction of sent datagrams that were never received
+
+        :returns: Loss between 0 and 1
+        :rtype: float
+        """
+        expected = self.received - self.duplicates + self.lost
+        return self.lost / expected if expected else 0.0
+
+
+class UdpComsStrategy(PollableComsStrategy):
+    """Informs how to communicate over UDP
+
+    Every message is sent as a single datagram tagged with a sequence number
+    and the time it was sent. Datagrams can be lost, duplicated or arrive out
+    of order, and because every message carries the complete mission state,
+    the receiver only ever delivers messages newer than the last one it
+    delivered. Anything older is discarded rather than delivered late.
+    Lost, reordered, duplicate and stale datagrams are counted in ``stats``.
+
+    If ``mtu`` is set, messages that do not fit in a datagram of that size
+    are split into fragments that share the message's sequence number and
+    are put back together before the message is considered for delivery.
+    """
+
+    __ENCODING = "utf-8"
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        peer: Address | None = None,
+        max_age: float | None = None,
+        mtu: int | None = None,
+    ) -> None:
+        """Create a new ``UdpComsStrategy`` for a provided socket
+
+        :param sock: Datagram socket to read and write to
+        :type sock: socket.socket
+        :param peer: Address to send messages to. If None, messages are sent
+            to the first address a valid datagram arrives from, and later to
+            whoever greets this socket with ``hello`` from a new session
+        :type peer: Tuple[str, int] | None
+        :param max_age: Discard messages sent longer than this many seconds
+            ago. Only meaningful if both ends have synchronized clocks
+        :type max_age: float | None
+        :param mtu: Largest datagram in bytes to send, including all headers.
+            If None, every message is sent in a single datagram
+        :type mtu: int | None
+        """
+        self.sock = sock
+        self.peer = peer
+        # Only a peer that was not given up front is learned from datagrams
+        self._learn = peer is None
+        self.max_age = max_age
+        self.mtu = mtu
+        self.stats = UdpLinkStats()
+        self.reassembler = Reassembler()
+        self._session = random.getrandbits(32)
+        self._next_seq = 0
+        self._peer_session: int | None = None
+        self._highest = 0
+        self._seen = 0
+
+    @classmethod
+    def bind_to(
+        cls, host: str = "", port: int = 5000, peer: Address | None = None
+    ) -> UdpComsStrategy:
+        """Create a UDP socket bound to a local address
+
+        :param host: IP address to receive datagrams at
+        :type host: str
+        :param port: port to receive datagrams at
+        :type port: int
+        :param peer: Address to send messages to. If None, it is learned
+            from the datagrams received, see ``__init__``
+        :type peer: Tuple[str, int] | None
+        :returns: A strategy to communicate over the newly made socket
+        :rtype: UdpComsStrategy
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        return cls(sock, peer=peer)
+
+    @classmethod
+    def connect_to(cls, host: str = "", port: int = 5000) -> UdpComsStrategy:
+        """Create a UDP socket that sends to a peer bound at an address
+
+        An empty datagram is sent straight away so that a peer created with
+        ``bind_to`` learns where to send its messages.
+
+        :param host: IP address of the peer
+        :type host: str
+        :param port: port of the peer
+        :type port: int
+        :returns: A strategy to communicate over the newly made socket
+        :rtype: UdpComsStrategy
+        """
+        strat = cls(socket.socket(socket.AF_INET, socket.SOCK_DGRAM), peer=(host, port))
+        strat.hello()
+        return strat
+
+    def fileno(self) -> int:
+        """File descriptor of the wrapped socket
+
+        :returns: File descriptor that becomes readable when data arrives
+        :rtype: int
+        """
+        return self.sock.fileno()
+
+    def hello(self) -> None:
+        """Send a datagram carrying no message so that the peer learns
+        this socket's address
+        """
+        self._send(b"")
+
+    def read(self) -> ComsMessage:
+        """Wait for and return the next message newer than any already read
+
+        :returns: Newly read message
+        :rtype: ComsMessage
+        """
+        while True:
+            m = self.poll()
+            if m is not None:
+                return m
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message newer than any already read,
+        if one arrives within the timeout
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                return None
+            datagram, addr = self.sock.recvfrom(_MAX_DATAGRAM)
+            m = self._receive(datagram, addr)
+            if m is not None:
+                self.stats.delivered += 1
+                return m
+
+    def write(self, m: ComsMessage) -> None:
+        """Turn a ComsMessage into a datagram and send it to the peer
+
+        :param m: A message to send
+        :type m: ComsMessage
+        :raises ComsDriverWriteError: The message is too large for a datagram
+            or there is no known peer to send it to
+        """
+        self._send(m.as_str.encode(encoding=self.__ENCODING))
+
+    def _send(self, payload: bytes) -> None:
+        if self.peer is None:
+            raise ComsDriverWriteError("No peer to send datagram to")
+        fragments = [payload]
+        if self.mtu is not None and payload:
+            try:
+                fragments = fragment(
+                    payload, self.mtu - _HEADER.size, self._next_seq & 0xFFFF
+                )
+            except ValueError as e:
+                raise ComsDriverWriteError(str(e)) from e
+        elif len(payload) + _HEADER.size > _MAX_DATAGRAM:
+            raise ComsDriverWriteError("Message too long to send in one datagram")
+        header = _HEADER.pack(_MAGIC, self._session, self._next_seq, time.time())
+        for f in fragments:
+            self.sock.sendto(header + f, self.peer)
+        if payload:
+            self._next_seq += 1
+            self.stats.sent += 1
+
+    def _receive(self, datagram: bytes, addr: Address) -> ComsMessage | None:
+        """Unpack a datagram and decide whether it should be delivered
+
+        :param datagram: Datagram as received from the socket
+        :type datagram: bytes
+        :param addr: Address the datagram was sent from
+        :type addr: Tuple[str, int]
+        :returns: The message to deliver or None if it should be discarded
+        :rtype: ComsMessage | None
+        """
+        header_size = _HEADER.size
+        if len(datagram) < header_size:
+            self.stats.malformed += 1
+            return None
+        magic, session, seq, sent_at = _HEADER.unpack_from(datagram)
+        if magic != _MAGIC:
+            self.stats.malformed += 1
+            return None
+        self._learn_peer(addr, session, len(datagram) == header_size)
+        payload = self.reassembler.feed(datagram[header_size:], source=session)
+        if not payload:
+            return None
+        self.stats.received += 1
+        if not self._is_newest(session, seq):
+            return None
+        if self.max_age is not None and time.time() - sent_at > self.max_age:
+            self.stats.stale += 1
+            return None
+        try:
+            return construct_message(payload.decode(encoding=self.__ENCODING))
+        except (ComsMessageParseError, TypeError, UnicodeDecodeError):
+            self.stats.malformed += 1
+            return None
+
+    def _learn_peer(self, addr: Address, session: int, hello: bool) -> None:
+        """Decide whether to send to the sender of a valid datagram
+
+        The first sender is kept, so a stray datagram cannot redirect the
+        messages sent. Only a ``hello`` from a new session, as sent by a peer
+        that has restarted, replaces it.
+
+        :param addr: Address the datagram was sent from
+        :type addr: Tuple[str, int]
+        :param session: Random id of the sender
+        :type session: int
+        :param hello: Whether the datagram is a ``hello``
+        :type hello: bool
+        """
+        if not self._learn or addr == self.peer:
+            return
+        if self.peer is None or (hello and session != self._peer_session):
+            self.peer = addr
+
+    def _is_newest(self, session: int, seq: int) -> bool:
+        """Track a sequence number and report whether it is the newest seen
+
+        :param session: Random id of the sender, which changes if it restarts
+        :type session: int
+        :param seq: Sequence number of the datagram
+        :type seq: int
+        :returns: Whether the datagram is newer than any seen before
+        :rtype: bool
+        """
+        if session != self._peer_session:
+            self._peer_session = session
+            self._highest = seq
+            self._seen = 1
+            return True
+        gap = seq - self._highest
+        if gap > 0:
+            self.stats.lost += gap - 1
+            if gap < _WINDOW:
+                self._seen = ((self._seen << gap) | 1) & _WINDOW_MASK
+            else:
+                self._seen = 1
+            self._highest = seq
+            return True
+        age = -gap
+        if age < _WINDOW:
+            if (self._seen >> age) & 1:
+                self.stats.duplicates += 1
+                return False
+            self._seen |= 1 << age
+            self.stats.lost -= 1
+            self.stats.reordered += 1
+        self.stats.stale += 1
+        return False
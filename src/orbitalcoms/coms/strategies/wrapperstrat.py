@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from collections import deque
+from threading import Condition, Event, Thread
+from typing import TYPE_CHECKING, Deque
+
+from ..._utils import log
+from ..messages import ComsMessage
+from .strategy import ComsStrategy, PollableComsStrategy, RateLimitedComsStrategy
+
+if TYPE_CHECKING:
+    from .ratelimit import TokenBucket
+
+logger = log.make_logger(__name__, logging.ERROR)
+
+
+class WrappedComsStrategy(PollableComsStrategy):
+    """Base class for strategies that add behaviour on top of another strategy
+
+    Wrapping strategies usually need to keep state between reads, so they
+    are always pollable and read from the wrapped strategy in the process
+    that owns them. A wrapped strategy that is not pollable itself is read
+    by a background thread.
+    """
+
+    def __init__(self, inner: ComsStrategy) -> None:
+        """Wrap a strategy
+
+        :param inner: The strategy to wrap
+        :type inner: ComsStrategy
+        """
+        self.inner = inner
+        self._reader: _BackgroundReader | None = None
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        """The rate limiter of the wrapped strategy, if any
+
+        :returns: Rate limiter of the link
+        :rtype: TokenBucket | None
+        """
+        if isinstance(self.inner, RateLimitedComsStrategy):
+            return self.inner.rate_limiter
+        return None
+
+    def read(self) -> ComsMessage:
+        """Wait for and return the next message
+
+        :returns: Newly read message
+        :rtype: ComsMessage
+        """
+        while True:
+            m = self.poll()
+            if m is not None:
+                return m
+
+    def poll(self, timeout: float | None = None) -> ComsMessage | None:
+        """Wait for and return the next message read from the wrapped strategy
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        return self._poll_inner(timeout)
+
+    def write(self, m: ComsMessage) -> None:
+        """Write a message to the wrapped strategy
+
+        :param m: A message to write
+        :type m: ComsMessage
+        """
+        self.inner.write(m)
+
+    def close(self) -> None:
+        """Stop reading and close the wrapped strategy, if it can be closed.
+        The strategy cannot be used after it has been closed
+        """
+        if self._reader is not None:
+            self._reader.stop()
+            self._reader = None
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
+
+    def _poll_inner(self, timeout: float | None) -> ComsMessage | None:
+        """Poll the wrapped strategy, reading it from a background
+        thread if it cannot be polled itself
+
+        :param timeout: Time in seconds to wait for a message. If None,
+            wait indefinitely
+        :type timeout: float | None
+        :returns: Newly read message or None if no message was read in time
+        :rtype: ComsMessage | None
+        """
+        if isinstance(self.inner, PollableComsStrategy):
+            return self.inner.poll(timeout)
+        if self._reader is None:
+            self._reader = _BackgroundReader(self.inner)
+            self._reader.start()
+        return self._reader.poll(timeout)
+
+
+class _BackgroundReader(Thread):
+    """Daemon thread that reads a strategy that cannot be polled and
+    queues up what it reads
+    """
+
+    def __init__(self, strat: ComsStrategy) -> None:
+        super().__init__(daemon=True)
+        self._strat = strat
+        self._messages: Deque[ComsMessage] = deque()
+        self._cv = Condition()
+        self._stop_event = Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                m = self._strat.read()
+            except Exception:
+                if self._stop_event.is_set():
+                    break
+                logger.error(
+                    f"While reading wrapped strategy got exception {traceback.format_exc()}"
+                )
+                # Do not spin on a strategy that keeps failing
+                self._stop_event.wait(0.2)
+                continue
+            with self._cv:
+                self._messages.append(m)
+                self._cv.notify()
+
+    def stop(self) -> None:
+        """Stop reading. The thread ends once the read in progress, if any,
+        returns, which for most strategies is when they are closed
+        """
+        self._stop_event.set()
+
+    def poll(self, timeout: float | None) -> ComsMessage | None:
+        with self._cv:
+            if not self._cv.wait_for(lambda: len(self._messages) > 0, timeout=timeout):
+                return None
+            return self._messages.popleft()
@@ -1,20 +1,52 @@
 from .groundstation import GroundStation
 from .launchstation import LaunchStation
+from .linkmonitor import LinkQuality, LinkState
+from .manager import FleetStats, StationManager, StationStats
+from .observerstation import ObserverStation
+from .resend import AdaptiveResend
+from .snapshot import StationSnapshot
+from .statemachine import MissionStateMachine, Transition
 from .station import Queueable, Station
 from .stationcreators import (
+    create_multicast_ground_station,
+    create_multicast_launch_station,
     create_serial_ground_station,
     create_serial_launch_station,
     create_socket_ground_station,
     create_socket_launch_station,
+    create_udp_ground_station,
+    create_udp_launch_station,
+    create_unix_ground_station,
+    create_unix_launch_station,
 )
+from .transitions import MissionFlag, allowed_toggles, is_valid_transition
 
 __all__ = [
     "Station",
     "Queueable",
+    "StationSnapshot",
     "GroundStation",
     "LaunchStation",
+    "ObserverStation",
+    "StationManager",
+    "FleetStats",
+    "StationStats",
+    "LinkQuality",
+    "LinkState",
+    "AdaptiveResend",
+    "MissionFlag",
+    "MissionStateMachine",
+    "Transition",
+    "allowed_toggles",
+    "is_valid_transition",
     "create_serial_ground_station",
     "create_serial_launch_station",
     "create_socket_ground_station",
     "create_socket_launch_station",
+    "create_udp_ground_station",
+    "create_udp_launch_station",
+    "create_unix_ground_station",
+    "create_unix_launch_station",
+    "create_multicast_ground_station",
+    "create_multicast_launch_station",
 ]
@@ -1,16 +1,35 @@
 import logging
+from threading import RLock
 from typing import Any
 
 from orbitalcoms.coms.messages.message import ParsableComType, construct_message
 
 from .._utils.log import make_logger
-from ..coms import ComsMessage
+from ..coms import ComsDriver, ComsMessage
 from .station import Station
+from .transitions import TRANSITIONS, MissionFlag, allowed_toggles, flags_of
 
 logger = make_logger(__name__, logging.WARNING)
 
 
 class GroundStation(Station):
+    _mission_rules = TRANSITIONS
+
+    def __init__(
+        self,
+        coms: ComsDriver,
+        send_interval: float = 0.0,
+        heartbeat_interval: float = 0.0,
+    ):
+        """Create a new ``GroundStation`` instance. See ``Station.__init__``"""
+        # Mission state once the commands queued by ``send_nowait`` have
+        # been written, and the last of those commands. None if none are
+        # waiting to be written
+        self._projected: int | None = None
+        self._projecting: ComsMessage | None = None
+        self._projection_lock = RLock()
+        super().__init__(coms, send_interval, heartbeat_interval)
+
     def _on_receive(self, new: ComsMessage) -> Any:
         """Set data to most accurate version
 
@@ -27,6 +46,19 @@ class GroundStation(Station):
         if new.DATA is not None:
             self._last_data = new.DATA
 
+    def _on_send(self, new: ComsMessage) -> Any:
+        """Track the mission state that was sent
+
+        The change was validated before sending, and once it has been sent
+        the mission state must match it.
+
+        :param new: Newly sent message
+        :type new: ComsMessage
+        :returns: Nothing of importance
+        :rtype: Any
+        """
+        self._mission.apply(flags_of(new), validate=False)
+
     @property
     def abort(self) -> bool:
         """Current station abort property
@@ -34,9 +66,7 @@ class GroundStation(Station):
         :returns: The boolean value of the station abort status
         :rtype: bool
         """
-        if self.last_sent is None:
-            return False
-        return bool(self.last_sent.ABORT)
+        return self._mission.is_set(MissionFlag.ABORT)
 
     @property
     def qdm(self) -> bool:
@@ -45,9 +75,7 @@ class GroundStation(Station):
         :returns: The boolean value of the station QDM status
         :rtype: bool
         """
-        if self.last_sent is None:
-            return False
-        return bool(self.last_sent.QDM)
+        return self._mission.is_set(MissionFlag.QDM)
 
     @property
     def stab(self) -> bool:
@@ -56,9 +84,7 @@ class GroundStation(Station):
         :returns: The boolean value of the station stabilize status
         :rtype: bool
         """
-        if self.last_sent is None:
-            return False
-        return bool(self.last_sent.STAB)
+        return self._mission.is_set(MissionFlag.STAB)
 
     @property
     def launch(self) -> bool:
@@ -67,9 +93,7 @@ class GroundStation(Station):
         :returns: The boolean value of the station launch status
         :rtype: bool
         """
-        if self.last_sent is None:
-            return False
-        return bool(self.last_sent.LAUNCH)
+        return self._mission.is_set(MissionFlag.LAUNCH)
 
     @property
     def armed(self) -> bool:
@@ -78,9 +102,17 @@ class GroundStation(Station):
         :returns: The boolean value of the station armed status
         :rtype: bool
         """
-        if self.last_sent is None:
-            return False
-        return bool(self.last_sent.ARMED)
+        return self._mission.is_set(MissionFlag.ARMED)
+
+    @property
+    def allowed_toggles(self) -> MissionFlag:
+        """Mission flags that may be toggled on their own from the current
+        mission state, for instance to enable buttons in a frontend
+
+        :returns: Flags that can be toggled
+        :rtype: MissionFlag
+        """
+        return allowed_toggles(self._mission.state)
 
     def _is_valid_state_change(self, new: ComsMessage) -> bool:
         """Validate that the message being sent is preforming a valid mission
@@ -93,43 +125,21 @@ class GroundStation(Station):
         ``GroundStation`` finds this inconsistency, it will return that the
         state change does not make sense.
 
+        The rules are compiled into a table once, see ``transitions``, and
+        checked by the station's ``MissionStateMachine``. Changes are checked
+        from the state the mission will be in once the commands queued by
+        ``send_nowait`` have been written.
+
         :param new: The message with a new mission state
         :type new: ComsMessage
         :returns: Whether or not the new mission state is valid
         :rtype: bool
         """
-        # If armed, do not unarm
-        if self.armed and not new.ARMED:
-            logger.warning("Cannot unarm a station")
+        with self._projection_lock:
+            reason = self._mission.check(flags_of(new), self._projected)
+        if reason is not None:
+            logger.warning(reason)
             return False
-
-        # If not armed
-        if not self.armed:
-            # Do not abort, launch, stab, or qdm
-            if new.ABORT or new.LAUNCH or new.QDM or new.STAB:
-                logger.warning("Cannot do any action before arm command")
-                return False
-
-        # Do not un-arm, un-launch, or un-qdm
-        if any(
-            [
-                not new.ABORT and self.abort,
-                not new.LAUNCH and self.launch,
-                not new.QDM and self.qdm,
-            ]
-        ):
-            logger.warning("Cannot un-launch, un-abort, or un-QDM")
-            return False
-
-        # Do not launch if not stab, or have qdm/aborted
-        if (
-            new.LAUNCH
-            and not self.launch
-            and any([not self.stab, self.qdm, self.abort])
-        ):
-            logger.warning("Cannot launch if not stab or already abort/QDM")
-            return False
-
         return True
 
     def send(self, data: ParsableComType) -> bool:
@@ -145,9 +155,60 @@ class GroundStation(Station):
         """
         try:
             message = construct_message(data)
-            if not self._is_valid_state_change(message):
-                return False
         except Exception:
             # FIXME: Add logging
             return False
         return self._is_valid_state_change(message) and super().send(message)
+
+    def send_nowait(self, data: ParsableComType) -> bool:
+        """Validate that mission state is valid before attempting to queue
+
+        Overrides ``Station.send_nowait`` with an additional valid state
+        change check. The new state is reserved as soon as the message is
+        queued, so that a later command is checked against it even though
+        the station only takes on the state once the message is written
+
+        :param data: data to format and queue
+        :type data: ParsableComType
+        :returns: Whether or not the message was queued successfully
+        :rtype: bool
+        """
+        try:
+            message = construct_message(data)
+        except Exception:
+            return False
+        with self._projection_lock:
+            if not self._is_valid_state_change(message):
+                return False
+            self._projected = flags_of(message)
+            self._projecting = message
+        if self._coms.write_nowait(
+            message,
+            suppress_errors=True,
+            on_written=lambda m: self._nowait_finished(message, m),
+            on_failed=lambda e: self._nowait_finished(message, None),
+        ):
+            return True
+        self._nowait_finished(message, None)
+        return False
+
+    def _nowait_finished(
+        self, queued: ComsMessage, written: ComsMessage | None
+    ) -> None:
+        """Update the station once a message queued by ``send_nowait`` has
+        been written or has failed to be
+
+        :param queued: The message that was queued
+        :type queued: ComsMessage
+        :param written: The message as it was written, or None if it could
+            not be written
+        :type written: ComsMessage | None
+        """
+        if written is not None:
+            self._record_sent(written)
+        with self._projection_lock:
+            # Once the last queued command is done the mission state is the
+            # state to check from again
+            if self._projecting is queued:
+                self._projected = None
+                self._projecting = None
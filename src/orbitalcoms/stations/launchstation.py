@@ -2,6 +2,7 @@ from typing import Any
 
 from ..coms import ComsMessage
 from .station import Station
+from .transitions import MissionFlag, flags_of
 
 
 class LaunchStation(Station):
@@ -20,6 +21,16 @@ class LaunchStation(Station):
         if new.DATA is not None:
             self._last_data = new.DATA
 
+    def _on_receive(self, new: ComsMessage) -> Any:
+        """Follow the mission state decided by the ``GroundStation``
+
+        :param new: Newly recieved message
+        :type new: ComsMessage
+        :returns: Nothing of importance
+        :rtype: Any
+        """
+        self._mission.apply(flags_of(new))
+
     @property
     def abort(self) -> bool:
         """Current station abort property
@@ -27,9 +38,7 @@ class LaunchStation(Station):
         :returns: The boolean value of the station abort status
         :rtype: bool
         """
-        if self.last_received is None:
-            return False
-        return bool(self.last_received.ABORT)
+        return self._mission.is_set(MissionFlag.ABORT)
 
     @property
     def qdm(self) -> bool:
@@ -38,9 +47,7 @@ class LaunchStation(Station):
         :returns: The boolean value of the station QDM status
         :rtype: bool
         """
-        if self.last_received is None:
-            return False
-        return bool(self.last_received.QDM)
+        return self._mission.is_set(MissionFlag.QDM)
 
     @property
     def stab(self) -> bool:
@@ -49,9 +56,7 @@ class LaunchStation(Station):
         :returns: The boolean value of the station stabilize status
         :rtype: bool
         """
-        if self.last_received is None:
-            return False
-        return bool(self.last_received.STAB)
+        return self._mission.is_set(MissionFlag.STAB)
 
     @property
     def launch(self) -> bool:
@@ -60,9 +65,7 @@ class LaunchStation(Station):
         :returns: The boolean value of the station launch status
         :rtype: bool
         """
-        if self.last_received is None:
-            return False
-        return bool(self.last_received.LAUNCH)
+        return self._mission.is_set(MissionFlag.LAUNCH)
 
     @property
     def armed(self) -> bool:
@@ -71,6 +74,4 @@ class LaunchStation(Station):
         :returns: The boolean value of the station armed status
         :rtype: bool
         """
-        if self.last_received is None:
-            return False
-        return bool(self.last_received.ARMED)
+        return self._mission.is_set(MissionFlag.ARMED)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from enum import Enum
+from threading import Lock
+from typing import Deque
+
+from attrs import define
+
+
+class LinkState(Enum):
+    """Overall health of the link to the other station"""
+
+    #: No heartbeat has been answered yet
+    UNKNOWN = "unknown"
+    #: Heartbeats are answered promptly
+    GOOD = "good"
+    #: Heartbeats are being lost or answered slowly
+    DEGRADED = "degraded"
+    #: Nothing has been heard from the other station for too long
+    STALE = "stale"
+
+
+@define(frozen=True)
+class LinkQuality:
+    """Snapshot of the measured quality of the link to the other station"""
+
+    #: Overall health of the link
+    state: LinkState
+    #: Smoothed round trip time in seconds, or None if not yet measured
+    rtt: float | None
+    #: Smoothed variation of the round trip time in seconds
+    rtt_var: float
+    #: Fraction of recent heartbeats that were not answered
+    loss: float
+    #: Seconds since anything was last heard from the other station, or None
+    #: if nothing has been heard yet
+    silence: float | None
+
+
+@define
+class _Ping:
+    id: int
+    sent_at: float
+    answered: bool = False
+
+
+class LinkMonitor:
+    """Estimates link quality from heartbeat pings and their pongs
+
+    The round trip time is smoothed with an exponentially weighted moving
+    average and its variation is tracked the same way, as TCP does for its
+    retransmission timer. Loss is the fraction of the last ``window`` pings
+    that went unanswered for longer than the ping timeout.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        window: int = 32,
+        degraded_loss: float = 0.25,
+        degraded_rtt: float | None = None,
+        stale_after: float | None = None,
+    ) -> None:
+        """Create a new ``LinkMonitor``
+
+        :param interval: Time in seconds between heartbeats
+        :type interval: float
+        :param window: Number of recent heartbeats the loss is measured over
+        :type window: int
+        :param degraded_loss: Loss above which the link is degraded
+        :type degraded_loss: float
+        :param degraded_rtt: Round trip time in seconds above which the link is
+            degraded. If None, the round trip time never degrades the link
+        :type degraded_rtt: float | None
+        :param stale_after: Seconds of silence after which the link is stale.
+            If None, three heartbeat intervals are used
+        :type stale_after: float | None
+        """
+        self.interval = interval
+        self.degraded_loss = degraded_loss
+        self.degraded_rtt = degraded_rtt
+        self.stale_after = stale_after
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.state = LinkState.UNKNOWN
+        self._pings: Deque[_Ping] = deque(maxlen=window)
+        self._next_id = 0
+        self._last_heard: float | None = None
+        self._lock = Lock()
+
+    def ping(self) -> int:
+        """Record that a heartbeat ping is being sent
+
+        :returns: Id to put in the ping, which the pong will echo back
+        :rtype: int
+        """
+        with self._lock:
+            ping_id = self._next_id
+            self._next_id += 1
+            self._pings.append(_Ping(ping_id, time.monotonic()))
+            return ping_id
+
+    def pong(self, ping_id: int) -> None:
+        """Record that a pong answering a ping was received
+
+        :param ping_id: Id of the ping being answered
+        :type ping_id: int
+        """
+        now = time.monotonic()
+        with self._lock:
+            for p in self._pings:
+                if p.id == ping_id and not p.answered:
+                    p.answered = True
+                    self._sample_rtt(now - p.sent_at)
+                    break
+        self.heard()
+
+    def heard(self) -> None:
+        """Record that something was received from the other station"""
+        self._last_heard = time.monotonic()
+
+    def quality(self) -> LinkQuality:
+        """Measure the quality of the link
+
+        :returns: Current link quality
+        :rtype: LinkQuality
+        """
+        now = time.monotonic()
+        with self._lock:
+            silence = None if self._last_heard is None else now - self._last_heard
+            loss = self._loss(now)
+            stale_after = self.stale_after or 3 * self.interval
+            if silence is not None and silence > stale_after:
+                state = LinkState.STALE
+            elif self.srtt is None:
+                state = (
+                    LinkState.STALE
+                    if self._pings and now - self._pings[0].sent_at > stale_after
+                    else LinkState.UNKNOWN
+                )
+            elif loss > self.degraded_loss or (
+                self.degraded_rtt is not None and self.srtt > self.degraded_rtt
+            ):
+                state = LinkState.DEGRADED
+            else:
+                state = LinkState.GOOD
+            return LinkQuality(state, self.srtt, self.rttvar, loss, silence)
+
+    def update(self) -> LinkQuality | None:
+        """Measure the quality of the link and report whether its state changed
+
+        :returns: The new quality if the state changed, otherwise None
+        :rtype: LinkQuality | None
+        """
+        q = self.quality()
+        with self._lock:
+            if q.state == self.state:
+                return None
+            self.state = q.state
+        return q
+
+    def _loss(self, now: float) -> float:
+        """Fraction of settled pings that were not answered
+
+        :param now: Current monotonic time
+        :type now: float
+        :returns: Loss between 0 and 1
+        :rtype: float
+        """
+        timeout = 3 * self.interval
+        if self.srtt is not None:
+            timeout = max(timeout, self.srtt + 4 * self.rttvar)
+        answered = lost = 0
+        for p in self._pings:
+            if p.answered:
+                answered += 1
+            elif now - p.sent_at > timeout:
+                lost += 1
+        settled = answered + lost
+        return lost / settled if settled else 0.0
+
+    def _sample_rtt(self, rtt: float) -> None:
+        """Add a round trip time measurement to the smoothed estimates
+
+        :param rtt: Measured round trip time in seconds
+        :type rtt: float
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
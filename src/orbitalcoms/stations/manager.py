@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Type, TypeVar
+
+from attrs import define, evolve
+
+from .._utils.log import make_logger
+from ..coms import ComsDriver, ComsIOLoop, ComsMessage, ComsSubscription, IOLoopStats
+from ..coms.messages.envelope import split_meta
+from ..coms.strategies import ComsStrategy
+from .groundstation import GroundStation
+from .launchstation import LaunchStation
+from .linkmonitor import LinkQuality, LinkState
+from .station import Station
+
+logger = make_logger(__name__, logging.WARNING)
+
+_TStation = TypeVar("_TStation", bound=Station)
+
+#: Called with the name of the station that received a message and the message
+FleetCallback = Callable[[str, ComsMessage], Any]
+
+
+@define(frozen=True)
+class StationStats:
+    """Snapshot of one station managed by a ``StationManager``"""
+
+    #: Name the station was added under
+    name: str
+    #: Whether messages are being read for the station
+    reading: bool
+    #: Messages received, including heartbeats
+    received: int
+    #: Time the station last received a mission message, or None if it
+    #: has not received one
+    last_received_time: float | None
+    #: Measured quality of the station's link
+    link: LinkQuality
+
+
+@define(frozen=True)
+class FleetStats:
+    """Snapshot of every station managed by a ``StationManager``"""
+
+    #: Snapshot of each station by name
+    stations: Dict[str, StationStats]
+    #: Counters of the loop reading every station
+    io: IOLoopStats
+
+    @property
+    def received(self) -> int:
+        """Messages received by all stations"""
+        return sum(s.received for s in self.stations.values())
+
+    @property
+    def reading(self) -> int:
+        """Number of stations messages are being read for"""
+        return sum(s.reading for s in self.stations.values())
+
+    @property
+    def link_states(self) -> Dict[LinkState, int]:
+        """Number of stations whose link is in each state"""
+        counts = {state: 0 for state in LinkState}
+        for s in self.stations.values():
+            counts[s.link.state] += 1
+        return counts
+
+    def in_state(self, state: LinkState) -> List[str]:
+        """Names of the stations whose link is in a state
+
+        :param state: State to look for
+        :type state: LinkState
+        :returns: Names of the stations, in the order they were added
+        :rtype: List[str]
+        """
+        return [name for name, s in self.stations.items() if s.link.state is state]
+
+
+class StationManager:
+    """Owns many stations and reads all of their links from one shared
+    ``ComsIOLoop``
+
+    A station created on its own reads its link with a thread of its own, or
+    for a strategy that cannot be polled a process per message. Stations
+    created through a manager share the manager's loop instead, and their
+    resends and heartbeats share the process wide scheduler as they always
+    do, so the number of threads does not grow with the number of stations.
+
+    Each station notifies its own queue, mission callbacks and subscribers
+    as usual. Callbacks registered with the manager are told about the
+    mission messages of every station, or of one station, along with the
+    name of the station that received them.
+    """
+
+    def __init__(self, io_loop: ComsIOLoop | None = None) -> None:
+        """Create a new ``StationManager``
+
+        :param io_loop: Loop to read the stations from. If None, the
+            manager starts a loop of its own and stops it when closed
+        :type io_loop: ComsIOLoop | None
+        """
+        self._owns_loop = io_loop is None
+        self._io_loop = io_loop or ComsIOLoop(name="orbitalcoms-io", daemon=True)
+        self._lock = Lock()
+        self._stations: Dict[str, Station] = {}
+        self._drivers: Dict[str, ComsDriver] = {}
+        self._received: Dict[str, int] = {}
+        self._callbacks: List[Tuple[FleetCallback, str | None]] = []
+
+    def __enter__(self) -> StationManager:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._stations
+
+    def __getitem__(self, name: str) -> Station:
+        return self._stations[name]
+
+    @property
+    def io_loop(self) -> ComsIOLoop:
+        """The loop reading every station
+
+        :returns: The shared loop
+        :rtype: ComsIOLoop
+        """
+        return self._io_loop
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the managed stations in the order they were added
+
+        :returns: Station names
+        :rtype: List[str]
+        """
+        with self._lock:
+            return list(self._stations)
+
+    def add(
+        self,
+        name: str,
+        station_type: Type[_TStation],
+        strategy: ComsStrategy,
+        **kwargs: Any,
+    ) -> _TStation:
+        """Create a station that reads from the manager's loop
+
+        :param name: Name to manage the station under
+        :type name: str
+        :param station_type: Kind of station to create
+        :type station_type: Type[Station]
+        :param strategy: How the station communicates
+        :type strategy: ComsStrategy
+        :param kwargs: Passed on to the station, e.g. ``send_interval``
+        :type kwargs: Any
+        :raises ValueError: A station is already managed under the name
+        :returns: The new station
+        :rtype: Station
+        """
+        with self._lock:
+            # Names are reserved before the station is created
+            if name in self._received:
+                raise ValueError(f"A station named '{name}' is already managed")
+            self._received[name] = 0
+        driver = ComsDriver(strategy, io_loop=self._io_loop)
+        # Registered before the station starts reading so nothing is missed
+        driver.register_subscriber(
+            ComsSubscription(lambda m: self._dispatch(name, m), expect_err=True)
+        )
+        try:
+            station = station_type(driver, **kwargs)
+        except Exception:
+            with self._lock:
+                del self._received[name]
+            driver.end_read_loop()
+            raise
+        with self._lock:
+            self._stations[name] = station
+            self._drivers[name] = driver
+        return station
+
+    def add_ground_station(
+        self, name: str, strategy: ComsStrategy, **kwargs: Any
+    ) -> GroundStation:
+        """Create a ground station that reads from the manager's loop.
+        See ``add``
+        """
+        return self.add(name, GroundStation, strategy, **kwargs)
+
+    def add_launch_station(
+        self, name: str, strategy: ComsStrategy, **kwargs: Any
+    ) -> LaunchStation:
+        """Create a launch station that reads from the manager's loop.
+        See ``add``
+        """
+        return self.add(name, LaunchStation, strategy, **kwargs)
+
+    def remove(self, name: str) -> None:
+        """Close a station and stop managing it
+
+        :param name: Name the station was added under
+        :type name: str
+        :raises KeyError: No station is managed under the name
+        """
+        with self._lock:
+            station = self._stations.pop(name)
+            del self._drivers[name]
+            del self._received[name]
+        station.close()
+
+    def close(self) -> None:
+        """Close every station and, if the manager started it, the loop
+        reading them
+
+        NOTE: A manager cannot be used after it has been closed
+        """
+        for name in self.names:
+            self.remove(name)
+        if self._owns_loop:
+            self._io_loop.stop()
+
+    def register_subscriber(
+        self, callback: FleetCallback, name: str | None = None
+    ) -> None:
+        """Call a function with every mission message received by a station.
+        Heartbeats are not passed on
+
+        Callbacks are called from the manager's loop, so should return
+        quickly.
+
+        :param callback: Called with the station's name and the message
+        :type callback: Callable[[str, ComsMessage], Any]
+        :param name: Only pass on messages received by the station of this
+            name. If None, pass on messages received by any station
+        :type name: str | None
+        """
+        with self._lock:
+            self._callbacks.append((callback, name))
+
+    def unregister_subscriber(self, callback: FleetCallback) -> None:
+        """Stop calling a function registered with ``register_subscriber``.
+        If it was not registered, this method is a NOP
+
+        :param callback: The function to stop calling
+        :type callback: Callable[[str, ComsMessage], Any]
+        """
+        with self._lock:
+            self._callbacks = [(c, n) for c, n in self._callbacks if c is not callback]
+
+    def stats(self) -> FleetStats:
+        """Snapshot of every managed station and the loop reading them
+
+        :returns: Current stats
+        :rtype: FleetStats
+        """
+        with self._lock:
+            stations = list(self._stations.items())
+            drivers = dict(self._drivers)
+            received = dict(self._received)
+        return FleetStats(
+            stations={
+                name: StationStats(
+                    name=name,
+                    reading=drivers[name].is_reading,
+                    received=received.get(name, 0),
+                    last_received_time=station.snapshot().last_received_time,
+                    link=station.link_quality,
+                )
+                for name, station in stations
+            },
+            io=evolve(self._io_loop.stats),
+        )
+
+    def _dispatch(self, name: str, m: ComsMessage) -> None:
+        """Count a message received by a station and pass it on to the
+        callbacks interested in it
+        """
+        with self._lock:
+            if name in self._received:
+                self._received[name] += 1
+            callbacks = [c for c, n in self._callbacks if n is None or n == name]
+        if not callbacks:
+            return
+        message, meta = split_meta(m)
+        if meta.get("ctl"):
+            return
+        for callback in callbacks:
+            try:
+                callback(name, message)
+            except Exception:
+                logger.error(f"fleet subscriber raised exception: {traceback.format_exc()}")
@@ -0,0 +1,51 @@
+from typing import Any
+
+from ..coms import ComsMessage
+from .groundstation import GroundStation
+from .transitions import MissionFlag, flags_of
+
+
+class ObserverStation(GroundStation):
+    """A read-only station that mirrors the state it receives
+
+    An observer only listens, for example to the messages a ``LaunchStation``
+    publishes to a multicast group, so it never sends the state it reports.
+    Its flags and data follow every message it receives instead, whichever
+    station sent it.
+
+    Observers can be shown by any ground station frontend, which will not
+    offer to change flags that the observer cannot send.
+    """
+
+    def _on_send(self, new: ComsMessage) -> Any:
+        """Observers do not send, so nothing is tracked
+
+        :param new: [UNUSED] Newly sent message
+        :type new: ComsMessage
+        :returns: Nothing of importance
+        :rtype: Any
+        """
+
+    def _on_receive(self, new: ComsMessage) -> Any:
+        """Mirror the received mission state and data
+
+        The observed stations have already decided on the mission state, so
+        it is followed without being checked against the mission rules.
+
+        :param new: Newly recieved message
+        :type new: ComsMessage
+        :returns: Nothing of importance
+        :rtype: Any
+        """
+        self._mission.apply(flags_of(new), validate=False)
+        if new.DATA is not None:
+            self._last_data = new.DATA
+
+    @property
+    def allowed_toggles(self) -> MissionFlag:
+        """Observers cannot send, so no flag may be toggled
+
+        :returns: No flags
+        :rtype: MissionFlag
+        """
+        return MissionFlag(0)
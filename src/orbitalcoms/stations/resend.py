@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from attrs import define
+
+
+@define
+class AdaptiveResend:
+    """Policy for resending the last state at an interval that adapts to
+    whether the other station has confirmed it
+
+    Right after a state change the state is resent every ``min_interval``
+    seconds. Once the other station echoes the state back, the interval is
+    multiplied by ``backoff`` after every resend, up to ``max_interval``.
+    If ``budget`` is set, the interval never becomes so short that resends
+    alone would use more than ``budget`` bytes per second.
+
+    ``min_interval`` must be greater than 0 and no greater than
+    ``max_interval``, otherwise ``ValueError`` is raised.
+    """
+
+    #: Interval in seconds used right after a state change
+    min_interval: float = 0.5
+    #: Longest interval in seconds once the state has been confirmed
+    max_interval: float = 30.0
+    #: Factor the interval grows by after each confirmed resend
+    backoff: float = 2.0
+    #: Bytes per second that resends may use, or None for no limit
+    budget: float | None = None
+
+    def __attrs_post_init__(self) -> None:
+        if not 0 < self.min_interval <= self.max_interval:
+            raise ValueError(
+                "Resend intervals must satisfy 0 < min_interval <= max_interval,"
+                f" got {self.min_interval} and {self.max_interval}"
+            )
+
+    def first_interval(self, size: int) -> float:
+        """Interval to use right after a state change
+
+        :param size: Size in bytes of the message that will be resent
+        :type size: int
+        :returns: Interval in seconds
+        :rtype: float
+        """
+        return max(self.min_interval, self._floor(size))
+
+    def next_interval(self, current: float, confirmed: bool, size: int) -> float:
+        """Interval to use after a resend
+
+        :param current: Interval in seconds used for the last resend
+        :type current: float
+        :param confirmed: Whether the other station has echoed the state
+        :type confirmed: bool
+        :param size: Size in bytes of the message that will be resent
+        :type size: int
+        :returns: Interval in seconds
+        :rtype: float
+        """
+        interval = self.min_interval
+        if confirmed:
+            interval = min(
+                max(current, self.min_interval) * self.backoff, self.max_interval
+            )
+        return max(interval, self._floor(size))
+
+    def _floor(self, size: int) -> float:
+        """Shortest interval allowed by the bandwidth budget"""
+        if not self.budget:
+            return 0.0
+        return size / self.budget
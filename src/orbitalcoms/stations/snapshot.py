@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from attrs import define
+
+from ..coms import ComsMessage
+from .transitions import MissionFlag
+
+
+@define(frozen=True)
+class StationSnapshot:
+    """Consistent view of a ``Station`` at one point in time
+
+    A station replaces its snapshot with a new one in a single assignment
+    whenever it sends or receives a message, so a reader holding a snapshot
+    never sees a message paired with the timestamp or data of another one.
+    Readers do not need to take any locks.
+
+    ``data`` is the same dictionary the station received or sent and should
+    not be modified.
+    """
+
+    #: Number of updates made to the station before this snapshot
+    sequence: int = 0
+    #: Mission flags that are set
+    flags: MissionFlag = MissionFlag(0)
+    #: Last message sent by the station
+    last_sent: ComsMessage | None = None
+    #: Unix time the last message was sent
+    last_sent_time: float | None = None
+    #: Last message received by the station
+    last_received: ComsMessage | None = None
+    #: Unix time the last message was received
+    last_received_time: float | None = None
+    #: Most accurate mission data known to the station
+    data: Dict[str, Any] | None = None
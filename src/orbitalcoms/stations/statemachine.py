@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import logging
+import time
+import traceback
+from contextlib import contextmanager
+from threading import Lock, local
+from typing import Any, Callable, Iterator, List, Sequence
+
+from attrs import define
+
+from .._utils.log import make_logger
+from .transitions import REASONS, MissionFlag
+
+logger = make_logger(__name__, logging.ERROR)
+
+
+@define(frozen=True)
+class Transition:
+    """A change of mission state"""
+
+    #: Unix time of the change
+    time: float
+    #: Mission state before the change
+    previous: MissionFlag
+    #: Mission state after the change
+    current: MissionFlag
+
+    @property
+    def changed(self) -> MissionFlag:
+        """Flags that were set or cleared by the change
+
+        :returns: Changed flags
+        :rtype: MissionFlag
+        """
+        return self.previous ^ self.current
+
+
+class MissionStateMachine:
+    """Keeps track of the mission state as a bitmask of ``MissionFlag``
+
+    Changes are checked against a table of compiled rules such as
+    ``transitions.TRANSITIONS``, indexed by ``current << 5 | new``, where a
+    non-zero entry is an index into ``transitions.REASONS``. Without rules
+    every change is accepted, which suits a station that mirrors the state
+    decided elsewhere.
+
+    Every change is appended to a history, and callbacks are called with the
+    ``Transition`` whenever a flag actually changes. Applying the current
+    state again does nothing.
+    """
+
+    def __init__(self, rules: bytes | None = None) -> None:
+        """Create a new ``MissionStateMachine`` with no flags set
+
+        :param rules: Table of compiled transition rules. If None, every
+            change is accepted
+        :type rules: bytes | None
+        """
+        self._rules = rules
+        self._state = MissionFlag(0)
+        self._history: List[Transition] = []
+        self._callbacks: List[Callable[[Transition], Any]] = []
+        self._lock = Lock()
+        # Transitions whose callbacks are held back, per thread
+        self._held = local()
+
+    @property
+    def state(self) -> MissionFlag:
+        """Current mission state
+
+        :returns: Flags that are set
+        :rtype: MissionFlag
+        """
+        return self._state
+
+    @property
+    def history(self) -> Sequence[Transition]:
+        """Every change of mission state, oldest first
+
+        :returns: The transition history
+        :rtype: Sequence[Transition]
+        """
+        return tuple(self._history)
+
+    def is_set(self, flag: MissionFlag) -> bool:
+        """Whether a flag is set in the current mission state
+
+        :param flag: Flag to check
+        :type flag: MissionFlag
+        :returns: Whether the flag is set
+        :rtype: bool
+        """
+        return bool(self._state & flag)
+
+    def check(self, new: int, current: int | None = None) -> str | None:
+        """Why changing to a mission state is not allowed
+
+        :param new: Bitmask of the new mission state
+        :type new: int
+        :param current: Bitmask of the state to change from. If None, the
+            current mission state
+        :type current: int | None
+        :returns: Reason the change is rejected, or None if it is allowed
+        :rtype: str | None
+        """
+        if self._rules is None:
+            return None
+        if current is None:
+            current = self._state
+        return REASONS[self._rules[current << 5 | new]]
+
+    def apply(self, new: int, validate: bool = True) -> bool:
+        """Change to a new mission state
+
+        :param new: Bitmask of the new mission state
+        :type new: int
+        :param validate: Whether to reject changes the rules do not allow
+        :type validate: bool
+        :returns: Whether the mission state is now ``new``
+        :rtype: bool
+        """
+        with self._lock:
+            previous = self._state
+            if new == previous:
+                return True
+            if validate and self.check(new) is not None:
+                return False
+            transition = Transition(time.time(), previous, MissionFlag(new))
+            self._state = transition.current
+            self._history.append(transition)
+        held: List[Transition] | None = getattr(self._held, "transitions", None)
+        if held is not None:
+            held.append(transition)
+        else:
+            self._notify(transition)
+        return True
+
+    @contextmanager
+    def deferred_callbacks(self) -> Iterator[None]:
+        """Hold back the callbacks for changes made by the calling thread
+        until the context exits, so that the caller can finish updating its
+        own state and release its locks first
+        """
+        outer = getattr(self._held, "transitions", None)
+        held: List[Transition] = []
+        self._held.transitions = held
+        try:
+            yield
+        finally:
+            self._held.transitions = outer
+            for transition in held:
+                if outer is not None:
+                    outer.append(transition)
+                else:
+                    self._notify(transition)
+
+    def _notify(self, transition: Transition) -> None:
+        """Call every callback with a transition"""
+        for callback in self._callbacks:
+            try:
+                callback(transition)
+            except Exception:
+                logger.error(
+                    f"Transition callback raised exception: {traceback.format_exc()}"
+                )
+
+    def add_callback(self, callback: Callable[[Transition], Any]) -> None:
+        """Register a callback to be called with each ``Transition``
+
+        :param callback: Function to call when a flag changes
+        :type callback: Callable[[Transition], Any]
+        """
+        self._callbacks.append(callback)
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import logging
 import time
+import traceback
 from abc import ABC, abstractmethod
-from threading import Event, Thread
+from threading import RLock
 from types import TracebackType
-from typing import Any, Callable, Dict, Type, TypeVar
+from typing import Any, Callable, Dict, List, Type, TypeVar
 
 from typing_extensions import Protocol
 
 from .._utils.log import make_logger
+from .._utils.scheduler import TimerHandle, get_scheduler
 from ..coms import (
     ComsDriver,
     ComsMessage,
@@ -18,6 +20,13 @@ from ..coms import (
     construct_message,
 )
 from ..coms.errors import ComsMessageParseError
+from ..coms.messages.envelope import attach_meta, split_meta
+from ..coms.strategies import RateLimitedComsStrategy, TokenBucket
+from .linkmonitor import LinkMonitor, LinkQuality
+from .resend import AdaptiveResend
+from .snapshot import StationSnapshot
+from .statemachine import MissionStateMachine
+from .transitions import flags_of
 
 logger = make_logger(__name__, logging.WARNING)
 
@@ -42,13 +51,25 @@ class Station(ABC):
     a period of time has elapsed.
     """
 
-    def __init__(self, coms: ComsDriver, send_interval: float = 0.0):
+    #: Rules mission state changes are checked against. See
+    #: ``MissionStateMachine``
+    _mission_rules: bytes | None = None
+
+    def __init__(
+        self,
+        coms: ComsDriver,
+        send_interval: float = 0.0,
+        heartbeat_interval: float = 0.0,
+    ):
         """Create a new ``Station`` instance.
 
         :param coms: Informs station how to handle communications
         :type coms: ComsDriver
         :param send_interval: Time to wait before autosending last state
         :type send_interval: float
+        :param heartbeat_interval: Time to wait between heartbeats used to
+            measure the link quality
+        :type heartbeat_interval: float
         """
 
         self._coms = coms
@@ -58,25 +79,46 @@ class Station(ABC):
         self._last_data: Dict[str, Any] | None = None
         self._last_sent_time: float | None = None
         self._last_received_time: float | None = None
+        self._mission = MissionStateMachine(self._mission_rules)
+        self._state_lock = RLock()
+        self._snapshot = StationSnapshot()
 
         self.queue: Queueable | None = None
 
         self._send_interval_time = 0.0
-        self._send_interval_thread: _AutoSendOnInterval | None = None
+        self._adaptive_resend: AdaptiveResend | None = None
+        self._resend_delay = 0.0
+        self._resend_timer: TimerHandle | None = None
+        self._state_changed_time: float | None = None
+
+        self._link = LinkMonitor()
+        self._link_callbacks: List[Callable[[LinkQuality], Any]] = []
+        self._heartbeat_timer: TimerHandle | None = None
 
         if send_interval:
             self.set_send_interval(send_interval)
 
         def receive(message: ComsMessage) -> None:
-            self._on_receive(message)
-            self._last_received = message
+            self._link.heard()
+            message, meta = split_meta(message)
+            if meta.get("ctl"):
+                self._on_control(message, meta)
+                return
+            # Mission callbacks see the new snapshot and run without the lock
+            with self._mission.deferred_callbacks(), self._state_lock:
+                self._on_receive(message)
+                self._last_received = message
+                self._last_received_time = time.time()
+                self._publish()
             if self.queue is not None:
                 self.queue.append(message)
-            self._last_received_time = time.time()
 
         self._coms.register_subscriber(ComsSubscription(receive))
         self._coms.start_read_loop()
 
+        if heartbeat_interval:
+            self.set_heartbeat_interval(heartbeat_interval)
+
     def __enter__(self: _TStation) -> _TStation:
         """Ctx manage a station
 
@@ -121,7 +163,9 @@ class Station(ABC):
     def __cleanup(self) -> None:
         """Clean up resources used by the station"""
         self._coms.end_read_loop()
+        self._coms.end_write_loop()
         self._end_current_interval_send()
+        self.set_heartbeat_interval(None)
 
     @property
     @abstractmethod
@@ -175,7 +219,45 @@ class Station(ABC):
 
     @property
     def data(self) -> Dict[str, Any] | None:
-        return self._last_data
+        return self._snapshot.data
+
+    def snapshot(self) -> StationSnapshot:
+        """Consistent view of the station's last sent and received messages,
+        their timestamps, mission data and flags
+
+        Reading several of the individual properties one after another may
+        mix values from before and after a message arrives. A snapshot never
+        does, and taking one does not block.
+
+        :returns: The station's current snapshot
+        :rtype: StationSnapshot
+        """
+        return self._snapshot
+
+    def _publish(self) -> None:
+        """Replace the station's snapshot with its current state. Must be
+        called holding the state lock
+        """
+        self._snapshot = StationSnapshot(
+            sequence=self._snapshot.sequence + 1,
+            flags=self._mission.state,
+            last_sent=self._last_sent,
+            last_sent_time=self._last_sent_time,
+            last_received=self._last_received,
+            last_received_time=self._last_received_time,
+            data=self._last_data,
+        )
+
+    @property
+    def mission(self) -> MissionStateMachine:
+        """Mission state kept by the station along with the history of its
+        changes. Register callbacks with ``mission.add_callback`` to be told
+        when a mission flag changes
+
+        :returns: The station's mission state machine
+        :rtype: MissionStateMachine
+        """
+        return self._mission
 
     @property
     def last_sent(self) -> ComsMessage | None:
@@ -184,7 +266,7 @@ class Station(ABC):
         :returns: Last sent message
         :rtype: ComsMessage | None
         """
-        return self._last_sent
+        return self._snapshot.last_sent
 
     @property
     def last_received(self) -> ComsMessage | None:
@@ -193,7 +275,7 @@ class Station(ABC):
         :returns: Last received message
         :rtype: ComsMessage | None
         """
-        return self._last_received
+        return self._snapshot.last_received
 
     @property
     def last_sent_time(self) -> float | None:
@@ -202,7 +284,7 @@ class Station(ABC):
         :returns: Last sent timestamp
         :rtype: float | None
         """
-        return self._last_sent_time
+        return self._snapshot.last_sent_time
 
     @property
     def last_received_time(self) -> float | None:
@@ -211,7 +293,102 @@ class Station(ABC):
         :returns: Last received timestamp
         :rtype: float | None
         """
-        return self._last_received_time
+        return self._snapshot.last_received_time
+
+    @property
+    def link_quality(self) -> LinkQuality:
+        """Quality of the link to the other station as measured by heartbeats
+
+        Heartbeats are only sent once a heartbeat interval has been set, but
+        the station always answers the heartbeats of the other station.
+
+        :returns: Current link quality
+        :rtype: LinkQuality
+        """
+        return self._link.quality()
+
+    def add_link_callback(self, callback: Callable[[LinkQuality], Any]) -> None:
+        """Register a function to call whenever the state of the link changes,
+        such as when it degrades or goes stale
+
+        Callbacks are called from a background thread.
+
+        :param callback: Function taking the new link quality
+        :type callback: Callable[[LinkQuality], Any]
+        """
+        self._link_callbacks.append(callback)
+
+    def set_heartbeat_interval(self, interval: float | None) -> None:
+        """Set the amount of time between heartbeats sent to measure the
+        link quality
+
+        :param interval: Time in seconds between heartbeats. An interval of 0
+            or None means that heartbeats are no longer sent
+        :type interval: float | None
+        """
+        if interval is not None and not isinstance(interval, (int, float)):
+            raise TypeError("Expected interval of type `float` or `None`")
+        if interval is not None and interval < 0:
+            raise ValueError("Heartbeat interval cannot be less than 0")
+
+        if self._heartbeat_timer is not None:
+            self._heartbeat_timer.cancel()
+        self._heartbeat_timer = None
+        if interval:
+            self._link.interval = interval
+            self._heartbeat_timer = get_scheduler().call_later(
+                interval, self._heartbeat
+            )
+
+    def _heartbeat(self) -> float:
+        """Send a ping and report any change in the link state
+
+        :returns: Seconds until the next heartbeat
+        :rtype: float
+        """
+        # Control frames carry the current flags so that they are harmless
+        # to a station that does not understand them
+        state = self.last_sent or self.last_received
+        ping = ComsMessage(0, 0, 0, 0)
+        if state is not None:
+            ping = ComsMessage(
+                state.ABORT, state.QDM, state.STAB, state.LAUNCH, state.ARMED
+            )
+        # Queued rather than written, as a slow link must not hold up the
+        # scheduler shared by every station
+        self._coms.write_nowait(
+            attach_meta(ping, ctl=1, ping=self._link.ping()), suppress_errors=True
+        )
+        self._report_link_change()
+        return self._link.interval
+
+    def _on_control(self, message: ComsMessage, meta: Dict[str, Any]) -> None:
+        """Handle a link control frame sent by the other station
+
+        :param message: Control frame without its metadata
+        :type message: ComsMessage
+        :param meta: Metadata of the control frame
+        :type meta: Dict[str, Any]
+        """
+        if "ping" in meta:
+            pong = attach_meta(message, ctl=1, pong=meta["ping"])
+            self._coms.write_nowait(pong, suppress_errors=True)
+        elif "pong" in meta:
+            self._link.pong(meta["pong"])
+            self._report_link_change()
+
+    def _report_link_change(self) -> None:
+        """Call the link callbacks if the link state changed"""
+        quality = self._link.update()
+        if quality is None:
+            return
+        for callback in self._link_callbacks:
+            try:
+                callback(quality)
+            except Exception:
+                logger.error(
+                    f"Link callback raised exception: {traceback.format_exc()}"
+                )
 
     def _on_receive(self, new: ComsMessage) -> Any:
         """Callback for when a message is received
@@ -247,25 +424,86 @@ class Station(ABC):
             # FIXME: Add logging
             return False
         if self._coms.write(message, suppress_errors=True):
+            self._record_sent(message)
+            return True
+        return False
+
+    def send_nowait(self, data: ParsableComType) -> bool:
+        """Construct a ComsMessage from the provided object and queue it to
+        be sent without waiting for it to be written
+
+        If the link cannot keep up, queued telemetry that has not been sent
+        yet is replaced by newer telemetry rather than sent late. Messages
+        that change the mission state are always sent and go ahead of any
+        queued telemetry. The station only takes the message as sent, and
+        updates its state, once it has been written.
+
+        :param data: Object to send as a ComsMessage
+        :type data: ParsableComType
+        :return bool: wether or not queueing the object was successful
+        :rtype: bool
+        """
+        try:
+            message = construct_message(data)
+        except (TypeError, ComsMessageParseError):
+            return False
+        return self._coms.write_nowait(
+            message, suppress_errors=True, on_written=self._record_sent
+        )
+
+    def _record_sent(self, message: ComsMessage) -> None:
+        """Update the station after a message was sent
+
+        :param message: The sent message
+        :type message: ComsMessage
+        """
+        with self._mission.deferred_callbacks(), self._state_lock:
+            changed = self._last_sent is None or flags_of(message) != flags_of(
+                self._last_sent
+            )
             self._on_send(message)
             self._last_sent = message
-            self._start_new_interval_send()
+            if changed:
+                self._state_changed_time = time.time()
             self._last_sent_time = time.time()
-            return True
-        return False
+            self._publish()
+        self._start_new_interval_send(changed)
 
     def resend_last(self) -> None:
         """Attempts to resend the last send coms message"""
         if self._last_sent is not None:
             if self._coms.write(self._last_sent, suppress_errors=True):
-                self._on_send(self._last_sent)
-                self._last_sent_time = time.time()
+                self._record_resent(self._last_sent)
         else:
             # FIXME: This should send an all empty state message
             logger.warning(
                 "Cannot send previous message (No previous message has been sent)"
             )
 
+    def _resend_last_nowait(self) -> None:
+        """Queue the last sent message to be resent without waiting for it to
+        be written, so that a slow link does not hold up the scheduler
+        """
+        if self._last_sent is not None:
+            self._coms.write_nowait(
+                self._last_sent, suppress_errors=True, on_written=self._record_resent
+            )
+        else:
+            logger.warning(
+                "Cannot send previous message (No previous message has been sent)"
+            )
+
+    def _record_resent(self, message: ComsMessage) -> None:
+        """Update the station after the last sent message was sent again
+
+        :param message: The resent message
+        :type message: ComsMessage
+        """
+        with self._mission.deferred_callbacks(), self._state_lock:
+            self._on_send(message)
+            self._last_sent_time = time.time()
+            self._publish()
+
     def set_send_interval(self, interval: float | None) -> None:
         """Set the amount of time to be sent before the last state should be resent
 
@@ -288,19 +526,110 @@ class Station(ABC):
         self._send_interval_time = interval
         self._start_new_interval_send()
 
-    def _start_new_interval_send(self) -> None:
-        """Creates an new thread to manage interval sending"""
-        self._end_current_interval_send()
-        if self._send_interval_time != 0:
-            self._send_interval_thread = _AutoSendOnInterval(
-                self.resend_last, self._send_interval_time
+    def set_adaptive_resend(self, policy: AdaptiveResend | None) -> None:
+        """Resend the last state at an interval that adapts to whether the
+        other station has confirmed it, instead of at a fixed interval
+
+        The state is resent often right after it changes and less and less
+        often once the other station echoes it back.
+
+        :param policy: How the resend interval adapts. If None, the fixed
+            send interval is used again
+        :type policy: AdaptiveResend | None
+        """
+        self._adaptive_resend = policy
+        self._start_new_interval_send()
+
+    def _start_new_interval_send(self, state_changed: bool = True) -> None:
+        """Schedule the next resend of the last state from now
+
+        :param state_changed: Whether the state to resend has changed. If
+            not, an adaptive interval carries on from where it was
+        :type state_changed: bool
+        """
+        delay: float | None = None
+        if self._adaptive_resend is not None:
+            if state_changed or not self._resend_delay:
+                self._resend_delay = self._adaptive_resend.first_interval(
+                    self._last_sent_size()
+                )
+            delay = self._resend_delay
+        elif self._send_interval_time != 0:
+            delay = self._send_interval_time
+        if delay is None:
+            self._end_current_interval_send()
+            return
+        if self._resend_timer is None:
+            self._resend_timer = get_scheduler().call_later(
+                delay, self._resend_on_interval
             )
-            self._send_interval_thread.start()
+        else:
+            self._resend_timer.reschedule(delay)
 
     def _end_current_interval_send(self) -> None:
-        """Stops and leans up the resources used by the current interval thread"""
-        if self._send_interval_thread and self._send_interval_thread.is_alive():
-            self._send_interval_thread.stop()
+        """Stop resending the last state until a new interval is started"""
+        if self._resend_timer is not None:
+            self._resend_timer.cancel()
+
+    def _resend_on_interval(self) -> float | None:
+        """Resend the last state and work out when to resend it next
+
+        :returns: Seconds until the next resend or None to stop resending
+        :rtype: float | None
+        """
+        limiter = self._rate_limiter()
+        if limiter is not None:
+            busy = limiter.delay_for(self._last_sent_size())
+            if busy > 0:
+                # The link is saturated, so a resend would only queue up
+                # behind other traffic. Try again once there is room
+                return busy
+        self._resend_last_nowait()
+        if self._adaptive_resend is not None:
+            self._resend_delay = self._adaptive_resend.next_interval(
+                self._resend_delay, self._state_confirmed(), self._last_sent_size()
+            )
+            return self._resend_delay
+        return self._send_interval_time or None
+
+    def _state_confirmed(self) -> bool:
+        """Whether the other station has echoed the last state sent since
+        it was last changed
+
+        :returns: If the last state has been confirmed
+        :rtype: bool
+        """
+        sent, received = self._last_sent, self._last_received
+        if sent is None or received is None or self._state_changed_time is None:
+            return False
+        if (self._last_received_time or 0) < self._state_changed_time:
+            return False
+        return (sent.ABORT, sent.QDM, sent.STAB, sent.LAUNCH, sent.ARMED) == (
+            received.ABORT,
+            received.QDM,
+            received.STAB,
+            received.LAUNCH,
+            received.ARMED,
+        )
+
+    def _rate_limiter(self) -> TokenBucket | None:
+        """Rate limiter of the link, if writes to it are paced
+
+        :returns: Rate limiter of the link
+        :rtype: TokenBucket | None
+        """
+        strat = self._coms.strategy
+        if isinstance(strat, RateLimitedComsStrategy):
+            return strat.rate_limiter
+        return None
+
+    def _last_sent_size(self) -> int:
+        """Size in bytes of the last sent state
+
+        :returns: Encoded size of the last sent message
+        :rtype: int
+        """
+        return 0 if self._last_sent is None else len(self._last_sent.as_str)
 
     def bind_queue(self, queue: Queueable | None) -> None:
         """Alias for ``bindQueue``
@@ -363,46 +692,6 @@ class Station(ABC):
         return self.armed
 
 
-class _AutoSendOnInterval(Thread):
-    """Thread responsible for background interval sending last message"""
-
-    def __init__(
-        self, resend_func: Callable[[], None], interval: float, *a: Any, **kw: Any
-    ) -> None:
-        """Create a new _AutoSendInterval
-
-        NOTE: This class should only ever be instantiated and interacted
-        with through a ``Station``
-
-        :param resend_func: Callback to resend the last state
-        :type resend_func: Callable[[], None]
-        :param interval: Amount of time to pass before calling the callback
-        :type interval: float
-        """
-        super().__init__(*a, **kw)
-        self.stop_event = Event()
-        self.resend_func = resend_func
-        self.interval = interval
-
-    def run(self) -> None:
-        """In a background thread, wait for an interval ampunt of time before calling the
-        callback until manually told to stop event is set
-        """
-        while not self.stop_event.wait(self.interval):
-            if not self.stop_event.is_set():
-                self.resend_func()
-
-    def stop(self, timeout: float | None = None) -> None:
-        """Method availble to other threads to stop interval sending
-
-        :param timeout: Time to wait for this thread to join. Time of 0
-            or None means to wait forever
-        :type timeout: float | None
-        """
-        self.stop_event.set()
-        self.join(timeout=timeout)
-
-
 class Queueable(Protocol):
     """Protocol of type to be able to queue messages"""
 
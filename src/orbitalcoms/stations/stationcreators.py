@@ -3,9 +3,21 @@ dependency injection
 """
 
 from ..coms.drivers import ComsDriver
-from ..coms.strategies import SerialComsStrategy, SocketComsStrategy
+from ..coms.strategies import (
+    MulticastPublishStrategy,
+    MulticastSubscribeStrategy,
+    ReliableComsStrategy,
+    SeqPacketComsStrategy,
+    SerialComsStrategy,
+    SocketComsStrategy,
+    TeeComsStrategy,
+    UdpComsStrategy,
+)
+from ..coms.strategies.multicaststrat import DEFAULT_GROUP, DEFAULT_PORT
+from ..coms.strategies.strategy import ComsStrategy
 from .groundstation import GroundStation
 from .launchstation import LaunchStation
+from .observerstation import ObserverStation
 
 
 def create_socket_launch_station(
@@ -42,7 +54,141 @@ def create_socket_ground_station(
     return GroundStation(ComsDriver(SocketComsStrategy.connect_to(host, port)))
 
 
-def create_serial_launch_station(port: str, baudrate: int) -> LaunchStation:
+def create_udp_launch_station(
+    host: str = "127.0.1.1", port: int = 5000, reliable: bool = False
+) -> LaunchStation:
+    """Convinence function for creating a Launch Station
+    that communicates using UDP datagrams
+
+    The Launch Station will send its messages to the address of the
+    Ground Station once it has received a datagram from it.
+
+    :param host: The IP address to receive datagrams at
+    :type host: str
+    :param port: port to receive datagrams at
+    :type port: int
+    :param reliable: Acknowledge and retransmit messages using
+        ``ReliableComsStrategy``. The peer must do the same
+    :type reliable: bool
+    :returns: Launch station communicating over UDP
+    :rtype: LaunchStation
+    """
+    return LaunchStation(
+        ComsDriver(_maybe_reliable(UdpComsStrategy.bind_to(host, port), reliable))
+    )
+
+
+def create_udp_ground_station(
+    host: str = "127.0.1.1", port: int = 5000, reliable: bool = False
+) -> GroundStation:
+    """Convinence function for creating a Ground Station
+    that communicates using UDP datagrams
+
+    :param host: The IP address of the Launch Station
+    :type host: str
+    :param port: port the Launch Station receives datagrams at
+    :type port: int
+    :param reliable: Acknowledge and retransmit messages using
+        ``ReliableComsStrategy``. The peer must do the same
+    :type reliable: bool
+    :returns: Ground station communicating over UDP
+    :rtype: GroundStation
+    """
+    return GroundStation(
+        ComsDriver(_maybe_reliable(UdpComsStrategy.connect_to(host, port), reliable))
+    )
+
+
+def create_unix_launch_station(path: str, seqpacket: bool = False) -> LaunchStation:
+    """Convinence function for creating a Launch Station
+    that communicates using a unix domain socket
+
+    :param path: File system path at which to accept a connection
+    :type path: str
+    :param seqpacket: Use a ``SOCK_SEQPACKET`` socket instead of a stream
+    :type seqpacket: bool
+    :returns: Launch station communicating on a unix domain socket
+    :rtype: LaunchStation
+    """
+    strat_type = SeqPacketComsStrategy if seqpacket else SocketComsStrategy
+    return LaunchStation(ComsDriver(strat_type.accept_unix_connection_at(path)))
+
+
+def create_unix_ground_station(path: str, seqpacket: bool = False) -> GroundStation:
+    """Convinence function for creating a Ground Station
+    that communicates using a unix domain socket
+
+    :param path: File system path of the socket to connect to
+    :type path: str
+    :param seqpacket: Use a ``SOCK_SEQPACKET`` socket instead of a stream
+    :type seqpacket: bool
+    :returns: Ground station communicating on a unix domain socket
+    :rtype: GroundStation
+    """
+    strat_type = SeqPacketComsStrategy if seqpacket else SocketComsStrategy
+    return GroundStation(ComsDriver(strat_type.connect_to_unix(path)))
+
+
+def create_multicast_launch_station(
+    host: str = "127.0.1.1",
+    port: int = 5000,
+    group: str = DEFAULT_GROUP,
+    group_port: int = DEFAULT_PORT,
+) -> LaunchStation:
+    """Convinence function for creating a Launch Station
+    that communicates with one Ground Station using a socket connection
+    while also publishing every message it sends to a multicast group
+
+    Any number of read-only consoles made with
+    ``create_multicast_ground_station`` can join the group.
+
+    :param host: The IP address of the host
+    :type host: str
+    :param port: port to connect to
+    :type port: int
+    :param group: Multicast group address to publish to
+    :type group: str
+    :param group_port: port the consoles listen on
+    :type group_port: int
+    :returns: Launch station communicating on a socket and publishing
+        to a multicast group
+    :rtype: LaunchStation
+    """
+    return LaunchStation(
+        ComsDriver(
+            TeeComsStrategy(
+                SocketComsStrategy.accept_connection_at(host, port),
+                MulticastPublishStrategy.create(group, group_port),
+            )
+        )
+    )
+
+
+def create_multicast_ground_station(
+    group: str = DEFAULT_GROUP, group_port: int = DEFAULT_PORT
+) -> ObserverStation:
+    """Convinence function for creating a read-only console
+    that receives the messages a Launch Station publishes to a multicast group
+
+    The console's flags and data mirror the last message received. Messages
+    sent by the console are never delivered and ``send`` will always return
+    ``False``.
+
+    :param group: Multicast group address to join
+    :type group: str
+    :param group_port: port the Launch Station publishes to
+    :type group_port: int
+    :returns: Observer station receiving from a multicast group
+    :rtype: ObserverStation
+    """
+    return ObserverStation(
+        ComsDriver(MulticastSubscribeStrategy.join(group, group_port))
+    )
+
+
+def create_serial_launch_station(
+    port: str, baudrate: int, reliable: bool = False
+) -> LaunchStation:
     """Convinence function for creating a Launch Station
     that communicates using a serial port
 
@@ -50,13 +196,19 @@ def create_serial_launch_station(port: str, baudrate: int) -> LaunchStation:
     :type port: str
     :param baudrate: Baudrate for the connection
     :type baudrate: int
+    :param reliable: Acknowledge and retransmit messages using
+        ``ReliableComsStrategy``. The peer must do the same
+    :type reliable: bool
     :returns: Launch station communicating on given port
     :rtype: LaunchStation
     """
-    return LaunchStation(ComsDriver(SerialComsStrategy.from_args(port, baudrate)))
+    strat = SerialComsStrategy.from_args(port, baudrate)
+    return LaunchStation(ComsDriver(_maybe_reliable(strat, reliable)))
 
 
-def create_serial_ground_station(port: str, baudrate: int) -> GroundStation:
+def create_serial_ground_station(
+    port: str, baudrate: int, reliable: bool = False
+) -> GroundStation:
     """Convinence function for creating a Ground Station
     that communicates using a serial port
 
@@ -64,7 +216,24 @@ def create_serial_ground_station(port: str, baudrate: int) -> GroundStation:
     :type port: str
     :param baudrate: Baudrate for the connection
     :type baudrate: int
+    :param reliable: Acknowledge and retransmit messages using
+        ``ReliableComsStrategy``. The peer must do the same
+    :type reliable: bool
     :returns: Ground station communicating on given port
     :rtype: GroundStation
     """
-    return GroundStation(ComsDriver(SerialComsStrategy.from_args(port, baudrate)))
+    strat = SerialComsStrategy.from_args(port, baudrate)
+    return GroundStation(ComsDriver(_maybe_reliable(strat, reliable)))
+
+
+def _maybe_reliable(strat: ComsStrategy, reliable: bool) -> ComsStrategy:
+    """Wrap a strategy in a ``ReliableComsStrategy`` if requested
+
+    :param strat: Strategy to wrap
+    :type strat: ComsStrategy
+    :param reliable: Whether to wrap the strategy
+    :type reliable: bool
+    :returns: The wrapped or original strategy
+    :rtype: ComsStrategy
+    """
+    return ReliableComsStrategy(strat) if reliable else strat
@@ -0,0 +1,135 @@
+"""Mission state transition rules compiled into lookup tables
+
+The five mission flags of a ``ComsMessage`` form a bitmask with only 32
+possible values, so every (current, new) pair of mission states is checked
+once when this module is imported. Validating a state change is then a
+single table lookup, and a frontend can ask which flags may be toggled from
+the current state without attempting a send.
+"""
+
+from __future__ import annotations
+
+import enum
+from typing import Tuple
+
+from ..coms.messages.message import ComsMessage
+
+
+class MissionFlag(enum.IntFlag):
+    """Bit of each mission flag within a mission state bitmask"""
+
+    ARMED = 1
+    ABORT = 2
+    QDM = 4
+    STAB = 8
+    LAUNCH = 16
+
+
+_STATES = 32
+_ACTIONS = int(
+    MissionFlag.ABORT | MissionFlag.QDM | MissionFlag.STAB | MissionFlag.LAUNCH
+)
+_STICKY = int(MissionFlag.ABORT | MissionFlag.QDM | MissionFlag.LAUNCH)
+_ENDED = int(MissionFlag.ABORT | MissionFlag.QDM)
+
+#: Reason a transition is rejected, indexed by the codes in ``TRANSITIONS``
+REASONS: Tuple[str | None, ...] = (
+    None,
+    "Cannot unarm a station",
+    "Cannot do any action before arm command",
+    "Cannot un-launch, un-abort, or un-QDM",
+    "Cannot launch if not stab or already abort/QDM",
+)
+
+
+def flags_of(m: ComsMessage | None) -> int:
+    """Mission state bitmask of a message
+
+    :param m: Message to read flags from. None is treated as no flags set
+    :type m: ComsMessage | None
+    :returns: Bitmask of ``MissionFlag``
+    :rtype: int
+    """
+    if m is None:
+        return 0
+    return (
+        (MissionFlag.ARMED if m.ARMED else 0)
+        | (MissionFlag.ABORT if m.ABORT else 0)
+        | (MissionFlag.QDM if m.QDM else 0)
+        | (MissionFlag.STAB if m.STAB else 0)
+        | (MissionFlag.LAUNCH if m.LAUNCH else 0)
+    )
+
+
+def _rule(current: int, new: int) -> int:
+    """Evaluate the mission rules for one transition
+
+    :returns: Index into ``REASONS`` of why the transition is rejected, or 0
+    :rtype: int
+    """
+    armed = current & MissionFlag.ARMED
+    # If armed, do not unarm
+    if armed and not new & MissionFlag.ARMED:
+        return 1
+    # If not armed, do not abort, launch, stab, or qdm
+    if not armed and new & _ACTIONS:
+        return 2
+    # Do not un-abort, un-launch, or un-qdm
+    if current & _STICKY & ~new:
+        return 3
+    # Do not launch if not stab, or have qdm/aborted
+    if new & ~current & MissionFlag.LAUNCH and (
+        not current & MissionFlag.STAB or current & _ENDED
+    ):
+        return 4
+    return 0
+
+
+#: Rejection code of every transition, indexed by ``current << 5 | new``.
+#: Zero means the transition is allowed
+TRANSITIONS = bytes(
+    _rule(current, new) for current in range(_STATES) for new in range(_STATES)
+)
+
+#: Bitmask of the flags that may be toggled from each mission state
+TOGGLES = tuple(
+    sum(flag for flag in MissionFlag if not TRANSITIONS[current << 5 | current ^ flag])
+    for current in range(_STATES)
+)
+
+
+def check_transition(current: int, new: int) -> str | None:
+    """Why a mission state change is not allowed
+
+    :param current: Bitmask of the current mission state
+    :type current: int
+    :param new: Bitmask of the new mission state
+    :type new: int
+    :returns: Reason the change is rejected, or None if it is allowed
+    :rtype: str | None
+    """
+    return REASONS[TRANSITIONS[current << 5 | new]]
+
+
+def is_valid_transition(current: int, new: int) -> bool:
+    """Whether a mission state change is allowed
+
+    :param current: Bitmask of the current mission state
+    :type current: int
+    :param new: Bitmask of the new mission state
+    :type new: int
+    :returns: Whether the change is allowed
+    :rtype: bool
+    """
+    return not TRANSITIONS[current << 5 | new]
+
+
+def allowed_toggles(current: int) -> MissionFlag:
+    """Flags that may be toggled on their own from a mission state
+
+    :param current: Bitmask of the current mission state
+    :type current: int
+    :returns: Flags that can be toggled
+    :rtype: MissionFlag
+    """
+    return MissionFlag(TOGGLES[current])
@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+from orbitalcoms.stations.resend import AdaptiveResend
+
+
+class _Stamps:
+    """Queue recording when each message arrived"""
+
+    def __init__(self):
+        self.times: List[float] = []
+
+    def append(self, m):
+        self.times.append(time.monotonic())
+
+
+@pytest.fixture
+def stations():
+    bus = InProcessBus()
+    gs = GroundStation(ComsDriver(bus.connect()))
+    ls = LaunchStation(ComsDriver(bus.connect()))
+    yield gs, ls
+    gs.close()
+    ls.close()
+
+
+def test_policy_backs_off_only_when_confirmed():
+    policy = AdaptiveResend(min_interval=1, max_interval=5, backoff=2)
+    assert policy.first_interval(100) == 1
+    assert policy.next_interval(1, False, 100) == 1
+    assert policy.next_interval(1, True, 100) == 2
+    assert policy.next_interval(4, True, 100) == 5
+
+
+def test_policy_respects_budget():
+    policy = AdaptiveResend(min_interval=0.1, max_interval=5, budget=100)
+    assert policy.first_interval(50) == 0.5
+    assert policy.next_interval(0.1, False, 50) == 0.5
+    assert policy.next_interval(4, True, 1000) == 10
+
+
+@pytest.mark.parametrize(
+    "min_interval, max_interval",
+    [(0.5, 0), (0, 1), (-1, 1), (2, 1)],
+)
+def test_policy_rejects_invalid_intervals(min_interval, max_interval):
+    with pytest.raises(ValueError):
+        AdaptiveResend(min_interval=min_interval, max_interval=max_interval)
+
+
+def test_send_does_not_spawn_threads(stations):
+    gs, _ = stations
+    gs.set_send_interval(10)
+    gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+    before = threading.active_count()
+    for _ in range(10):
+        gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+    assert threading.active_count() == before
+
+
+def test_resends_fast_until_echoed_then_backs_off(stations):
+    gs, ls = stations
+    stamps = _Stamps()
+    ls.bind_queue(stamps)
+    gs.set_adaptive_resend(AdaptiveResend(min_interval=0.05, max_interval=0.4))
+    m = ComsMessage(0, 0, 0, 0, ARMED=1)
+    gs.send(m)
+    time.sleep(0.3)
+    unconfirmed = len(stamps.times)
+    assert unconfirmed >= 4
+
+    ls.send(m)  # Launch station echoes the new state
+    time.sleep(0.1)
+    start = len(stamps.times)
+    time.sleep(0.8)
+    backed_off = stamps.times[start:]
+    gaps = [b - a for a, b in zip(backed_off, backed_off[1:])]
+    assert len(backed_off) <= 4
+    assert gaps == sorted(gaps)
+
+
+def test_state_change_shrinks_interval(stations):
+    gs, ls = stations
+    stamps = _Stamps()
+    ls.bind_queue(stamps)
+    gs.set_adaptive_resend(AdaptiveResend(min_interval=0.05, max_interval=1))
+    armed = ComsMessage(0, 0, 0, 0, ARMED=1)
+    gs.send(armed)
+    ls.send(armed)
+    time.sleep(0.5)
+    stamps.times.clear()
+    gs.send(ComsMessage(0, 0, 1, 0, ARMED=1))
+    time.sleep(0.3)
+    assert len(stamps.times) >= 4
+
+
+def test_same_state_does_not_restart_confirmation(stations):
+    gs, ls = stations
+    gs.set_adaptive_resend(AdaptiveResend(min_interval=0.05, max_interval=1))
+    armed = ComsMessage(0, 0, 0, 0, ARMED=1)
+    gs.send(armed)
+    ls.send(armed)
+    time.sleep(0.3)
+    assert gs._state_confirmed()
+    confirmed_delay = gs._resend_delay
+    assert confirmed_delay > 0.05
+    # Sending the same flags again, e.g. with new data, is not a state change
+    gs.send(ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"note": "still armed"}))
+    assert gs._state_confirmed()
+    assert gs._resend_delay == confirmed_delay
+    gs.send(ComsMessage(0, 0, 1, 0, ARMED=1))
+    assert not gs._state_confirmed()
+    assert gs._resend_delay == 0.05
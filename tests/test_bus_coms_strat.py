@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.drivers.driverreadloop import ComsDriverPollingReadLoop
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus, InProcessBusStrategy
+from orbitalcoms.coms.subscribers.subscription import ComsSubscription
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+
+
+@pytest.fixture
+def bus():
+    return InProcessBus()
+
+
+def test_write_fans_out_to_all_other_members(bus: InProcessBus):
+    a, b, c = bus.connect(), bus.connect(), bus.connect()
+    m = ComsMessage(0, 0, 1, 0, ARMED=1, DATA={"msg": "hello"})
+
+    a.write(m)
+
+    assert b.poll(timeout=1) is m
+    assert c.poll(timeout=1) is m
+    assert a.poll(timeout=0) is None
+
+
+def test_many_writers_many_readers(bus: InProcessBus):
+    writers = [bus.connect() for _ in range(3)]
+    readers = [bus.connect() for _ in range(3)]
+
+    for i, w in enumerate(writers):
+        w.write(ComsMessage(0, 0, 0, 0, DATA={"from": i}))
+
+    for r in readers:
+        assert sorted(r.read().DATA["from"] for _ in range(3)) == [0, 1, 2]
+
+
+def test_poll_times_out(bus: InProcessBus):
+    a = bus.connect()
+    start = time.time()
+    assert a.poll(timeout=0.2) is None
+    assert time.time() - start >= 0.2
+
+
+def test_poll_wakes_on_write(bus: InProcessBus):
+    a, b = bus.connect(), bus.connect()
+    m = ComsMessage(1, 0, 0, 0)
+    t = threading.Timer(0.1, lambda: a.write(m))
+    t.start()
+    assert b.poll(timeout=5) is m
+    t.join()
+
+
+def test_bounded_inbox_drops_oldest(bus: InProcessBus):
+    a, b = bus.connect(), bus.connect(maxlen=2)
+    for i in range(5):
+        a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+
+    assert b.dropped == 3
+    assert b.poll(timeout=0).DATA["i"] == 3
+    assert b.poll(timeout=0).DATA["i"] == 4
+
+
+def test_close_leaves_bus(bus: InProcessBus):
+    a, b = bus.connect(), bus.connect()
+    b.close()
+    assert b not in bus.members
+    a.write(ComsMessage(0, 0, 0, 0))
+    assert b.poll(timeout=0) is None
+
+
+def test_driver_reads_bus_from_thread(bus: InProcessBus):
+    a = ComsDriver(bus.connect())
+    b = ComsDriver(bus.connect())
+    read: List[ComsMessage] = []
+    b.register_subscriber(ComsSubscription(read.append))
+
+    loop = b.start_read_loop()
+    assert isinstance(loop, ComsDriverPollingReadLoop)
+
+    for i in range(1000):
+        a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+
+    deadline = time.time() + 5
+    while len(read) < 1000 and time.time() < deadline:
+        time.sleep(0.01)
+    b.end_read_loop()
+
+    assert [m.DATA["i"] for m in read] == list(range(1000))
+    assert not b.is_reading
+
+
+def test_stations_over_bus():
+    gs_strat = InProcessBusStrategy()
+    ls_strat = gs_strat.bus.connect()
+
+    with GroundStation(ComsDriver(gs_strat)) as gs, LaunchStation(
+        ComsDriver(ls_strat)
+    ) as ls:
+        ls_read: List[ComsMessage] = []
+        ls.bind_queue(ls_read)
+
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        assert gs.send(ComsMessage(0, 0, 1, 0, ARMED=1))
+        time.sleep(0.5)
+
+        assert len(ls_read) == 2
+        assert ls.armed and ls.stab
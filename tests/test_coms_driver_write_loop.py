@@ -0,0 +1,224 @@
+import threading
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.drivers.driverwriteloop import ComsDriverWriteLoop, WritePriority
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.envelope import attach_meta, split_meta
+from orbitalcoms.coms.messages.message import ComsMessage
+
+
+class _GatedStrategy:
+    """Strategy whose writes block until the gate is opened"""
+
+    def __init__(self):
+        self.written: List[ComsMessage] = []
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.fail = False
+
+    def read(self):
+        raise NotImplementedError
+
+    def write(self, m):
+        self.entered.set()
+        self.gate.wait(5)
+        if self.fail:
+            raise OSError("link down")
+        self.written.append(m)
+
+
+@pytest.fixture
+def gated():
+    strat = _GatedStrategy()
+    loop = ComsDriverWriteLoop(strat, daemon=True)
+    loop.start()
+    yield strat, loop
+    strat.gate.set()
+    loop.stop(5)
+
+
+def _telemetry(n, abort=0):
+    return ComsMessage(abort, 0, 0, 0, ARMED=1, DATA={"n": n})
+
+
+def test_command_overtakes_queued_telemetry(gated):
+    strat, loop = gated
+    first = loop.submit(_telemetry(0), WritePriority.TELEMETRY)
+    strat.entered.wait(1)
+    rest = [loop.submit(_telemetry(n), WritePriority.TELEMETRY) for n in (1, 2)]
+    bulk = loop.submit(_telemetry(3), WritePriority.BULK)
+    abort = loop.submit(ComsMessage(1, 0, 0, 0, ARMED=1))
+    assert abort.priority == WritePriority.COMMAND
+    strat.gate.set()
+    for p in [first, *rest, bulk, abort]:
+        assert p.wait(1)
+    # The frame already being written finishes first, then the abort
+    assert [m.DATA for m in strat.written] == [
+        {"n": 0},
+        None,
+        {"n": 1},
+        {"n": 2},
+        {"n": 3},
+    ]
+    # Telemetry queued before the abort must not appear to undo it
+    assert all(m.ABORT == 1 for m in strat.written[1:4])
+
+
+def test_control_frames_do_not_rewrite_commands(gated):
+    strat, loop = gated
+    first = loop.submit(ComsMessage(0, 0, 0, 0, ARMED=0, DATA={"n": 0}))
+    strat.entered.wait(1)
+    arm = loop.submit(ComsMessage(0, 0, 0, 0, ARMED=1))
+    # A pong echoes the flags of the other station, which has not armed yet
+    pong = loop.submit(attach_meta(ComsMessage(0, 0, 0, 0, ARMED=0), ctl=1, pong=1))
+    stale = loop.submit(
+        ComsMessage(0, 0, 0, 0, ARMED=0, DATA={"n": 1}), WritePriority.TELEMETRY
+    )
+    strat.gate.set()
+    for p in (first, arm, pong, stale):
+        assert p.wait(1)
+    # The command keeps its flags, the pong is sent as it was and the
+    # telemetry follows the command rather than the pong
+    assert [(m.ARMED, "ctl" in split_meta(m)[1]) for m in strat.written] == [
+        (0, False),
+        (1, False),
+        (0, True),
+        (1, False),
+    ]
+
+
+def test_messages_are_classified(gated):
+    strat, loop = gated
+    strat.gate.set()
+    assert loop.submit(ComsMessage(0, 0, 0, 0, ARMED=1)).priority == (
+        WritePriority.COMMAND
+    )
+    assert loop.submit(ComsMessage(0, 0, 0, 0, ARMED=1)).priority == (
+        WritePriority.STATE
+    )
+    assert loop.submit(_telemetry(1)).priority == WritePriority.TELEMETRY
+    assert loop.submit(_telemetry(1, abort=1)).priority == WritePriority.COMMAND
+
+
+def test_lane_stats(gated):
+    strat, loop = gated
+    pending = [loop.submit(_telemetry(n), WritePriority.TELEMETRY) for n in range(4)]
+    strat.entered.wait(1)
+    stats = loop.stats[WritePriority.TELEMETRY]
+    assert stats.depth == 3
+    assert stats.max_depth == 4
+    strat.gate.set()
+    for p in pending:
+        p.wait(1)
+    stats = loop.stats[WritePriority.TELEMETRY]
+    assert stats.depth == 0
+    assert stats.written == 4
+    assert stats.max_wait >= stats.mean_wait > 0
+    assert loop.stats[WritePriority.COMMAND].written == 0
+
+
+def test_failed_write_is_reported(gated):
+    strat, loop = gated
+    strat.fail = True
+    strat.gate.set()
+    with pytest.raises(ComsDriverWriteError):
+        loop.submit(_telemetry(0)).wait(1)
+    assert loop.stats[WritePriority.COMMAND].failed == 1
+
+
+def test_stop_writes_queued_messages(gated):
+    strat, loop = gated
+    pending = [loop.submit(_telemetry(n)) for n in range(3)]
+    strat.gate.set()
+    loop.stop(1)
+    assert not loop.is_alive()
+    assert all(p.wait(0) for p in pending)
+    with pytest.raises(ComsDriverWriteError):
+        loop.submit(_telemetry(4))
+
+
+def test_driver_writes_through_write_loop():
+    strat = _GatedStrategy()
+    strat.gate.set()
+    coms = ComsDriver(strat)
+    assert coms.write_stats[WritePriority.COMMAND].written == 0
+    coms.start_write_loop()
+    assert coms.write(ComsMessage(1, 0, 0, 0))
+    assert coms.write(_telemetry(1, abort=1), priority=WritePriority.BULK)
+    assert coms.write_stats[WritePriority.COMMAND].written == 1
+    assert coms.write_stats[WritePriority.BULK].written == 1
+    strat.fail = True
+    assert not coms.write(ComsMessage(0, 0, 0, 0), suppress_errors=True)
+    with pytest.raises(ComsDriverWriteError):
+        coms.write(ComsMessage(0, 0, 0, 0))
+    coms.end_write_loop(1)
+    strat.fail = False
+    assert coms.write(ComsMessage(0, 0, 0, 0))
+    assert len(strat.written) == 3
+
+
+def test_nowait_telemetry_is_coalesced(gated):
+    strat, loop = gated
+    loop.submit(_telemetry(0), WritePriority.TELEMETRY, nowait=True)
+    strat.entered.wait(1)
+    for n in range(1, 10):
+        loop.submit(_telemetry(n), nowait=True)
+    stats = loop.stats[WritePriority.TELEMETRY]
+    assert stats.depth == 1
+    assert stats.coalesced == 8
+    strat.gate.set()
+    loop.stop(1)
+    assert [m.DATA for m in strat.written] == [{"n": 0}, {"n": 9}]
+
+
+def test_commands_and_waited_writes_are_not_coalesced(gated):
+    strat, loop = gated
+    loop.submit(_telemetry(0), WritePriority.TELEMETRY, nowait=True)
+    strat.entered.wait(1)
+    loop.submit(_telemetry(1), nowait=True)
+    waited = loop.submit(_telemetry(2))
+    loop.submit(_telemetry(3), nowait=True)
+    loop.submit(_telemetry(4), nowait=True)
+    loop.submit(_telemetry(5, abort=1), nowait=True)
+    loop.submit(_telemetry(6, abort=0), nowait=True)
+    strat.gate.set()
+    assert waited.wait(1)
+    loop.stop(1)
+    assert [m.DATA["n"] for m in strat.written] == [0, 5, 6, 1, 2, 4]
+    assert loop.stats[WritePriority.TELEMETRY].coalesced == 1
+
+
+def test_control_frames_are_not_coalesced(gated):
+    strat, loop = gated
+    state = ComsMessage(0, 0, 0, 0, ARMED=1)
+    loop.submit(state, WritePriority.STATE, nowait=True)
+    strat.entered.wait(1)
+    loop.submit(state, WritePriority.STATE, nowait=True)
+    loop.submit(attach_meta(state, ctl=1, ping=1), WritePriority.STATE, nowait=True)
+    loop.submit(state, WritePriority.STATE, nowait=True)
+    loop.submit(attach_meta(state, ctl=1, ping=2), WritePriority.STATE, nowait=True)
+    strat.gate.set()
+    loop.stop(1)
+    assert [split_meta(m)[1].get("ping") for m in strat.written] == [
+        None,
+        None,
+        1,
+        None,
+        2,
+    ]
+    assert loop.stats[WritePriority.STATE].coalesced == 0
+
+
+def test_driver_write_nowait_starts_write_loop():
+    strat = _GatedStrategy()
+    strat.gate.set()
+    coms = ComsDriver(strat)
+    assert coms.write_nowait(ComsMessage(0, 0, 0, 0))
+    assert not coms.write_nowait("Invalid", suppress_errors=True)
+    with pytest.raises(ComsDriverWriteError):
+        coms.write_nowait("Invalid")
+    coms.end_write_loop(1)
+    assert len(strat.written) == 1
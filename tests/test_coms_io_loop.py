@@ -0,0 +1,180 @@
+import threading as th
+import time
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.drivers.ioloop import ComsIOLoop
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.coms.strategies.socketstrat import (
+    FRAME_HEADER_SIZE,
+    SocketComsStrategy,
+    encode_frame,
+)
+from orbitalcoms.coms.subscribers.subscription import ComsSubscription
+
+
+def msg(n: int) -> ComsMessage:
+    return ComsMessage(ABORT=0, QDM=0, STAB=0, LAUNCH=0, ARMED=0, DATA={"n": n})
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def loop():
+    loop = ComsIOLoop()
+    yield loop
+    loop.stop(timeout=5)
+
+
+def test_reads_many_sockets_from_one_thread(loop: ComsIOLoop):
+    pairs = [SocketComsStrategy.socketpair() for _ in range(10)]
+    received = {i: [] for i in range(len(pairs))}
+    threads = []
+    for i, (a, _) in enumerate(pairs):
+        loop.add(a, lambda m, i=i: received[i].append((m, th.current_thread())))
+    for i, (_, b) in enumerate(pairs):
+        for n in range(5):
+            b.write(msg(100 * i + n))
+
+    assert wait_for(lambda: all(len(r) == 5 for r in received.values()))
+    for i, r in received.items():
+        assert [m.DATA["n"] for m, _ in r] == [100 * i + n for n in range(5)]
+        threads.extend(t for _, t in r)
+    assert set(threads) == {loop}
+    assert loop.stats.serviced == 10
+    assert loop.stats.polled == 0
+    assert loop.stats.messages == 50
+
+
+def test_polls_strategies_without_file_descriptor(loop: ComsIOLoop):
+    bus = InProcessBus()
+    a, b = bus.connect(), bus.connect()
+    received = []
+    loop.add(a, received.append)
+    b.write(msg(1))
+    assert wait_for(lambda: len(received) == 1)
+    assert loop.stats.polled == 1
+
+
+def test_remove_stops_reading(loop: ComsIOLoop):
+    a, b = SocketComsStrategy.socketpair()
+    received = []
+    loop.add(a, received.append)
+    assert loop.is_reading(a)
+    loop.remove(a)
+    assert not loop.is_reading(a)
+    b.write(msg(1))
+    time.sleep(0.2)
+    assert received == []
+    assert a.poll(timeout=1) == msg(1)
+
+
+def test_backs_off_failing_strategy(loop: ComsIOLoop):
+    class Broken:
+        polls = 0
+
+        def read(self):
+            raise RuntimeError
+
+        def write(self, m):
+            pass
+
+        def poll(self, timeout=None):
+            Broken.polls += 1
+            raise RuntimeError
+
+    loop.error_backoff = 0.1
+    loop.add(Broken(), lambda m: None)
+    time.sleep(0.5)
+    assert 2 <= Broken.polls <= 10
+    assert loop.stats.errors == Broken.polls
+
+
+def test_driver_reads_from_shared_loop(loop: ComsIOLoop):
+    a, b = SocketComsStrategy.socketpair()
+    driver = ComsDriver(a, io_loop=loop)
+    received = []
+    driver.register_subscriber(ComsSubscription(received.append))
+    assert driver.start_read_loop() is loop
+    assert driver.is_reading
+    ComsDriver(b).write(msg(1))
+    assert wait_for(lambda: len(received) == 1)
+    driver.end_read_loop()
+    assert not driver.is_reading
+    assert loop.is_alive()
+
+
+def test_drops_closed_strategy(loop: ComsIOLoop):
+    class Closed:
+        polls = 0
+        closed = False
+
+        def read(self):
+            raise RuntimeError
+
+        def write(self, m):
+            pass
+
+        def poll(self, timeout=None):
+            Closed.polls += 1
+            raise RuntimeError
+
+    loop.error_backoff = 0.05
+    strategy = Closed()
+    loop.add(strategy, lambda m: None)
+    assert wait_for(lambda: Closed.polls >= 1)
+    strategy.closed = True
+    assert wait_for(lambda: not loop.is_reading(strategy))
+    polls = Closed.polls
+    time.sleep(0.3)
+    assert Closed.polls == polls
+    assert loop.stats.closed == 1
+    assert loop.stats.serviced == 0
+
+
+def test_drops_closed_socket(loop: ComsIOLoop):
+    a, b = SocketComsStrategy.socketpair()
+    driver = ComsDriver(a, io_loop=loop)
+    driver.start_read_loop()
+    a.sock.close()
+    # Another strategy being added wakes the loop
+    loop.add(InProcessBus().connect(), lambda m: None)
+    assert wait_for(lambda: not driver.is_reading)
+    assert loop.stats.closed == 1
+
+
+def test_half_sent_frame_does_not_stall_loop(loop: ComsIOLoop):
+    a, b = SocketComsStrategy.socketpair()
+    bus = InProcessBus()
+    c, d = bus.connect(), bus.connect()
+    from_socket = []
+    from_bus = []
+    loop.add(a, from_socket.append)
+    loop.add(c, from_bus.append)
+    framed = encode_frame(msg(2))
+    # Only the header of a message arrives
+    b.sock.sendall(framed[:FRAME_HEADER_SIZE])
+    time.sleep(0.1)
+    d.write(msg(1))
+    assert wait_for(lambda: len(from_bus) == 1)
+    assert from_socket == []
+    b.sock.sendall(framed[FRAME_HEADER_SIZE:])
+    assert wait_for(lambda: len(from_socket) == 1)
+    assert from_socket == [msg(2)]
+
+
+def test_drops_socket_peer_hung_up(loop: ComsIOLoop):
+    a, b = SocketComsStrategy.socketpair()
+    loop.error_backoff = 0.05
+    loop.add(a, lambda m: None)
+    b.sock.close()
+    assert wait_for(lambda: not loop.is_reading(a))
+    assert loop.stats.closed == 1
+    assert loop.stats.errors == 0
@@ -0,0 +1,45 @@
+from orbitalcoms._app.dashboard import DashboardModel, render
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.stations.linkmonitor import LinkQuality, LinkState
+from orbitalcoms.stations.snapshot import StationSnapshot
+
+
+def test_model_counts_messages():
+    model = DashboardModel(window=10)
+    assert model.received == 0 and model.rate() == 0
+    for _ in range(20):
+        model.append(ComsMessage(0, 0, 0, 0))
+    assert model.received == 20
+    assert model.rate() == 2
+
+
+def test_render():
+    sent = ComsMessage(0, 0, 0, 0, ARMED=1)
+    recv = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"GPS": {"alt": 1234.5}})
+    snap = StationSnapshot(
+        sequence=2,
+        last_sent=sent,
+        last_sent_time=1.0,
+        last_received=recv,
+        last_received_time=2.0,
+        data=recv.DATA,
+    )
+    quality = LinkQuality(LinkState.GOOD, 0.05, 0.01, 0.25, 0.5)
+    model = DashboardModel()
+    model.append(recv)
+
+    lines = render(snap, quality, model, ["GPS.alt", "temp"])
+    assert any(line.split() == ["ARMED", "1", "1"] for line in lines)
+    assert any(line.split() == ["ABORT", "0", "0"] for line in lines)
+    assert any(line.split() == ["GPS.alt", "1234.5"] for line in lines)
+    assert any(line.split() == ["temp", "-"] for line in lines)
+    assert any("good" in line for line in lines)
+    assert any("50.0 ms" in line for line in lines)
+    assert any("25%" in line for line in lines)
+
+
+def test_render_empty_station():
+    quality = LinkQuality(LinkState.UNKNOWN, None, 0.0, 0.0, None)
+    lines = render(StationSnapshot(), quality, DashboardModel(), ["GPS.alt"])
+    assert any(line.split() == ["ARMED", "-", "-"] for line in lines)
+    assert any(line.split() == ["GPS.alt", "-"] for line in lines)
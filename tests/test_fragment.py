@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+
+import pytest
+
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.fragment import Reassembler, fragment
+from orbitalcoms.coms.strategies.udpstrat import UdpComsStrategy
+
+PAYLOAD = bytes(range(48, 123)) * 4
+
+
+def test_small_payload_is_not_fragmented():
+    assert fragment(b'{"a": 1}', 64, 1) == [b'{"a": 1}']
+
+
+def test_fragments_fit_mtu_and_reassemble():
+    frags = fragment(PAYLOAD, 40, 0xAB)
+    assert len(frags) > 1
+    assert all(len(f) <= 40 for f in frags)
+    assert frags[0].startswith(b"#ab.0.%d|" % len(frags))
+    r = Reassembler()
+    results = [r.feed(f) for f in reversed(frags)]
+    assert results[:-1] == [None] * (len(frags) - 1)
+    assert results[-1] == PAYLOAD
+    assert r.stats.reassembled == 1
+    assert r.pending == 0
+
+
+def test_mtu_too_small():
+    with pytest.raises(ValueError):
+        fragment(PAYLOAD, 8, 0xFFFF)
+
+
+def test_lost_fragment_only_costs_its_message():
+    r = Reassembler()
+    first = fragment(PAYLOAD, 40, 1)
+    second = fragment(PAYLOAD[::-1], 40, 2)
+    for f in first[1:]:
+        assert r.feed(f) is None
+    results = [r.feed(f) for f in second]
+    assert results[-1] == PAYLOAD[::-1]
+    assert r.pending == 1
+
+
+def test_fragments_from_different_sources_are_kept_apart():
+    r = Reassembler()
+    a, b = fragment(PAYLOAD, 200, 1)
+    assert r.feed(a, source="x") is None
+    assert r.feed(b, source="y") is None
+    assert r.pending == 2
+
+
+def test_incomplete_messages_expire_and_are_evicted():
+    r = Reassembler(max_pending=2, timeout=0.05)
+    for msg_id in range(3):
+        r.feed(fragment(PAYLOAD, 40, msg_id)[0])
+    assert r.stats.evicted == 1
+    assert r.pending == 2
+    time.sleep(0.1)
+    r.feed(fragment(PAYLOAD, 40, 9)[0])
+    assert r.stats.expired == 2
+    assert r.pending == 1
+
+
+@pytest.mark.parametrize(
+    "frame", [b"#zz.0.2|data", b"#1.2.2|data", b"#1.0|data", b"#no header"]
+)
+def test_malformed_fragments_are_dropped(frame):
+    r = Reassembler()
+    assert r.feed(frame) is None
+    assert r.stats.malformed == 1
+
+
+def test_udp_fragments_large_messages():
+    a = UdpComsStrategy.bind_to("127.0.0.1", 0)
+    b = UdpComsStrategy(a.sock.__class__(a.sock.family, a.sock.type), mtu=128)
+    b.peer = a.sock.getsockname()
+    try:
+        big = ComsMessage(0, 0, 0, 0, DATA={"blob": "x" * 1000})
+        b.write(big)
+        b.write(ComsMessage(1, 0, 0, 0))
+        assert a.poll(1) == big
+        assert a.poll(1) == ComsMessage(1, 0, 0, 0)
+        assert a.stats.received == 2
+        assert a.stats.lost == 0
+        assert a.reassembler.stats.reassembled == 1
+        b.mtu = 16
+        with pytest.raises(ComsDriverWriteError):
+            b.write(big)
+    finally:
+        a.sock.close()
+        b.sock.close()
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Requires pty")
+def test_serial_fragments_large_messages():
+    import pty
+
+    from orbitalcoms.coms.strategies.serialstrat import SerialComsStrategy
+
+    m, s = pty.openpty()
+    try:
+        strat = SerialComsStrategy.from_args(os.ttyname(s), 115200)
+        strat.mtu = 64
+        big = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"blob": "y" * 300})
+        strat.write(big)
+        strat.write(ComsMessage(0, 0, 0, 0))
+        time.sleep(0.1)
+        raw = os.read(m, 3000)
+        frames = raw.split(b"\r")[:-1]
+        assert len(frames) > 2
+        assert all(len(f) + 1 <= 64 for f in frames)
+        # Loop what was written back in to be read
+        os.write(m, raw)
+        assert strat.read() == big
+        assert strat.read() == ComsMessage(0, 0, 0, 0)
+        assert strat.reassembler.pending == 0
+    finally:
+        os.close(m)
+        os.close(s)
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Requires pty")
+def test_serial_fragment_stats_update_through_driver():
+    import pty
+
+    from orbitalcoms.coms.drivers.driver import ComsDriver
+    from orbitalcoms.coms.strategies.serialstrat import SerialComsStrategy
+
+    m, s = pty.openpty()
+    try:
+        strat = SerialComsStrategy.from_args(os.ttyname(s), 115200)
+        strat.mtu = 64
+        big = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"blob": "z" * 300})
+        strat.write(big)
+        time.sleep(0.1)
+        raw = os.read(m, 3000)
+        coms = ComsDriver(strat)
+        coms.start_read_loop()
+        try:
+            os.write(m, raw)
+            assert coms.read(timeout=5) == big
+        finally:
+            coms.end_read_loop()
+        # Messages are reassembled by this process, not a read loop's child
+        assert strat.reassembler.stats.reassembled == 1
+        assert strat.reassembler.stats.fragments == len(raw.split(b"\r")) - 1
+    finally:
+        os.close(m)
+        os.close(s)
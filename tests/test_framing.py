@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+
+import pytest
+
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.framing import (
+    CobsFramer,
+    Framing,
+    cobs_decode,
+    cobs_encode,
+    crc16,
+    crc32,
+)
+
+
+def test_crc_check_values():
+    assert crc16(b"123456789") == 0x29B1
+    assert crc32(b"123456789") == 0xCBF43926
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\0",
+        b"\0\0",
+        b"abc\0def",
+        bytes(range(1, 255)),
+        bytes(range(1, 256)) * 3,
+        (b"\0" + bytes(range(1, 255))) * 2 + b"\0",
+    ],
+)
+def test_cobs_round_trip(data):
+    encoded = cobs_encode(data)
+    assert b"\0" not in encoded
+    assert len(encoded) <= len(data) + 1 + len(data) // 254 + 1
+    assert cobs_decode(encoded) == data
+
+
+def test_cobs_rejects_truncated_frames():
+    with pytest.raises(ValueError):
+        cobs_decode(b"\x05ab")
+
+
+@pytest.mark.parametrize("crc_bits", [16, 32])
+def test_framer_round_trip(crc_bits):
+    framer = CobsFramer(crc_bits)
+    frames = b"".join(framer.encode(p) for p in (b"a\0b", b"", b"\r\n" * 100))
+    assert framer.feed(frames) == [b"a\0b", b"", b"\r\n" * 100]
+    assert framer.stats.frames == 3
+
+
+def test_framer_drops_only_corrupt_frame():
+    framer = CobsFramer()
+    good = framer.encode(b'{"DATA": "a\\rb"}')
+    bad = bytearray(framer.encode(b"corrupt me"))
+    bad[3] ^= 0x40
+    # Frames split across reads are reassembled
+    stream = good + bytes(bad) + good
+    payloads = []
+    for start in range(0, len(stream), 7):
+        end = start + 7
+        payloads += framer.feed(stream[start:end])
+    assert payloads == [b'{"DATA": "a\\rb"}'] * 2
+    assert framer.stats.crc_errors == 1
+    assert framer.stats.error_rate == pytest.approx(1 / 3)
+
+
+def test_framer_resyncs_after_overrun():
+    framer = CobsFramer(max_frame=32)
+    noise = b"\x01" * 100
+    assert framer.feed(noise + framer.encode(b"lost")) == []
+    assert framer.feed(framer.encode(b"kept")) == [b"kept"]
+    assert framer.stats.overruns == 1
+    assert framer.stats.discarded == 100 + len(framer.encode(b"lost")) - 1
+    assert framer.feed(b"\x09\0") == []
+    assert framer.stats.decode_errors == 1
+
+
+def test_max_payload_fits_mtu():
+    framer = CobsFramer(32)
+    for mtu in (16, 64, 300, 1000):
+        size = framer.max_payload(mtu)
+        assert len(framer.encode(b"\xff" * size)) <= mtu
+        assert len(framer.encode(b"\xff" * (size + 1))) > mtu
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="Requires pty")
+def test_serial_cobs_framing():
+    import pty
+
+    from orbitalcoms.coms.drivers.driver import ComsDriver
+    from orbitalcoms.coms.strategies.serialstrat import SerialComsStrategy
+
+    m, s = pty.openpty()
+    try:
+        strat = SerialComsStrategy.from_args(
+            os.ttyname(s), 115200, framing=Framing.COBS
+        )
+        strat.mtu = 48
+        msg = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"text": "line\rbreak" * 20})
+        strat.write(msg)
+        time.sleep(0.1)
+        raw = os.read(m, 3000)
+        assert b"\r" not in raw.replace(b"\\r", b"")
+        frames = raw.split(b"\0")[:-1]
+        assert len(frames) > 2
+        assert all(len(f) + 1 <= 48 for f in frames)
+        # A corrupt frame ahead of the message is dropped on its own
+        corrupt = bytearray(strat.framer.encode(b"{}"))
+        corrupt[1] ^= 1
+        os.write(m, bytes(corrupt) + raw)
+        coms = ComsDriver(strat)
+        coms.start_read_loop()
+        assert coms.read(timeout=5) == msg
+        coms.end_read_loop()
+        assert strat.line_stats.crc_errors == 1
+        assert strat.line_stats.frames == len(frames)
+    finally:
+        os.close(m)
+        os.close(s)
@@ -10,8 +10,10 @@ from orbitalcoms.coms.strategies.localstrat import (
     LocalComsStrategy,
     get_linked_local_strats,
 )
+from orbitalcoms.coms.strategies.socketstrat import SocketComsStrategy
 from orbitalcoms.coms.subscribers.subscription import ComsSubscription
 from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.transitions import MissionFlag
 
 
 @pytest.fixture
@@ -22,7 +24,7 @@ def gs_and_loc() -> Tuple[GroundStation, ComsDriver]:
     gs = GroundStation(a)
 
     yield gs, b
-    a.end_read_loop()
+    gs.close()
     b.end_read_loop()
 
 
@@ -207,3 +209,76 @@ def test_clean_up_on_end_ctx():
         time.sleep(1)
         assert th.active_count() == starting_num_threads + 1
     assert th.active_count() == starting_num_threads
+
+
+def test_send_nowait(gs_and_loc: Tuple[GroundStation, ComsDriver]):
+    gs, loc = gs_and_loc
+    received: List[ComsMessage] = []
+    loc.register_subscriber(ComsSubscription(lambda m: received.append(m)))
+    loc.start_read_loop()
+
+    assert not gs.send_nowait(ComsMessage(1, 0, 0, 0))
+    assert gs.send_nowait(ComsMessage(0, 0, 0, 0, ARMED=1))
+    time.sleep(1)
+    assert gs.armed
+    assert [m.ARMED for m in received] == [1]
+
+
+def test_send_nowait_records_only_written_messages():
+    class Broken:
+        def read(self):
+            raise NotImplementedError
+
+        def write(self, m):
+            raise OSError("link down")
+
+    with GroundStation(ComsDriver(Broken())) as gs:
+        assert gs.send_nowait(ComsMessage(0, 0, 0, 0, ARMED=1))
+        gs._coms.end_write_loop(timeout=1)
+        assert gs.last_sent is None
+        assert not gs.armed
+        # The failed arm no longer decides what may be sent next
+        assert gs._projected is None
+
+
+def test_send_nowait_checks_against_queued_commands():
+    class Slow(SocketComsStrategy):
+        def write(self, m):
+            time.sleep(0.2)
+            super().write(m)
+
+    a, b = Slow.socketpair()
+    with GroundStation(ComsDriver(a)) as gs:
+        assert gs.send_nowait(ComsMessage(0, 0, 0, 0, ARMED=1))
+        assert not gs.armed
+        # Checked against the state once the queued arm has been written
+        assert not gs.send_nowait(ComsMessage(0, 0, 0, 0, ARMED=0))
+        assert gs.send_nowait(ComsMessage(0, 0, 1, 0, ARMED=1))
+        gs._coms.end_write_loop(timeout=2)
+        assert gs.mission.state == MissionFlag.ARMED | MissionFlag.STAB
+        assert [t.current for t in gs.mission.history] == [
+            MissionFlag.ARMED,
+            MissionFlag.ARMED | MissionFlag.STAB,
+        ]
+        # With nothing queued, changes are checked from the mission state
+        assert gs._projected is None
+    b.sock.close()
+
+
+def test_snapshot(gs_and_loc: Tuple[GroundStation, ComsDriver]):
+    gs, loc = gs_and_loc
+    first = gs.snapshot()
+    assert first.sequence == 0 and first.last_received is None
+
+    assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+    msg = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"alt": 100})
+    loc.write(msg)
+    time.sleep(0.4)
+    snap = gs.snapshot()
+    assert snap.sequence == 2
+    assert snap.last_received == msg
+    assert snap.last_received_time == gs.last_received_time
+    assert snap.data == {"alt": 100}
+    assert snap.flags == MissionFlag.ARMED
+    # Snapshots are never modified once taken
+    assert first.sequence == 0 and first.last_sent is None
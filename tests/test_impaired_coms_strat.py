@@ -0,0 +1,211 @@
+import queue
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.coms.strategies.impairedstrat import ImpairedComsStrategy, Impairment
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+
+
+def _drain(strat, n, timeout=2.0) -> List[ComsMessage]:
+    got: List[ComsMessage] = []
+    deadline = time.monotonic() + timeout
+    while len(got) < n and time.monotonic() < deadline:
+        m = strat.poll(timeout=0.05)
+        if m is not None:
+            got.append(m)
+    return got
+
+
+def _msgs(n):
+    return [ComsMessage(0, 0, 0, 0, DATA={"i": i}) for i in range(n)]
+
+
+@pytest.fixture
+def bus():
+    return InProcessBus()
+
+
+@pytest.fixture
+def impaired(bus: InProcessBus):
+    """Create impaired strategies on the bus, closing them afterwards"""
+    created: List[ImpairedComsStrategy] = []
+
+    def create(**kwargs) -> ImpairedComsStrategy:
+        strat = ImpairedComsStrategy(bus.connect(), **kwargs)
+        created.append(strat)
+        return strat
+
+    yield create
+    for strat in created:
+        strat.close()
+
+
+def test_passes_through_unimpaired(bus: InProcessBus, impaired):
+    a, b = impaired(), bus.connect()
+    m = ComsMessage(0, 0, 0, 0, ARMED=1)
+    a.write(m)
+    assert b.poll(timeout=1) is m
+    b.write(m)
+    assert a.poll(timeout=1) is m
+    assert a.write_stats.delivered == a.read_stats.delivered == 1
+
+
+def test_write_latency_does_not_block(bus: InProcessBus, impaired):
+    a = impaired(write=Impairment(latency=0.3))
+    b = bus.connect()
+    start = time.monotonic()
+    a.write(ComsMessage(0, 0, 0, 0))
+    assert time.monotonic() - start < 0.1
+    assert b.poll(timeout=0.2) is None
+    assert b.poll(timeout=1) is not None
+    assert time.monotonic() - start >= 0.3
+
+
+def test_read_latency(bus: InProcessBus, impaired):
+    a = impaired(read=Impairment(latency=0.3))
+    b = bus.connect()
+    assert a.poll(timeout=0) is None  # Start reading
+    start = time.monotonic()
+    b.write(ComsMessage(0, 0, 0, 0))
+    assert a.poll(timeout=0.2) is None
+    assert a.poll(timeout=1) is not None
+    assert time.monotonic() - start >= 0.3
+
+
+def test_loss(bus: InProcessBus, impaired):
+    a = impaired(write=Impairment(loss=1))
+    b = bus.connect()
+    for m in _msgs(5):
+        a.write(m)
+    assert b.poll(timeout=0.2) is None
+    assert a.write_stats.lost == 5
+
+
+def test_duplicate(bus: InProcessBus, impaired):
+    a = impaired(write=Impairment(duplicate=1))
+    b = bus.connect()
+    a.write(ComsMessage(0, 0, 0, 0, DATA={"i": 0}))
+    assert [m.DATA["i"] for m in _drain(b, 2)] == [0, 0]
+    assert a.write_stats.duplicated == 1
+
+
+def test_reorder(bus: InProcessBus, impaired):
+    a = impaired(
+        write=Impairment(latency=0.01, reorder=0.3, reorder_delay=0.1),
+        seed=3,
+    )
+    b = bus.connect()
+    for m in _msgs(20):
+        a.write(m)
+    order = [m.DATA["i"] for m in _drain(b, 20)]
+    assert sorted(order) == list(range(20))
+    assert order != list(range(20))
+    assert a.write_stats.reordered > 0
+
+
+def test_bandwidth(bus: InProcessBus, impaired):
+    msgs = _msgs(5)
+    size = len(msgs[0].as_str.encode())
+    a = impaired(write=Impairment(bandwidth=size * 10))
+    b = bus.connect()
+    start = time.monotonic()
+    for m in msgs:
+        a.write(m)
+    assert len(_drain(b, 5)) == 5
+    assert time.monotonic() - start >= 0.45
+
+
+def test_seed_is_reproducible(impaired):
+    def lost(seed):
+        a = impaired(write=Impairment(loss=0.5), seed=seed)
+        for m in _msgs(50):
+            a.write(m)
+        return a.write_stats.lost
+
+    assert lost(1) == lost(1)
+    assert 0 < lost(1) < 50
+
+
+def test_stations_over_impaired_link(bus: InProcessBus, impaired):
+    gs = GroundStation(ComsDriver(impaired(write=Impairment(latency=0.2))))
+    ls = LaunchStation(ComsDriver(bus.connect()))
+    received: List[ComsMessage] = []
+    ls.bind_queue(received)
+    start = time.monotonic()
+    assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+    while not received and time.monotonic() - start < 2:
+        time.sleep(0.01)
+    assert [m.ARMED for m in received] == [1]
+    assert time.monotonic() - start >= 0.2
+    gs.close()
+    ls.close()
+
+
+def test_close_stops_reader(bus: InProcessBus):
+    a = ImpairedComsStrategy(bus.connect(), read=Impairment(latency=0.1))
+    assert a.poll(timeout=0) is None  # Start reading
+    reader = a._impaired_reader
+    assert reader is not None and reader.is_alive()
+    a.close()
+    assert not reader.is_alive()
+    bus.connect().write(ComsMessage(0, 0, 0, 0))
+    assert a.poll(timeout=0.3) is None
+
+
+def test_close_drops_delayed_writes():
+    class Closeable:
+        def __init__(self):
+            self.written: List[ComsMessage] = []
+            self.closed = False
+
+        def read(self):
+            raise NotImplementedError
+
+        def write(self, m):
+            if self.closed:
+                raise OSError("closed")
+            self.written.append(m)
+
+        def close(self):
+            self.closed = True
+
+    inner = Closeable()
+    a = ImpairedComsStrategy(inner, write=Impairment(latency=0.1))
+    a.write(ComsMessage(0, 0, 0, 0))
+    a.close()
+    time.sleep(0.3)
+    assert inner.written == []
+    assert a.write_stats.delivered == 0
+
+
+def test_wraps_strategy_that_cannot_be_polled():
+    class Blocking:
+        def __init__(self):
+            self.inbox = queue.Queue()
+
+        def read(self):
+            m = self.inbox.get()
+            if m is None:
+                raise OSError("closed")
+            return m
+
+        def write(self, m):
+            pass
+
+        def close(self):
+            self.inbox.put(None)
+
+    inner = Blocking()
+    a = ImpairedComsStrategy(inner, read=Impairment(latency=0.05))
+    try:
+        m = ComsMessage(0, 0, 0, 0, ARMED=1)
+        inner.inbox.put(m)
+        assert a.poll(timeout=2) == m
+    finally:
+        a.close()
@@ -6,12 +6,23 @@ def test_top_level_imports():
         ComsStrategy,
         ComsSubscription,
         GroundStation,
+        InProcessBus,
+        InProcessBusStrategy,
         LaunchStation,
+        LinkQuality,
+        LinkState,
         LocalComsStrategy,
+        MulticastPublishStrategy,
+        MulticastSubscribeStrategy,
+        ObserverStation,
         OneTimeComsSubscription,
         SerialComsStrategy,
+        SharedMemoryComsStrategy,
         SocketComsStrategy,
+        TeeComsStrategy,
         construct_message,
+        create_multicast_ground_station,
+        create_multicast_launch_station,
         create_serial_ground_station,
         create_serial_launch_station,
         create_socket_ground_station,
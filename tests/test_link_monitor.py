@@ -0,0 +1,136 @@
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.coms.strategies.reliablestrat import ReliableComsStrategy
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+from orbitalcoms.stations.linkmonitor import LinkMonitor, LinkQuality, LinkState
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+
+def test_rtt_is_smoothed():
+    mon = LinkMonitor()
+    mon._sample_rtt(1.0)
+    assert (mon.srtt, mon.rttvar) == (1.0, 0.5)
+    mon._sample_rtt(2.0)
+    assert mon.srtt == pytest.approx(1.125)
+    assert mon.rttvar == pytest.approx(0.625)
+
+
+def test_unknown_until_answered():
+    mon = LinkMonitor(interval=0.01)
+    assert mon.quality().state == LinkState.UNKNOWN
+    mon.pong(mon.ping())
+    q = mon.quality()
+    assert q.state == LinkState.GOOD
+    assert q.rtt is not None and q.loss == 0
+
+
+def test_unanswered_pings_count_as_lost():
+    mon = LinkMonitor(interval=0.01, degraded_loss=0.25, stale_after=10)
+    for i in range(4):
+        ping = mon.ping()
+        if i % 2:
+            mon.pong(ping)
+    time.sleep(0.05)
+    q = mon.quality()
+    assert q.loss == pytest.approx(0.5)
+    assert q.state == LinkState.DEGRADED
+
+
+def test_late_pong_is_not_lost():
+    mon = LinkMonitor(interval=0.01, stale_after=10)
+    ping = mon.ping()
+    mon.pong(mon.ping())
+    time.sleep(0.05)
+    assert mon.quality().loss == pytest.approx(0.5)
+    mon.pong(ping)
+    assert mon.quality().loss == 0
+
+
+def test_slow_rtt_degrades():
+    mon = LinkMonitor(degraded_rtt=0.5)
+    mon.heard()
+    mon._sample_rtt(1.0)
+    assert mon.quality().state == LinkState.DEGRADED
+
+
+def test_silence_goes_stale():
+    mon = LinkMonitor(stale_after=0.02)
+    mon.pong(mon.ping())
+    assert mon.update().state == LinkState.GOOD
+    assert mon.update() is None
+    time.sleep(0.05)
+    assert mon.update().state == LinkState.STALE
+
+
+@pytest.fixture
+def stations():
+    bus = InProcessBus()
+    gs = GroundStation(ComsDriver(bus.connect()))
+    ls = LaunchStation(ComsDriver(bus.connect()))
+    yield gs, ls
+    gs.close()
+    ls.close()
+
+
+def test_station_measures_link(stations):
+    gs, ls = stations
+    ls_read: List[ComsMessage] = []
+    ls.bind_queue(ls_read)
+    changes: List[LinkQuality] = []
+    gs.add_link_callback(changes.append)
+    gs.set_heartbeat_interval(0.02)
+    _wait_for(lambda: gs.link_quality.state == LinkState.GOOD)
+    q = gs.link_quality
+    assert q.rtt is not None and q.rtt < 1
+    assert changes and changes[0].state == LinkState.GOOD
+    # Heartbeats are never handed to the user
+    assert ls_read == []
+    assert ls.last_received is None
+
+
+def test_station_link_goes_stale(stations):
+    gs, ls = stations
+    changes: List[LinkQuality] = []
+    gs.add_link_callback(changes.append)
+    gs._link.stale_after = 0.1
+    gs.set_heartbeat_interval(0.02)
+    _wait_for(lambda: gs.link_quality.state == LinkState.GOOD)
+    ls.close()
+    _wait_for(lambda: changes[-1].state == LinkState.STALE)
+
+
+def test_heartbeat_carries_current_flags(stations):
+    gs, ls = stations
+    bus = gs._coms.strategy.bus
+    spy = bus.connect()
+    assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+    assert spy.poll(timeout=1).ARMED == 1
+    gs.set_heartbeat_interval(0.02)
+    ping = spy.poll(timeout=1)
+    assert ping.ARMED == 1
+    assert "ping" in ping.DATA["_OC"]
+
+
+def test_heartbeat_bypasses_reliable_layer():
+    bus = InProcessBus()
+    gs_strat = ReliableComsStrategy(bus.connect())
+    with GroundStation(ComsDriver(gs_strat)) as gs, LaunchStation(
+        ComsDriver(ReliableComsStrategy(bus.connect()))
+    ):
+        gs.set_heartbeat_interval(0.02)
+        _wait_for(lambda: gs.link_quality.state == LinkState.GOOD)
+        assert gs_strat.stats.sent == 0
@@ -0,0 +1,123 @@
+import random
+import time
+
+import pytest
+
+from orbitalcoms._app.loadgen import (
+    EchoPeer,
+    LoadConfig,
+    LoadGenerator,
+    SizeDistribution,
+    Trajectory,
+    send_delays,
+)
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.stations.launchstation import LaunchStation
+
+
+def test_size_distribution_parse():
+    assert SizeDistribution.parse("fixed:64") == SizeDistribution("fixed", 64, 0)
+    assert SizeDistribution.parse("uniform:0:512") == SizeDistribution(
+        "uniform", 0, 512
+    )
+    for bad in ("fixed", "uniform:1", "zipf:1:2", "normal:a:b"):
+        with pytest.raises(ValueError):
+            SizeDistribution.parse(bad)
+
+
+def test_size_distribution_sample():
+    rng = random.Random(0)
+    assert SizeDistribution.parse("fixed:64").sample(rng) == 64
+    sizes = [SizeDistribution.parse("uniform:10:20").sample(rng) for _ in range(100)]
+    assert all(10 <= s <= 20 for s in sizes)
+    assert all(SizeDistribution.parse("normal:0:5").sample(rng) >= 0 for _ in range(100))
+
+
+@pytest.mark.parametrize("pattern", ["constant", "poisson", "burst"])
+def test_send_delays_average_rate(pattern):
+    delays = send_delays(pattern, 100, random.Random(1), burst=5)
+    total = sum(next(delays) for _ in range(5000))
+    assert total == pytest.approx(50, rel=0.1)
+
+
+def test_burst_delays():
+    delays = send_delays("burst", 10, random.Random(), burst=3)
+    assert [next(delays) for _ in range(6)] == pytest.approx([0, 0, 0.3, 0, 0, 0.3])
+
+
+def test_unknown_pattern():
+    with pytest.raises(ValueError):
+        next(send_delays("zipf", 10, random.Random()))
+
+
+def test_trajectory_is_reproducible():
+    a = Trajectory(random.Random(3)).at(10)
+    b = Trajectory(random.Random(3)).at(10)
+    assert a == b
+    assert a["GPS"]["alt"] == pytest.approx(250, abs=10)
+    assert set(a) == {"origin", "GPS", "gyro", "temp", "acc"}
+
+
+def test_load_over_echoing_links():
+    stations, peers = [], []
+    for _ in range(2):
+        bus = InProcessBus()
+        stations.append(LaunchStation(ComsDriver(bus.connect())))
+        peers.append(EchoPeer(ComsDriver(bus.connect())))
+    for p in peers:
+        p.start()
+
+    config = LoadConfig(
+        rate=50, duration=0.5, payload=SizeDistribution.parse("fixed:100"), seed=7
+    )
+    report = LoadGenerator(stations, config).run()
+
+    for p in peers:
+        p.stop()
+    for s in stations:
+        s.close()
+
+    assert len(report.links) == 2
+    assert report.failed == 0
+    assert report.sent == pytest.approx(50, abs=4)
+    assert report.echoed == report.sent
+    assert report.dropped == 0
+    assert len(report.latencies) == report.sent
+    assert report.rate == pytest.approx(100, rel=0.2)
+    assert "Dropped:  0" in report.summary()
+
+
+def test_load_without_echo_counts_drops():
+    bus = InProcessBus()
+    station = LaunchStation(ComsDriver(bus.connect()))
+    bus.connect()
+    report = LoadGenerator([station], LoadConfig(rate=20, duration=0.25, drain=0)).run()
+    station.close()
+    assert report.sent > 0
+    assert report.echoed == 0
+    assert report.dropped == report.sent
+    assert "no echoes" in report.summary()
+
+
+def test_slow_link_lowers_achieved_rate():
+    class Slow:
+        def read(self):
+            raise NotImplementedError
+
+        def poll(self, timeout=None):
+            time.sleep(timeout or 0)
+            return None
+
+        def write(self, m):
+            time.sleep(0.05)
+
+    station = LaunchStation(ComsDriver(Slow()))
+    config = LoadConfig(rate=100, duration=0.3, drain=0)
+    report = LoadGenerator([station], config).run()
+    station.close()
+    # The link carries at most 20 messages a second
+    assert report.rate < 40
+    assert report.unsent > 0
+    assert report.sent + report.unsent == pytest.approx(30, abs=2)
+    assert report.links[0].elapsed < 0.45
@@ -0,0 +1,140 @@
+import socket
+import time
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.localstrat import get_linked_local_strats
+from orbitalcoms.coms.strategies.multicaststrat import (
+    MulticastPublishStrategy,
+    MulticastSubscribeStrategy,
+)
+from orbitalcoms.coms.strategies.socketstrat import SocketComsStrategy
+from orbitalcoms.coms.strategies.teestrat import TeeComsStrategy
+from orbitalcoms.stations.observerstation import ObserverStation
+from orbitalcoms.stations.transitions import MissionFlag
+
+GROUP = "239.255.42.98"
+LOOPBACK = "127.0.0.1"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def group():
+    port = _free_port()
+    try:
+        subs = [
+            MulticastSubscribeStrategy.join(GROUP, port, interface=LOOPBACK)
+            for _ in range(3)
+        ]
+    except OSError as e:
+        pytest.skip(f"Multicast is not available: {e}")
+    pub = MulticastPublishStrategy.create(GROUP, port, interface=LOOPBACK)
+    yield pub, subs
+    pub.sock.close()
+    for s in subs:
+        s.sock.close()
+
+
+def test_every_subscriber_receives_each_message(group):
+    pub, subs = group
+    m = ComsMessage(0, 0, 0, 1, DATA={"alt": 100})
+    pub.write(m)
+    for s in subs:
+        assert s.poll(timeout=2) == m
+    assert pub.stats.sent == 1
+
+
+def test_subscribers_receive_newest_in_order(group):
+    pub, subs = group
+    for i in range(10):
+        pub.write(ComsMessage(0, 0, 0, 1, DATA={"i": i}))
+    received = []
+    while True:
+        m = subs[0].poll(timeout=0.5)
+        if m is None:
+            break
+        received.append(m.DATA["i"])
+    assert received == sorted(received)
+    assert received[-1] == 9
+
+
+def test_subscriber_is_read_only(group):
+    _, subs = group
+    with pytest.raises(ComsDriverWriteError):
+        subs[0].write(ComsMessage(0, 0, 0, 0))
+
+
+def test_publisher_never_reads(group):
+    pub, _ = group
+    assert pub.poll(timeout=0.05) is None
+
+
+def test_tee_writes_to_primary_and_mirrors():
+    a, b = SocketComsStrategy.socketpair()
+    mirror_a, mirror_b = SocketComsStrategy.socketpair()
+    tee = TeeComsStrategy(a, mirror_a)
+    m = ComsMessage(1, 0, 0, 1)
+    tee.write(m)
+    assert b.read() == m
+    assert mirror_b.read() == m
+    b.write(ComsMessage(0, 1, 0, 1))
+    assert tee.poll(timeout=2) == ComsMessage(0, 1, 0, 1)
+    for s in (a, b, mirror_a, mirror_b):
+        s.sock.close()
+
+
+def test_tee_survives_failing_mirror():
+    a, b = SocketComsStrategy.socketpair()
+    sub = MulticastSubscribeStrategy(socket.socket(socket.AF_INET, socket.SOCK_DGRAM))
+    tee = TeeComsStrategy(a, sub)
+    m = ComsMessage(1, 0, 0, 1)
+    tee.write(m)
+    assert b.read() == m
+    assert tee.mirror_errors == 1
+    for s in (a, b, sub):
+        s.sock.close()
+
+
+def test_tee_reads_non_pollable_strategy():
+    ls1, ls2 = get_linked_local_strats()
+    tee = TeeComsStrategy(ls1)
+    assert tee.poll(timeout=0.05) is None
+    m = ComsMessage(0, 0, 0, 1)
+    ls2.write(m)
+    assert tee.poll(timeout=2) == m
+    reader = tee._reader
+    tee.close()
+    assert tee._reader is None
+    # The read in progress returns with the next message, then the reader ends
+    ls2.write(m)
+    reader.join(timeout=2)
+    assert not reader.is_alive()
+
+
+def test_observer_mirrors_published_state(group):
+    pub, subs = group
+    observer = ObserverStation(ComsDriver(subs[0]))
+    try:
+        assert not observer.armed
+        pub.write(ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"alt": 100}))
+        deadline = time.time() + 2
+        while observer.last_received is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert observer.armed
+        assert not observer.launch
+        assert observer.data == {"alt": 100}
+        # Observers only listen
+        assert not observer.send(ComsMessage(1, 0, 0, 0))
+        assert not observer.abort
+        # So frontends do not offer to change any flag
+        assert observer.allowed_toggles == MissionFlag(0)
+    finally:
+        observer.close()
@@ -0,0 +1,46 @@
+import pytest
+
+from orbitalcoms._app.plot import SampleRing, decimate_minmax
+from orbitalcoms._utils.datapath import lookup
+
+
+def test_lookup():
+    data = {"GPS": {"alt": 100, "lat": "n/a"}, "armed": True, "temp": 20.5}
+    assert lookup(data, "GPS.alt") == 100.0
+    assert lookup(data, "temp") == 20.5
+    assert lookup(data, "GPS.lat") is None
+    assert lookup(data, "GPS.long") is None
+    assert lookup(data, "temp.x") is None
+    assert lookup(data, "armed") is None
+    assert lookup(None, "GPS.alt") is None
+
+
+def test_sample_ring_keeps_newest():
+    ring = SampleRing(3)
+    assert ring.values() == []
+    ring.append(1)
+    ring.append(2)
+    assert ring.values() == [1, 2]
+    for v in range(3, 8):
+        ring.append(v)
+    assert len(ring) == ring.capacity == 3
+    assert ring.values() == [5, 6, 7]
+
+
+def test_sample_ring_capacity():
+    with pytest.raises(ValueError):
+        SampleRing(0)
+
+
+def test_decimate_few_samples():
+    assert decimate_minmax([1.0, 3.0, 2.0], 10) == [(1, 1), (3, 3), (2, 2)]
+
+
+def test_decimate_minmax():
+    values = [float(v % 10) for v in range(1000)]
+    cols = decimate_minmax(values, 100)
+    assert len(cols) == 100
+    assert all(c == (0, 9) for c in cols)
+
+    cols = decimate_minmax(list(range(10)), 3)
+    assert cols == [(0, 2), (3, 5), (6, 9)]
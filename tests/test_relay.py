@@ -0,0 +1,208 @@
+import socket
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms._app.relay import TelemetryRelay
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.errors.errors import ComsDriverReadError
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.socketstrat import (
+    FRAME_HEADER_SIZE,
+    FrameDecoder,
+    SocketComsStrategy,
+    encode_frame,
+)
+from orbitalcoms.stations.groundstation import GroundStation
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def relay():
+    sent: List[ComsMessage] = []
+
+    def send(m: ComsMessage) -> bool:
+        sent.append(m)
+        return True
+
+    r = TelemetryRelay(send, max_buffer=4096)
+    r.sent = sent
+    r.observer_addr = r.listen_tcp("127.0.0.1", 0)
+    r.control_addr = r.listen_tcp("127.0.0.1", 0, controller=True)
+    r.start()
+    yield r
+    r.close()
+
+
+def test_frame_decoder_handles_partial_frames():
+    m1 = ComsMessage(1, 0, 0, 1, DATA={"a": 1})
+    m2 = ComsMessage(0, 1, 0, 1)
+    stream = encode_frame(m1) + encode_frame(m2)
+    decoder = FrameDecoder()
+    received = []
+    for i in range(0, len(stream), 7):
+        received.extend(decoder.feed(stream[i:][:7]))
+    assert received == [m1, m2]
+
+
+def test_frame_decoder_rejects_garbage():
+    with pytest.raises(ComsDriverReadError):
+        FrameDecoder().feed(b"x" * 64)
+
+
+def test_broadcast_to_all_observers(relay: TelemetryRelay):
+    observers = [SocketComsStrategy.connect_to(*relay.observer_addr) for _ in range(4)]
+    _wait_for(lambda: relay.clients == 4)
+    m = ComsMessage(0, 0, 0, 1, DATA={"alt": 3})
+    relay.append(m)
+    for o in observers:
+        assert o.poll(timeout=2) == m
+        o.sock.close()
+
+
+def test_late_observer_gets_latest_state(relay: TelemetryRelay):
+    relay.append(ComsMessage(0, 0, 0, 1, DATA={"i": 1}))
+    relay.append(ComsMessage(0, 0, 0, 1, DATA={"i": 2}))
+    _wait_for(lambda: relay.stats.broadcast == 2)
+    o = SocketComsStrategy.connect_to(*relay.observer_addr)
+    assert o.poll(timeout=2) == ComsMessage(0, 0, 0, 1, DATA={"i": 2})
+    o.sock.close()
+
+
+def test_only_controller_sends_commands(relay: TelemetryRelay):
+    o = SocketComsStrategy.connect_to(*relay.observer_addr)
+    c = SocketComsStrategy.connect_to(*relay.control_addr)
+    _wait_for(lambda: relay.clients == 2)
+    o.write(ComsMessage(1, 0, 0, 0))
+    c.write(ComsMessage(0, 0, 1, 0))
+    _wait_for(lambda: relay.stats.commands == 1)
+    _wait_for(lambda: relay.stats.rejected == 1)
+    assert relay.sent == [ComsMessage(0, 0, 1, 0)]
+    o.sock.close()
+    c.sock.close()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b'{"ABORT": 1}', b"\xff\xfe", b"[]"],
+    ids=["missing-fields", "not-utf8", "not-an-object"],
+)
+def test_bad_controller_frame_drops_only_controller(relay: TelemetryRelay, payload):
+    o = SocketComsStrategy.connect_to(*relay.observer_addr)
+    c = SocketComsStrategy.connect_to(*relay.control_addr)
+    _wait_for(lambda: relay.clients == 2)
+    c.sock.sendall(str(len(payload)).encode().ljust(FRAME_HEADER_SIZE) + payload)
+    _wait_for(lambda: relay.clients == 1)
+    assert c.sock.recv(1) == b""
+    assert relay.sent == []
+    m = ComsMessage(0, 0, 0, 1)
+    relay.append(m)
+    assert o.poll(timeout=2) == m
+    c2 = SocketComsStrategy.connect_to(*relay.control_addr)
+    _wait_for(lambda: relay.clients == 2)
+    c2.write(ComsMessage(0, 0, 1, 0))
+    _wait_for(lambda: relay.stats.commands == 1)
+    for s in (o, c, c2):
+        s.sock.close()
+
+
+def test_slow_link_does_not_hold_up_observers():
+    class Slow(SocketComsStrategy):
+        def write(self, m):
+            time.sleep(1)
+            super().write(m)
+
+    a, b = Slow.socketpair()
+    with GroundStation(ComsDriver(a)) as gs:
+        r = TelemetryRelay(gs.send_nowait)
+        observer_addr = r.listen_tcp("127.0.0.1", 0)
+        control_addr = r.listen_tcp("127.0.0.1", 0, controller=True)
+        r.start()
+        o = SocketComsStrategy.connect_to(*observer_addr)
+        c = SocketComsStrategy.connect_to(*control_addr)
+        _wait_for(lambda: r.clients == 2)
+        start = time.monotonic()
+        c.write(ComsMessage(0, 0, 0, 0, ARMED=1))
+        _wait_for(lambda: r.stats.commands == 1)
+        m = ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"alt": 3})
+        r.append(m)
+        assert o.poll(timeout=2) == m
+        # The command is still being written to the launch station
+        assert time.monotonic() - start < 0.5
+        r.close()
+        for s in (o, c):
+            s.sock.close()
+    assert b.poll(timeout=1) == ComsMessage(0, 0, 0, 0, ARMED=1)
+    b.sock.close()
+
+
+def test_second_controller_refused(relay: TelemetryRelay):
+    c1 = SocketComsStrategy.connect_to(*relay.control_addr)
+    _wait_for(lambda: relay.clients == 1)
+    c2 = SocketComsStrategy.connect_to(*relay.control_addr)
+    assert c2.sock.recv(1) == b""
+    assert relay.clients == 1
+    c1.sock.close()
+    c2.sock.close()
+
+
+def test_stalled_observer_does_not_block_others(relay: TelemetryRelay):
+    stalled = socket.create_connection(relay.observer_addr)
+    stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    fast = SocketComsStrategy.connect_to(*relay.observer_addr)
+    _wait_for(lambda: relay.clients == 2)
+    big = "x" * 1000
+    for i in range(2000):
+        relay.append(ComsMessage(0, 0, 0, 1, DATA={"i": i, "pad": big}))
+        if i % 100 == 0:
+            # Keep the fast observer reading so only the stalled one backs up
+            while fast.poll(timeout=0) is not None:
+                pass
+    last = None
+    while True:
+        m = fast.poll(timeout=0.5)
+        if m is None:
+            break
+        last = m
+    assert last is not None and last.DATA["i"] == 1999
+    assert relay.stats.dropped > 0
+    assert relay.clients == 2
+    stalled.close()
+    fast.sock.close()
+
+
+def test_stalled_observer_disconnected():
+    r = TelemetryRelay(lambda m: True, max_buffer=4096, disconnect_slow=True)
+    addr = r.listen_tcp("127.0.0.1", 0)
+    r.start()
+    stalled = socket.create_connection(addr)
+    _wait_for(lambda: r.clients == 1)
+    for i in range(2000):
+        r.append(ComsMessage(0, 0, 0, 1, DATA={"i": i, "pad": "x" * 1000}))
+    _wait_for(lambda: r.clients == 0)
+    assert r.stats.evicted == 1
+    stalled.close()
+    r.close()
+
+
+def test_unix_observer(tmp_path):
+    path = str(tmp_path / "relay.sock")
+    r = TelemetryRelay(lambda m: True)
+    r.listen_unix(path)
+    r.start()
+    o = SocketComsStrategy.connect_to_unix(path)
+    _wait_for(lambda: r.clients == 1)
+    m = ComsMessage(0, 0, 0, 1)
+    r.append(m)
+    assert o.poll(timeout=2) == m
+    o.sock.close()
+    r.close()
+    assert not (tmp_path / "relay.sock").exists()
@@ -0,0 +1,227 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.envelope import META_KEY, attach_meta, split_meta
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus, InProcessBusStrategy
+from orbitalcoms.coms.strategies.reliablestrat import ReliableComsStrategy
+from orbitalcoms.coms.strategies.wrapperstrat import WrappedComsStrategy
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+
+
+class _Lossy(WrappedComsStrategy):
+    """Drops writes whose index is in ``drop``"""
+
+    def __init__(self, inner, drop=()):
+        super().__init__(inner)
+        self.drop = set(drop)
+        self.writes: List[ComsMessage] = []
+
+    def write(self, m):
+        self.writes.append(m)
+        if len(self.writes) - 1 not in self.drop:
+            self.inner.write(m)
+
+
+def _pump(*strats, duration=0.5, timeout=0.01):
+    """Poll strategies in turn for a while, collecting what each delivers"""
+    got = [[] for _ in strats]
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        for i, s in enumerate(strats):
+            m = s.poll(timeout=timeout)
+            while m is not None:
+                got[i].append(m)
+                m = s.poll(timeout=0)
+    return got
+
+
+def _msg(i):
+    return ComsMessage(0, 0, 0, 1, DATA={"i": i})
+
+
+@pytest.fixture
+def link():
+    bus = InProcessBus()
+    a = _Lossy(bus.connect())
+    b = _Lossy(bus.connect())
+    return (
+        a,
+        b,
+        ReliableComsStrategy(a, initial_rto=0.1, min_rto=0.1),
+        ReliableComsStrategy(b, initial_rto=0.1, min_rto=0.1),
+    )
+
+
+def test_envelope_round_trip():
+    m = ComsMessage(1, 0, 1, 0, ARMED=1, DATA={"x": 1})
+    framed = attach_meta(attach_meta(m, seq=3), ack=2)
+    assert framed.DATA[META_KEY] == {"seq": 3, "ack": 2}
+    assert split_meta(framed) == (m, {"seq": 3, "ack": 2})
+    bare = ComsMessage(1, 0, 1, 0)
+    assert split_meta(attach_meta(bare, seq=1))[0] == bare
+    assert split_meta(bare) == (bare, {})
+
+
+def test_delivers_in_order_and_acknowledges(link):
+    _, _, ra, rb = link
+    for i in range(5):
+        ra.write(_msg(i))
+    _, got = _pump(ra, rb)
+    assert [m.DATA for m in got] == [{"i": i} for i in range(5)]
+    assert ra.unacknowledged == 0
+    assert ra.stats.acknowledged == 5
+    assert ra.stats.retransmitted == 0
+    assert ra.srtt is not None
+
+
+def test_lost_messages_are_retransmitted(link):
+    a, _, ra, rb = link
+    a.drop = {0, 2}
+    for i in range(3):
+        ra.write(_msg(i))
+    _, got = _pump(ra, rb)
+    assert [m.DATA["i"] for m in got] == [0, 1, 2]
+    assert ra.stats.retransmitted >= 2
+    assert ra.unacknowledged == 0
+
+
+def test_lost_acks_do_not_duplicate_delivery(link):
+    _, b, ra, rb = link
+    b.drop = {0, 1}
+    ra.write(_msg(0))
+    _, got = _pump(ra, rb, duration=1)
+    assert [m.DATA["i"] for m in got] == [0]
+    assert rb.stats.duplicates >= 1
+    assert ra.unacknowledged == 0
+
+
+def test_out_of_order_held_until_gap_filled():
+    bus = InProcessBus()
+    r = ReliableComsStrategy(bus.connect())
+    peer = bus.connect()
+    frames = [attach_meta(_msg(i), sid=1, seq=i, base=0) for i in range(3)]
+    for f in (frames[0], frames[2]):
+        peer.write(f)
+    assert r.poll(timeout=0.05).DATA["i"] == 0
+    assert r.poll(timeout=0.05) is None
+    acks = [split_meta(peer.poll(timeout=0))[1] for _ in range(2)]
+    assert acks[-1]["ack"] == 1 and acks[-1]["sack"] == [2]
+    peer.write(frames[1])
+    assert [r.poll(timeout=0.05).DATA["i"] for _ in range(2)] == [1, 2]
+
+
+def test_window_limits_unacknowledged():
+    r = ReliableComsStrategy(InProcessBusStrategy(), window=2, write_timeout=0.05)
+    r.write(_msg(0))
+    r.write(_msg(1))
+    with pytest.raises(ComsDriverWriteError):
+        r.write(_msg(2))
+
+
+def test_full_window_does_not_block_forever():
+    r = ReliableComsStrategy(InProcessBusStrategy(), window=1)
+    assert r.write_timeout is not None and r.max_retries is not None
+    r.write_timeout = 0.05
+    r.write(_msg(0))
+    with pytest.raises(ComsDriverWriteError):
+        r.write(_msg(1))
+
+
+def test_abort_bypasses_full_window(link):
+    _, b, ra, rb = link
+    ra.window = 1
+    ra.write_timeout = 0.05
+    b.drop = set(range(100))  # No acknowledgements ever arrive
+    ra.write(_msg(0))
+    abort = ComsMessage(1, 0, 0, 1)
+    ra.write(abort)
+    assert ra.unacknowledged == 2
+    _, got = _pump(ra, rb, duration=0.3)
+    assert got == [_msg(0), abort]
+    assert ra.stats.retransmitted > 0
+
+
+def test_window_opens_when_acknowledged(link):
+    _, _, ra, rb = link
+    ra.window = 1
+    ra.write_timeout = 2
+    done = threading.Event()
+
+    def writer():
+        for i in range(3):
+            ra.write(_msg(i))
+        done.set()
+
+    t = threading.Thread(target=writer)
+    t.start()
+    _, got = _pump(ra, rb, duration=1)
+    t.join(2)
+    assert done.is_set()
+    assert [m.DATA["i"] for m in got] == [0, 1, 2]
+
+
+def test_gives_up_and_peer_skips(link):
+    a, _, ra, rb = link
+    ra.max_retries = 1
+    a.drop = {0, 1}
+    ra.write(_msg(0))
+    _pump(ra, rb, duration=1)
+    assert ra.stats.failed == 1
+    ra.write(_msg(1))
+    _, got = _pump(ra, rb)
+    assert [m.DATA["i"] for m in got] == [1]
+
+
+def test_rto_follows_rfc6298():
+    r = ReliableComsStrategy(InProcessBusStrategy(), min_rto=0, max_rto=60)
+    r._sample_rtt(1.0)
+    assert r.srtt == 1.0 and r.rttvar == 0.5 and r.rto == pytest.approx(3.0)
+    r._sample_rtt(2.0)
+    assert r.rttvar == pytest.approx(0.75 * 0.5 + 0.25 * 1.0)
+    assert r.srtt == pytest.approx(0.875 + 0.25)
+    assert r.rto == pytest.approx(r.srtt + 4 * r.rttvar)
+    r.max_rto = 2
+    r._sample_rtt(10.0)
+    assert r.rto == 2
+
+
+def test_peer_restart_resets_sequence(link):
+    _, _, ra, rb = link
+    ra.write(_msg(0))
+    _pump(ra, rb)
+    restarted = ReliableComsStrategy(ra.inner, initial_rto=0.1)
+    restarted.write(_msg(1))
+    _, got = _pump(restarted, rb)
+    assert [m.DATA["i"] for m in got] == [1]
+
+
+def test_unsequenced_messages_delivered(link):
+    a, _, _, rb = link
+    a.write(_msg(7))
+    assert rb.poll(timeout=0.1) == _msg(7)
+
+
+def test_stations_over_lossy_link():
+    bus = InProcessBus()
+    gs_link = _Lossy(bus.connect(), drop={0})
+    gs_strat = ReliableComsStrategy(gs_link, initial_rto=0.1)
+    ls_strat = ReliableComsStrategy(bus.connect(), initial_rto=0.1)
+    with GroundStation(ComsDriver(gs_strat)) as gs, LaunchStation(
+        ComsDriver(ls_strat)
+    ) as ls:
+        ls_read: List[ComsMessage] = []
+        ls.bind_queue(ls_read)
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        assert gs.send(ComsMessage(0, 0, 1, 0, ARMED=1))
+        deadline = time.monotonic() + 2
+        while gs_strat.unacknowledged and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert [m.STAB for m in ls_read] == [0, 1]
+        assert gs_strat.stats.retransmitted >= 1
@@ -0,0 +1,168 @@
+import multiprocessing as mp
+import sys
+import threading
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms._utils.scheduler import Scheduler, get_scheduler
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.stations.groundstation import GroundStation
+
+
+def test_timers_run_in_deadline_order():
+    sched = Scheduler()
+    order: List[int] = []
+    for i in (3, 1, 2):
+        sched.call_later(i * 0.02, lambda i=i: order.append(i))
+    time.sleep(0.2)
+    assert order == [1, 2, 3]
+
+
+def test_cancelled_timer_does_not_run():
+    sched = Scheduler()
+    calls: List[int] = []
+    handle = sched.call_later(0.05, lambda: calls.append(1))
+    assert handle.active
+    handle.cancel()
+    assert not handle.active
+    time.sleep(0.1)
+    assert calls == []
+    assert len(sched) == 0
+
+
+def test_moving_later_does_not_grow_heap():
+    sched = Scheduler()
+    calls: List[float] = []
+    start = time.monotonic()
+    handle = sched.call_later(0.05, lambda: calls.append(time.monotonic()))
+    for _ in range(100):
+        handle.reschedule(0.15)
+    assert len(sched) == 1
+    time.sleep(0.1)
+    assert calls == []
+    time.sleep(0.15)
+    assert len(calls) == 1
+    assert calls[0] - start >= 0.15
+
+
+def test_moving_earlier_runs_sooner():
+    sched = Scheduler()
+    calls: List[int] = []
+    handle = sched.call_later(10, lambda: calls.append(1))
+    handle.reschedule(0.01)
+    time.sleep(0.1)
+    assert calls == [1]
+    assert not handle.active
+
+
+def test_cancelled_timer_can_be_rescheduled():
+    sched = Scheduler()
+    calls: List[int] = []
+    handle = sched.call_later(0.02, lambda: calls.append(1))
+    handle.cancel()
+    handle.reschedule(0.02)
+    time.sleep(0.1)
+    assert calls == [1]
+
+
+def test_callback_return_value_repeats_timer():
+    sched = Scheduler()
+    calls: List[int] = []
+
+    def tick():
+        calls.append(1)
+        return 0.01 if len(calls) < 3 else None
+
+    handle = sched.call_later(0.01, tick)
+    time.sleep(0.2)
+    assert len(calls) == 3
+    assert not handle.active
+
+
+def test_raising_callback_does_not_stop_scheduler():
+    sched = Scheduler()
+    calls: List[int] = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    sched.call_later(0.01, boom)
+    sched.call_later(0.02, lambda: calls.append(1))
+    time.sleep(0.1)
+    assert calls == [1]
+
+
+def test_cancelled_entries_are_compacted():
+    sched = Scheduler()
+    handles = [sched.call_later(60, lambda: None) for _ in range(200)]
+    for h in handles[:150]:
+        h.cancel()
+    assert len(sched) < 100
+    for h in handles[150:]:
+        h.cancel()
+
+
+def test_thread_exits_when_idle():
+    sched = Scheduler()
+    handle = sched.call_later(60, lambda: None)
+    thread = sched._thread
+    assert thread is not None and thread.is_alive()
+    handle.cancel()
+    time.sleep(0.05)
+    assert sched._thread is None
+    thread.join(1)
+    assert not thread.is_alive()
+    calls: List[int] = []
+    sched.call_later(0, lambda: calls.append(1))
+    time.sleep(0.05)
+    assert calls == [1]
+
+
+def _cancel_in_child(handle):
+    handle.cancel()
+    handle.reschedule(0)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Requires fork")
+def test_timers_usable_after_fork():
+    sched = get_scheduler()
+    handle = sched.call_later(60, lambda: None)
+    try:
+        for _ in range(5):
+            held = threading.Event()
+
+            def hold():
+                with sched._cv:
+                    held.set()
+                    time.sleep(0.1)
+
+            threading.Thread(target=hold).start()
+            held.wait()
+            # Forked while another thread holds the scheduler's lock
+            proc = mp.get_context("fork").Process(
+                target=_cancel_in_child, args=(handle,), daemon=True
+            )
+            proc.start()
+            proc.join(5)
+            assert proc.exitcode == 0
+    finally:
+        handle.cancel()
+
+
+def test_stations_share_one_thread():
+    bus = InProcessBus()
+    stations = [GroundStation(ComsDriver(bus.connect())) for _ in range(5)]
+    counts = []
+    for gs in stations:
+        gs.set_send_interval(10)
+        gs.set_heartbeat_interval(10)
+        gs.send({"ABORT": 0, "QDM": 0, "STAB": 0, "LAUNCH": 0})
+        counts.append(threading.active_count())
+    # Only the first station's timers start the scheduler's thread
+    assert len(set(counts)) == 1
+    assert len(get_scheduler()) >= 10
+    for gs in stations:
+        gs.close()
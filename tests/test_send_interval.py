@@ -132,3 +132,27 @@ def test_send_empty_when_no_prev_send(gs_and_ls):
     assert msg.LAUNCH == 0
     assert msg.QDM == 0
     assert msg.STAB == 0
+
+
+def test_stalled_link_does_not_hold_up_other_stations(gs_and_ls):
+    gs, ls = gs_and_ls
+
+    class Stalled:
+        def read(self):
+            raise NotImplementedError
+
+        def write(self, m):
+            time.sleep(0.5)
+
+    q = []
+    ls.bind_queue(q)
+    with GroundStation(ComsDriver(Stalled())) as stalled:
+        assert stalled.send(ComsMessage(0, 0, 0, 0))
+        stalled.set_send_interval(0.05)
+        gs.set_send_interval(0.2)
+        gs.send(ComsMessage(0, 0, 0, 0))
+        time.sleep(1.5)
+        gs.set_send_interval(None)
+        stalled.set_send_interval(None)
+    # The first send and about seven resends
+    assert len(q) >= 6
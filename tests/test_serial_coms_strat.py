@@ -133,9 +133,11 @@ def test_preproc_and_read(pseudotty):
     os.write(m, SerialComsStrategy._preprocess_write_msg(msg_a))
     os.write(m, SerialComsStrategy._preprocess_write_msg(msg_b))
     coms.start_read_loop()
-    coms.read(timeout=5)
-    coms.read(timeout=5)
-    coms.read(timeout=5)
+    # The messages may arrive before ``read`` could subscribe, so wait on
+    # the subscriber instead
+    deadline = time.time() + 5
+    while len(read) < 3 and time.time() < deadline:
+        time.sleep(0.01)
     coms.end_read_loop()
 
     expected = [
@@ -159,3 +161,28 @@ def test_preproc_and_read(pseudotty):
 
     for m1, m2 in zip(read, expected):
         assert msgs_not_same_but_equal(m1, m2)
+
+
+def test_poll_keeps_partial_frames(pseudotty):
+    m, s = pseudotty
+    strat = SerialComsStrategy.from_args(os.ttyname(s), 9600)
+    data = SerialComsStrategy._preprocess_write_msg(
+        ComsMessage(ABORT=1, ARMED=1, QDM=1, STAB=0, LAUNCH=0)
+    )
+    os.write(m, data[:10])
+    assert strat.poll(timeout=0.1) is None
+    os.write(m, data[10:])
+    assert strat.poll(timeout=1) == ComsMessage(ABORT=1, ARMED=1, QDM=1, STAB=0, LAUNCH=0)
+    assert strat.poll(timeout=0) is None
+
+
+def test_writes_are_rate_limited(pseudotty):
+    m, _ = pseudotty
+    m_name = os.ttyname(m)
+    s = SerialComsStrategy.from_args(m_name, 9600)
+    assert s.rate_limiter is not None
+    assert s.rate_limiter.rate == 960
+    assert s.utilization == 0
+    s.write(ComsMessage(ABORT=0, ARMED=0, QDM=1, STAB=0, LAUNCH=0))
+    assert s.utilization > 0
+    assert SerialComsStrategy.from_args(m_name, 9600, False).rate_limiter is None
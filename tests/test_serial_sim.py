@@ -0,0 +1,106 @@
+import sys
+import time
+
+import pytest
+
+if sys.platform.startswith("win"):
+    pytestmark = pytest.mark.skip(reason="Psuedoterminals not supported on windows")
+else:
+    from orbitalcoms.coms.strategies.serialsim import (
+        LineImpairment,
+        SimulatedSerialLink,
+        _Direction,
+    )
+
+import random
+
+import serial
+
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.stations.stationcreators import (
+    create_serial_ground_station,
+    create_serial_launch_station,
+)
+
+
+def _read_exactly(ser: serial.Serial, n: int, timeout: float = 5) -> bytes:
+    data = b""
+    deadline = time.monotonic() + timeout
+    while len(data) < n and time.monotonic() < deadline:
+        data += ser.read(n - len(data))
+    return data
+
+
+def test_carries_bytes_both_ways():
+    with SimulatedSerialLink(115200) as link:
+        a = serial.Serial(link.port_a, 115200, timeout=0.1)
+        b = serial.Serial(link.port_b, 115200, timeout=0.1)
+        a.write(b"hello\r\x00world")
+        assert _read_exactly(b, 12) == b"hello\r\x00world"
+        b.write(b"back")
+        assert _read_exactly(a, 4) == b"back"
+        a.close()
+        b.close()
+    assert link.stats_a_to_b.delivered == 12
+    assert link.stats_b_to_a.delivered == 4
+
+
+@pytest.mark.parametrize("baudrate", [9600, 57600, 115200])
+def test_throughput_matches_baudrate(baudrate):
+    size = baudrate // 10 // 4  # A quarter of a second of bytes
+    with SimulatedSerialLink(baudrate) as link:
+        a = serial.Serial(link.port_a, baudrate, timeout=0.1)
+        b = serial.Serial(link.port_b, baudrate, timeout=0.1)
+        start = time.monotonic()
+        a.write(bytes(size))
+        assert len(_read_exactly(b, size)) == size
+        elapsed = time.monotonic() - start
+        a.close()
+        b.close()
+    # Never faster than the baudrate allows. The upper bound is loose so that
+    # a busy machine does not fail it, it only catches a link far too slow
+    assert 0.2 <= elapsed < 3
+
+
+def test_drops_everything():
+    with SimulatedSerialLink(115200, LineImpairment(drop_rate=1)) as link:
+        a = serial.Serial(link.port_a, 115200, timeout=0.1)
+        b = serial.Serial(link.port_b, 115200, timeout=0.1)
+        a.write(b"lost")
+        time.sleep(0.1)
+        assert b.in_waiting == 0
+        a.close()
+        b.close()
+    assert link.stats_a_to_b.dropped == 4
+
+
+def test_bit_error_rate():
+    d = _Direction(-1, -1, 0, LineImpairment(bit_error_rate=0.01), random.Random(1))
+    data = bytes(10000)
+    out = d.impair(data)
+    flipped = sum(bin(b).count("1") for b in out)
+    assert flipped == d.stats.flipped
+    assert flipped == pytest.approx(800, rel=0.15)
+
+
+def test_bursts_are_reproducible():
+    imp = LineImpairment(burst_rate=0.01, burst_length=4)
+    a = _Direction(-1, -1, 0, imp, random.Random(5)).impair(bytes(1000))
+    b = _Direction(-1, -1, 0, imp, random.Random(5)).impair(bytes(1000))
+    assert a == b
+    assert 0 < sum(1 for x in a if x) <= 1000
+
+
+def test_stations_over_simulated_link():
+    with SimulatedSerialLink(57600) as link:
+        ls = create_serial_launch_station(link.port_a, 57600)
+        gs = create_serial_ground_station(link.port_b, 57600)
+        received = []
+        ls.bind_queue(received)
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.05)
+        gs.close()
+        ls.close()
+    assert [m.ARMED for m in received] == [1]
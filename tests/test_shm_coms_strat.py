@@ -0,0 +1,143 @@
+import multiprocessing as mp
+import sys
+import time
+from typing import List
+
+import pytest
+
+if sys.version_info < (3, 8):
+    pytestmark = pytest.mark.skip(reason="Shared memory requires python 3.8+")
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.shmstrat import (
+    OverflowPolicy,
+    SharedMemoryComsStrategy,
+)
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+
+
+def _make_link(overflow=OverflowPolicy.BLOCK, **kw):
+    a = SharedMemoryComsStrategy.create(overflow=overflow, **kw)
+    b = SharedMemoryComsStrategy.attach(a.name, overflow=overflow)
+    return a, b
+
+
+@pytest.fixture
+def link():
+    a, b = _make_link(slots=8, slot_size=512)
+    yield a, b
+    b.close()
+    a.close()
+
+
+def test_write_read_both_directions(link):
+    a, b = link
+    a.write(ComsMessage(0, 0, 1, 0, ARMED=1, DATA={"msg": "to b"}))
+    b.write(ComsMessage(1, 0, 0, 0, ARMED=1, DATA={"msg": "to a"}))
+
+    assert b.poll(timeout=1).DATA["msg"] == "to b"
+    assert a.poll(timeout=1).DATA["msg"] == "to a"
+    assert a.poll(timeout=0.05) is None
+    assert b.poll(timeout=0.05) is None
+
+
+def test_messages_arrive_in_order(link):
+    a, b = link
+    for i in range(5):
+        a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+    assert [b.read().DATA["i"] for _ in range(5)] == list(range(5))
+
+
+def test_ring_wraps_around(link):
+    a, b = link
+    for i in range(50):
+        a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+        assert b.poll(timeout=1).DATA["i"] == i
+
+
+def test_drop_oldest_overwrites_unread():
+    a, b = _make_link(slots=4, slot_size=256, overflow=OverflowPolicy.DROP_OLDEST)
+    try:
+        for i in range(10):
+            a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+        assert [b.poll(timeout=0).DATA["i"] for _ in range(4)] == [6, 7, 8, 9]
+        assert b.overruns == 6
+        assert b.poll(timeout=0) is None
+    finally:
+        b.close()
+        a.close()
+
+
+def test_drop_newest_rejects_when_full():
+    a, b = _make_link(slots=4, slot_size=256, overflow=OverflowPolicy.DROP_NEWEST)
+    try:
+        for i in range(10):
+            a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+        assert a.rejected == 6
+        assert [b.poll(timeout=0).DATA["i"] for _ in range(4)] == [0, 1, 2, 3]
+    finally:
+        b.close()
+        a.close()
+
+
+def test_block_times_out_when_full():
+    a, b = _make_link(slots=2, slot_size=256, write_timeout=0.1)
+    try:
+        a.write(ComsMessage(0, 0, 0, 0))
+        a.write(ComsMessage(0, 0, 0, 0))
+        with pytest.raises(ComsDriverWriteError):
+            a.write(ComsMessage(0, 0, 0, 0))
+        b.read()
+        a.write(ComsMessage(0, 0, 0, 0))
+    finally:
+        b.close()
+        a.close()
+
+
+def test_message_too_large(link):
+    a, _ = link
+    with pytest.raises(ComsDriverWriteError):
+        a.write(ComsMessage(0, 0, 0, 0, DATA={"big": "x" * 1000}))
+
+
+def _echo(name: str) -> None:
+    strat = SharedMemoryComsStrategy.attach(name)
+    for _ in range(3):
+        m = strat.read()
+        strat.write(m)
+    strat.close()
+
+
+def test_echo_from_other_process():
+    a = SharedMemoryComsStrategy.create()
+    try:
+        proc = mp.Process(target=_echo, args=(a.name,), daemon=True)
+        proc.start()
+        for i in range(3):
+            a.write(ComsMessage(0, 0, 0, 0, DATA={"i": i}))
+            assert a.poll(timeout=10).DATA["i"] == i
+        proc.join(timeout=5)
+        assert proc.exitcode == 0
+    finally:
+        a.close()
+
+
+def test_stations_over_shared_memory():
+    gs_strat = SharedMemoryComsStrategy.create()
+    ls_strat = SharedMemoryComsStrategy.attach(gs_strat.name)
+
+    with GroundStation(ComsDriver(gs_strat)) as gs, LaunchStation(
+        ComsDriver(ls_strat)
+    ) as ls:
+        ls_read: List[ComsMessage] = []
+        ls.bind_queue(ls_read)
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        time.sleep(0.5)
+        assert len(ls_read) == 1
+        assert ls.armed
+
+    ls_strat.close()
+    gs_strat.close()
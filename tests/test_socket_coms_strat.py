@@ -1,3 +1,4 @@
+import os
 import socket
 import threading as th
 import time
@@ -6,7 +7,14 @@ import pytest
 
 from orbitalcoms.coms.drivers.driver import ComsDriver
 from orbitalcoms.coms.messages.message import ComsMessage
-from orbitalcoms.coms.strategies.socketstrat import SocketComsStrategy
+from orbitalcoms.coms.strategies.socketstrat import (
+    SeqPacketComsStrategy,
+    SocketComsStrategy,
+)
+from orbitalcoms.stations.stationcreators import (
+    create_unix_ground_station,
+    create_unix_launch_station,
+)
 
 
 @pytest.mark.parametrize(
@@ -121,3 +129,80 @@ def test_error_when_cannot_connect():
     # this test will fail if something is running on 5000
     with pytest.raises(ConnectionRefusedError):
         SocketComsStrategy.connect_to("127.0.1.1", 5000)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Needs unix sockets")
+@pytest.mark.parametrize(
+    "strat_type",
+    [
+        pytest.param(SocketComsStrategy, id="stream"),
+        pytest.param(SeqPacketComsStrategy, id="seqpacket"),
+    ],
+)
+def test_socketpair_write_read(strat_type):
+    a, b = strat_type.socketpair()
+    msgs = [
+        ComsMessage(ABORT=0, ARMED=1, QDM=0, STAB=1, LAUNCH=0, DATA={"i": i})
+        for i in range(5)
+    ]
+    for m in msgs:
+        a.write(m)
+
+    assert [b.poll(timeout=1) for _ in msgs] == msgs
+    assert b.poll(timeout=0.05) is None
+
+    a.sock.close()
+    b.sock.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Needs unix sockets")
+@pytest.mark.parametrize(
+    "seqpacket",
+    [pytest.param(False, id="stream"), pytest.param(True, id="seqpacket")],
+)
+def test_unix_stations(tmp_path, seqpacket):
+    path = str(tmp_path / "coms.sock")
+    ls = None
+
+    def _host():
+        nonlocal ls
+        ls = create_unix_launch_station(path, seqpacket=seqpacket)
+
+    host_th = th.Thread(target=_host, daemon=True)
+    host_th.start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    gs = create_unix_ground_station(path, seqpacket=seqpacket)
+    host_th.join(timeout=5)
+    assert ls is not None
+    assert not os.path.exists(path)
+
+    with gs, ls:
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        ls.send(ComsMessage(0, 0, 0, 0, ARMED=1, DATA={"alt": 100}))
+        time.sleep(0.5)
+        assert ls.armed
+        assert gs.data == {"alt": 100}
+
+
+def test_seqpacket_has_no_network_constructors():
+    assert not hasattr(SeqPacketComsStrategy, "connect_to")
+    assert not hasattr(SeqPacketComsStrategy, "accept_connection_at")
+    assert not issubclass(SeqPacketComsStrategy, SocketComsStrategy)
+
+
+def test_read_across_partial_sends():
+    a, b = SocketComsStrategy.socketpair()
+    m = ComsMessage(ABORT=0, ARMED=1, QDM=0, STAB=1, LAUNCH=0, DATA={"x": "y" * 100})
+    raw = m.as_str.encode()
+    framed = str(len(raw)).encode().ljust(64) + raw
+
+    def _trickle():
+        for i in range(0, len(framed), 7):
+            a.sock.send(framed[i:][:7])
+            time.sleep(0.001)
+
+    t = th.Thread(target=_trickle, daemon=True)
+    t.start()
+    assert b.read() == m
+    t.join()
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import List
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.localstrat import get_linked_local_strats
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.launchstation import LaunchStation
+from orbitalcoms.stations.statemachine import MissionStateMachine, Transition
+from orbitalcoms.stations.transitions import TRANSITIONS, MissionFlag
+
+ARMED = MissionFlag.ARMED
+STAB = MissionFlag.STAB
+LAUNCH = MissionFlag.LAUNCH
+
+
+def test_rules_are_enforced():
+    machine = MissionStateMachine(TRANSITIONS)
+    assert machine.check(LAUNCH) == "Cannot do any action before arm command"
+    assert not machine.apply(LAUNCH)
+    assert machine.apply(ARMED)
+    assert machine.apply(ARMED | STAB)
+    assert machine.apply(ARMED | STAB | LAUNCH)
+    assert not machine.apply(ARMED)
+    assert machine.is_set(LAUNCH) and not machine.is_set(MissionFlag.ABORT)
+    assert machine.apply(ARMED, validate=False)
+    assert machine.state == ARMED
+
+
+def test_history_and_callbacks_only_record_changes():
+    machine = MissionStateMachine()
+    seen: List[Transition] = []
+    machine.add_callback(seen.append)
+    machine.add_callback(lambda t: 1 / 0)
+    assert machine.apply(ARMED)
+    assert machine.apply(ARMED)
+    assert machine.apply(ARMED | STAB)
+    assert machine.apply(LAUNCH)
+    assert list(machine.history) == seen
+    assert [t.changed for t in seen] == [ARMED, STAB, ARMED | STAB | LAUNCH]
+    assert seen[1].previous == ARMED and seen[1].current == ARMED | STAB
+    assert seen[0].time <= seen[-1].time
+
+
+def test_deferred_callbacks_run_on_exit():
+    machine = MissionStateMachine()
+    seen: List[Transition] = []
+    machine.add_callback(seen.append)
+    with machine.deferred_callbacks():
+        assert machine.apply(ARMED)
+        with machine.deferred_callbacks():
+            assert machine.apply(ARMED | STAB)
+        assert seen == []
+        # Changes made by other threads are not held back
+        other = threading.Thread(target=machine.apply, args=(ARMED,))
+        other.start()
+        other.join()
+        assert len(seen) == 1
+    assert [t.current for t in seen] == [ARMED, ARMED, ARMED | STAB]
+
+
+def test_station_callbacks_see_published_state():
+    a_strat, _ = get_linked_local_strats()
+    gs = GroundStation(ComsDriver(a_strat))
+    seen = []
+
+    def callback(t: Transition) -> None:
+        # Another thread must be able to take the state lock
+        locked = []
+
+        def take_lock() -> None:
+            locked.append(gs._state_lock.acquire(timeout=1))
+            if locked[0]:
+                gs._state_lock.release()
+
+        other = threading.Thread(target=take_lock)
+        other.start()
+        other.join()
+        seen.append((t.current, gs.snapshot().flags, locked[0]))
+
+    gs.mission.add_callback(callback)
+    try:
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        assert seen == [(ARMED, ARMED, True)]
+    finally:
+        gs.close()
+
+
+def test_stations_share_mission_state():
+    a_strat, b_strat = get_linked_local_strats()
+    gs = GroundStation(ComsDriver(a_strat))
+    ls = LaunchStation(ComsDriver(b_strat))
+    received: List[Transition] = []
+    ls.mission.add_callback(received.append)
+    try:
+        assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+        assert not gs.send(ComsMessage(0, 0, 0, 1, ARMED=1))
+        assert gs.send(ComsMessage(0, 0, 1, 0, ARMED=1))
+        assert gs.mission.state == ARMED | STAB
+        assert len(gs.mission.history) == 2
+        deadline = time.time() + 10
+        while len(received) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        assert ls.mission.state == ARMED | STAB
+        assert ls.armed and ls.stab and not ls.launch
+        assert [t.changed for t in received] == [ARMED, STAB]
+    finally:
+        gs.close()
+        ls.close()
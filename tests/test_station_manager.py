@@ -0,0 +1,105 @@
+import threading as th
+import time
+from typing import List, Tuple
+
+import pytest
+
+from orbitalcoms.coms.drivers.driver import ComsDriver
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.busstrat import InProcessBus
+from orbitalcoms.coms.strategies.socketstrat import SocketComsStrategy
+from orbitalcoms.stations.groundstation import GroundStation
+from orbitalcoms.stations.linkmonitor import LinkState
+from orbitalcoms.stations.manager import StationManager
+
+
+def msg(n: int) -> ComsMessage:
+    return ComsMessage(ABORT=0, QDM=0, STAB=0, LAUNCH=0, ARMED=0, DATA={"n": n})
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def fleet():
+    manager = StationManager()
+    vehicles: List[ComsDriver] = []
+    for i in range(20):
+        a, b = SocketComsStrategy.socketpair()
+        manager.add_ground_station(f"gs{i}", a)
+        vehicles.append(ComsDriver(b))
+    yield manager, vehicles
+    manager.close()
+
+
+def test_threads_do_not_grow_with_stations():
+    before = th.active_count()
+    # Kept open, as a station whose peer hangs up stops being read
+    peers = []
+    with StationManager() as manager:
+        for i in range(20):
+            a, b = SocketComsStrategy.socketpair()
+            peers.append(b)
+            manager.add_ground_station(f"gs{i}", a)
+        # The shared loop, and at most the scheduler if nothing else has
+        # started it yet
+        assert th.active_count() - before <= 2
+        assert manager.stats().reading == 20
+    assert not manager.io_loop.is_alive()
+
+
+def test_dispatches_to_each_station(fleet: Tuple[StationManager, List[ComsDriver]]):
+    manager, vehicles = fleet
+    for i, v in enumerate(vehicles):
+        v.write(msg(i))
+    for i in range(len(vehicles)):
+        gs = manager[f"gs{i}"]
+        assert wait_for(lambda: gs.data is not None)
+        assert gs.data == {"n": i}
+
+
+def test_fleet_subscribers(fleet: Tuple[StationManager, List[ComsDriver]]):
+    manager, vehicles = fleet
+    everything = []
+    only_gs3 = []
+    manager.register_subscriber(lambda name, m: everything.append(name))
+    manager.register_subscriber(lambda name, m: only_gs3.append(m), name="gs3")
+    for v in vehicles:
+        v.write(msg(0))
+    assert wait_for(lambda: len(everything) == len(vehicles))
+    assert sorted(everything) == sorted(manager.names)
+    assert only_gs3 == [msg(0)]
+
+
+def test_stats(fleet: Tuple[StationManager, List[ComsDriver]]):
+    manager, vehicles = fleet
+    vehicles[0].write(msg(0))
+    vehicles[0].write(msg(1))
+    vehicles[5].write(msg(2))
+    assert wait_for(lambda: manager.stats().received == 3)
+    stats = manager.stats()
+    assert stats.stations["gs0"].received == 2
+    assert stats.stations["gs5"].received == 1
+    assert stats.stations["gs1"].last_received_time is None
+    assert stats.link_states[LinkState.UNKNOWN] == 20
+    assert len(stats.in_state(LinkState.UNKNOWN)) == 20
+    assert stats.io.serviced == 20
+
+
+def test_remove_and_duplicate_names():
+    bus = InProcessBus()
+    with StationManager() as manager:
+        gs = manager.add_ground_station("gs", bus.connect())
+        assert isinstance(gs, GroundStation)
+        with pytest.raises(ValueError):
+            manager.add_ground_station("gs", bus.connect())
+        assert "gs" in manager
+        manager.remove("gs")
+        assert "gs" not in manager
+        assert len(manager) == 0
+        with pytest.raises(KeyError):
+            manager.remove("gs")
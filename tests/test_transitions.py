@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.stations.transitions import (
+    TRANSITIONS,
+    MissionFlag,
+    allowed_toggles,
+    check_transition,
+    flags_of,
+    is_valid_transition,
+)
+
+
+def _reference(cur: ComsMessage, new: ComsMessage) -> bool:
+    """The rules as GroundStation checked them before they were compiled"""
+    if cur.ARMED and not new.ARMED:
+        return False
+    if not cur.ARMED and (new.ABORT or new.LAUNCH or new.QDM or new.STAB):
+        return False
+    if any(
+        [
+            not new.ABORT and cur.ABORT,
+            not new.LAUNCH and cur.LAUNCH,
+            not new.QDM and cur.QDM,
+        ]
+    ):
+        return False
+    if new.LAUNCH and not cur.LAUNCH and any([not cur.STAB, cur.QDM, cur.ABORT]):
+        return False
+    return True
+
+
+def _message(flags: int) -> ComsMessage:
+    return ComsMessage(
+        ABORT=bool(flags & MissionFlag.ABORT),
+        QDM=bool(flags & MissionFlag.QDM),
+        STAB=bool(flags & MissionFlag.STAB),
+        LAUNCH=bool(flags & MissionFlag.LAUNCH),
+        ARMED=bool(flags & MissionFlag.ARMED),
+    )
+
+
+def test_table_matches_rules():
+    assert len(TRANSITIONS) == 32 * 32
+    for cur, new in itertools.product(range(32), repeat=2):
+        expected = _reference(_message(cur), _message(new))
+        assert is_valid_transition(cur, new) == expected, (cur, new)
+        assert (check_transition(cur, new) is None) == expected
+
+
+def test_flags_of():
+    assert flags_of(None) == 0
+    assert flags_of(ComsMessage(1, 0, 1, 0)) == MissionFlag.ABORT | MissionFlag.STAB
+    for flags in range(32):
+        assert flags_of(_message(flags)) == flags
+
+
+@pytest.mark.parametrize(
+    "current, allowed",
+    [
+        pytest.param(0, MissionFlag.ARMED, id="disarmed"),
+        pytest.param(
+            MissionFlag.ARMED,
+            MissionFlag.ABORT | MissionFlag.QDM | MissionFlag.STAB,
+            id="armed",
+        ),
+        pytest.param(
+            MissionFlag.ARMED | MissionFlag.STAB,
+            MissionFlag.ABORT | MissionFlag.QDM | MissionFlag.STAB | MissionFlag.LAUNCH,
+            id="stabilized",
+        ),
+        pytest.param(
+            MissionFlag.ARMED | MissionFlag.STAB | MissionFlag.ABORT,
+            MissionFlag.QDM | MissionFlag.STAB,
+            id="aborted",
+        ),
+    ],
+)
+def test_allowed_toggles(current, allowed):
+    assert allowed_toggles(current) == allowed
@@ -0,0 +1,151 @@
+import socket
+import struct
+import time
+from typing import List
+
+import pytest
+
+from orbitalcoms.coms.errors.errors import ComsDriverWriteError
+from orbitalcoms.coms.messages.message import ComsMessage
+from orbitalcoms.coms.strategies.udpstrat import UdpComsStrategy
+from orbitalcoms.stations.stationcreators import (
+    create_udp_ground_station,
+    create_udp_launch_station,
+)
+
+HEADER = struct.Struct("!2sIQd")
+ADDR = ("127.0.0.1", 1)
+
+
+def _datagram(seq, session=7, sent_at=None, **data):
+    m = ComsMessage(0, 0, 0, 0, DATA={"seq": seq, **data})
+    sent_at = time.time() if sent_at is None else sent_at
+    return HEADER.pack(b"OC", session, seq, sent_at) + m.as_str.encode()
+
+
+@pytest.fixture
+def strat():
+    s = UdpComsStrategy(socket.socket(socket.AF_INET, socket.SOCK_DGRAM))
+    yield s
+    s.sock.close()
+
+
+@pytest.fixture
+def pair():
+    a = UdpComsStrategy.bind_to("127.0.0.1", 0)
+    b = UdpComsStrategy.connect_to(*a.sock.getsockname())
+    yield a, b
+    a.sock.close()
+    b.sock.close()
+
+
+def _deliver(strat: UdpComsStrategy, seqs: List[int], **kw) -> List[int]:
+    delivered = []
+    for seq in seqs:
+        m = strat._receive(_datagram(seq, **kw), ADDR)
+        if m is not None:
+            delivered.append(m.DATA["seq"])
+    return delivered
+
+
+def test_in_order_delivery(strat: UdpComsStrategy):
+    assert _deliver(strat, [0, 1, 2, 3]) == [0, 1, 2, 3]
+    assert strat.stats.lost == 0
+    assert strat.stats.loss_rate == 0
+
+
+def test_gaps_counted_as_lost(strat: UdpComsStrategy):
+    assert _deliver(strat, [0, 1, 4, 5, 9]) == [0, 1, 4, 5, 9]
+    assert strat.stats.lost == 5
+    assert strat.stats.loss_rate == pytest.approx(5 / 10)
+
+
+def test_late_frames_are_discarded_but_not_lost(strat: UdpComsStrategy):
+    assert _deliver(strat, [0, 2, 1, 3]) == [0, 2, 3]
+    assert strat.stats.lost == 0
+    assert strat.stats.reordered == 1
+    assert strat.stats.stale == 1
+
+
+def test_duplicates_are_discarded(strat: UdpComsStrategy):
+    assert _deliver(strat, [0, 1, 1, 0, 2]) == [0, 1, 2]
+    assert strat.stats.duplicates == 2
+    assert strat.stats.lost == 0
+
+
+def test_peer_restart_resets_sequence(strat: UdpComsStrategy):
+    assert _deliver(strat, [10, 11], session=1) == [10, 11]
+    assert _deliver(strat, [0, 1], session=2) == [0, 1]
+    assert strat.stats.lost == 0
+
+
+def test_frames_older_than_max_age_are_stale(strat: UdpComsStrategy):
+    strat.max_age = 1
+    assert _deliver(strat, [0], sent_at=time.time() - 5) == []
+    assert _deliver(strat, [1]) == [1]
+    assert strat.stats.stale == 1
+
+
+def test_garbage_is_malformed(strat: UdpComsStrategy):
+    assert strat._receive(b"nonsense", ADDR) is None
+    assert strat._receive(HEADER.pack(b"OC", 1, 0, 0.0) + b"{bad", ADDR) is None
+    assert strat.stats.malformed == 2
+
+
+def test_write_read(pair):
+    a, b = pair
+    assert a.poll(timeout=0.2) is None  # hello is not a message
+
+    b.write(ComsMessage(0, 0, 1, 0, ARMED=1))
+    assert a.poll(timeout=1) == ComsMessage(0, 0, 1, 0, ARMED=1)
+
+    # a learned b's address from its datagrams
+    a.write(ComsMessage(1, 0, 1, 0, ARMED=1))
+    assert b.poll(timeout=1) == ComsMessage(1, 0, 1, 0, ARMED=1)
+    assert a.stats.delivered == b.stats.delivered == 1
+
+
+def test_stray_datagrams_do_not_redirect_peer(strat: UdpComsStrategy):
+    stray = ("127.0.0.1", 2)
+    strat._receive(_datagram(0, session=1), ADDR)
+    assert strat.peer == ADDR
+    strat._receive(_datagram(1, session=1), stray)
+    strat._receive(_datagram(0, session=9), stray)
+    assert strat.peer == ADDR
+
+    # A restarted peer greets from a new session
+    strat._receive(HEADER.pack(b"OC", 2, 0, time.time()), stray)
+    assert strat.peer == stray
+
+
+def test_given_peer_is_never_replaced():
+    s = UdpComsStrategy(socket.socket(socket.AF_INET, socket.SOCK_DGRAM), peer=ADDR)
+    s._receive(HEADER.pack(b"OC", 2, 0, time.time()), ("127.0.0.1", 2))
+    assert s.peer == ADDR
+    s.sock.close()
+
+
+def test_no_peer_to_write_to(strat: UdpComsStrategy):
+    with pytest.raises(ComsDriverWriteError):
+        strat.write(ComsMessage(0, 0, 0, 0))
+
+
+def test_message_too_long(pair):
+    _, b = pair
+    with pytest.raises(ComsDriverWriteError):
+        b.write(ComsMessage(0, 0, 0, 0, DATA={"big": "x" * 70000}))
+
+
+def test_udp_stations():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    with create_udp_launch_station("127.0.0.1", port) as ls:
+        with create_udp_ground_station("127.0.0.1", port) as gs:
+            time.sleep(0.3)
+            ls.send(ComsMessage(0, 0, 0, 0, DATA={"alt": 10}))
+            assert gs.send(ComsMessage(0, 0, 0, 0, ARMED=1))
+            time.sleep(0.5)
+            assert ls.armed
+            assert gs.data == {"alt": 10}